@@ -1,10 +1,11 @@
 import random
-import time
+import clock
 import pandas as pd
 from sensor import indoor_locations
 from ambient_sc import AmbientSimpleComparison
 import diary
 from ambient_temp_sensor import graph_plot
+from action_dispatcher import dispatcher
 
 # Load the ambient temperature data from the CSV file
 ambient_temperature_data = pd.read_csv('ambient_temperature_csv.csv')
@@ -17,13 +18,17 @@ ambient_comparison = AmbientSimpleComparison(
     ambient_temperature=None  # Set later during the loop
 )
 
+# Replay the recorded temperatures through the sensor, taking the whole file as one batch
+ambient_comparison.temperature_data = ambient_temperature_data
+ambient_temperatures = ambient_comparison.getdata_batch(len(ambient_temperature_data))
+
 # Loop through each row in the CSV file and process the data
 for ambient_temp_index in range(len(ambient_temperature_data)):
     # Get the current time
-    current_datetime = time.strftime("%Y-%m-%d %H:%M:%S")
+    current_datetime = clock.strftime("%Y-%m-%d %H:%M:%S")
 
     # Get the ambient temperature for the current index from the CSV file
-    ambient_temperature = ambient_temperature_data.iloc[ambient_temp_index]['TEMPERATURE']
+    ambient_temperature = ambient_temperatures[ambient_temp_index]
 
     # Update location
     location = random.choice(indoor_locations)
@@ -35,14 +40,13 @@ for ambient_temp_index in range(len(ambient_temperature_data)):
     ambient_comparison.evaluate_temperature(ambient_temperature)
 
     # Log the data
-    temp_range = diary.Diary.temp_range2
-    data = f"{current_datetime}, {location}, {ambient_temperature:.2f}, {temp_range}".split(", ")
-    diary.Diary.log_sensor_data.append(data)
-    # print(f"Logged data: {data}")
+    diary.Diary.ambient_temperature.append(current_datetime, location, ambient_temperature, diary.Diary.temp_range2)
 
     # Introduce a 2-second latency after processing each CSV row
-    time.sleep(2)
+    clock.sleep(2)
+
 
+dispatcher.join()
 
 # Log the results at the end
 diary.log_ambient_temperature()
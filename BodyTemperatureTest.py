@@ -1,4 +1,4 @@
-import time
+import clock
 import random
 import diary
 import pandas as pd
@@ -6,6 +6,7 @@ from temp_sensor import TemperatureSensor
 from simple_comparison import SimpleComparison
 from sensor import indoor_locations
 from bodytemp import graph_plot_body_temperature
+from action_dispatcher import dispatcher
 
 # Load the temperature data from the CSV file
 temperature_data = pd.read_csv('body_temperature_csv.csv')
@@ -29,25 +30,27 @@ while main_temp_sensor.current_temp_index < len(temperature_data):
 
     # Collect data from the main sensor
     main_temp_data = main_temp_sensor.getdata()
-    time.sleep(4)
+    clock.sleep(4)
 
     # Print data from the main sensor, including the new random location
-    current_datetime = time.strftime("%Y-%m-%d %H:%M:%S")
+    current_datetime = clock.strftime("%Y-%m-%d %H:%M:%S")
 
     print(
         f"Time: {current_datetime}, Location: {main_temp_sensor.location}, Temperature: {main_temp_data:.2f} °C, Datatype: {main_temp_sensor.datatype}"
     )
 
     SimpleComparison.preprocess(main_temp_data)
-    diary.Diary.log_sensor_data.append([
-        current_datetime, main_temp_sensor.location, f"{main_temp_data:.2f}", diary.Diary.temp_range
-    ])
+    diary.Diary.body_temperature.append(
+        current_datetime, main_temp_sensor.location, main_temp_data, None, None, diary.Diary.temp_range
+    )
 
     print("")
 
     # Stop monitoring with the main temperature sensor
     main_temp_sensor.stop()
 
+dispatcher.join()
+
 # Log the process with the required arguments
 diary.log_body_temperature()
 
@@ -1,21 +1,24 @@
-import time
+import clock
 import random
+import time
 import diary
+import numpy as np
 import pandas as pd
 from temp_sensor import TemperatureSensor
 from simple_comparison import SimpleComparison
 from sensor import indoor_locations
 from bodytemp import graph_plot_body_temperature2
+from action_dispatcher import dispatcher
+from calibration import LinearCalibration
 
 # Load the temperature data from the CSV file
 temperature_data = pd.read_csv('body_temperature_csv.csv')
 
-# Define updated formulas for temperature calculation based on SENSOR ID
-calculation_formulas = {
-    "MLX-P": lambda x: -1.2368 * x + 34.03,
-    "MLX-R": lambda x: -1.1986 * x + 33.566,
-    "RS T-10": lambda x: -1.419 * x + 32.183,
-}
+# Seconds between the accepted readings, each of which gets its own timestamp
+reading_interval_seconds = 4
+
+# Load the per-sensor linear formulas (calculated = slope * distance + intercept) from the config table
+calibration = LinearCalibration.from_csv('sensor_formulas.csv')
 
 # Create an instance of the TemperatureSensor for the main sensor
 main_temp_sensor = TemperatureSensor(
@@ -26,73 +29,63 @@ main_temp_sensor = TemperatureSensor(
     temperature_data=temperature_data
 )
 
-# Ensure the current_temp_index starts at 0
-main_temp_sensor.current_temp_index = 0
-
-# Process each row in the CSV
-while main_temp_sensor.current_temp_index < len(temperature_data):
-    # Retrieve the current row from the temperature data
-    current_row = temperature_data.iloc[main_temp_sensor.current_temp_index]
-    sensor_id = current_row['SENSOR ID']
-    original_temp = current_row['TEMPERATURE']
-    distance = current_row['DISTANCE']  # Read distance directly from the CSV
-
-    # Clean SENSOR ID
-    sensor_id_stripped = sensor_id.strip()
-
-    # Calculate the new temperature based on the sensor type and distance
-    if sensor_id_stripped in calculation_formulas:
-        calculated_temp = calculation_formulas[sensor_id_stripped](distance)
-    else:
-        # If no formula is defined for the SENSOR ID, skip this row
-        print(f"Sensor ID {sensor_id_stripped} has no defined formula. Skipping...")
-        main_temp_sensor.current_temp_index += 1
-        continue
-
-    # Compare the calculated temperature with the original
-    temp_difference = calculated_temp - original_temp
-    if -2 <= temp_difference <= 2:
-        # Set a new random location for this iteration
-        main_temp_sensor.location = random.choice(indoor_locations)
-
-        # Start monitoring with the main temperature sensor
-        main_temp_sensor.start()
-
-        # Simulate latency
-        time.sleep(4)
-
-        # Get the current time for logging
-        current_datetime = time.strftime("%Y-%m-%d %H:%M:%S")
-
-        # Print information
-        print(
-            f"Time: {current_datetime}, Loc: {main_temp_sensor.location}, "
-            f"Orig Temp: {original_temp:.2f}°C, Calc Temp: {calculated_temp:.2f}°C, "
-            f"Dist: {distance:.2f}m, Diff: {temp_difference:.2f}°C, ID: {sensor_id_stripped}"
-        )
-
-        # Use the calculated temperature for further processing
-        SimpleComparison.preprocess(calculated_temp)
-
-        # Log the data including the distance
-        diary.Diary.log_sensor_data.append([
-            current_datetime, main_temp_sensor.location, f"{original_temp:.2f}",
-            f"{calculated_temp:.2f}", f"{distance:.2f}", diary.Diary.temp_range, f"{sensor_id_stripped}"
-        ])
-
-        print("")  # Add space after each action for better readability
-
-        # Stop monitoring with the main temperature sensor
-        main_temp_sensor.stop()
-    else:
-        print(
-            f"Time: {time.strftime('%Y-%m-%d %H:%M:%S')}, Sensor ID: {sensor_id_stripped}, "
-            f"Diff: {temp_difference:.2f}°C (Out of range). Skipping..."
-        )
-        print("")
-
-    # Move to the next row
-    main_temp_sensor.current_temp_index += 1
+# Take the readings as whole columns
+sensor_ids = temperature_data['SENSOR ID'].astype(str).str.strip().to_numpy()
+original_temps = main_temp_sensor.getdata_batch(len(temperature_data))
+distances = temperature_data['DISTANCE'].to_numpy(dtype=float)  # Read distance directly from the CSV
+
+# Calculate every reading's temperature with its sensor's formula, grouped by SENSOR ID
+calculated_temps = calibration.apply(sensor_ids, distances)
+temp_differences = calculated_temps - original_temps
+known = ~np.isnan(calculated_temps)
+accepted = LinearCalibration.accept(calculated_temps, original_temps)
+
+# Report the readings that are skipped
+for sensor_id in sensor_ids[~known]:
+    print(f"Sensor ID {sensor_id} has no defined formula. Skipping...")
+for sensor_id, temp_difference in zip(sensor_ids[known & ~accepted], temp_differences[known & ~accepted]):
+    print(
+        f"Time: {clock.strftime('%Y-%m-%d %H:%M:%S')}, Sensor ID: {sensor_id}, "
+        f"Diff: {temp_difference:.2f}°C (Out of range). Skipping..."
+    )
+    print("")
+
+# Start monitoring with the main temperature sensor
+main_temp_sensor.start()
+
+# Set a random location for every accepted reading
+locations = random.choices(indoor_locations, k=int(np.count_nonzero(accepted)))
+
+# Hand the accepted calculated temperatures to the threshold stage as one block
+remarks = SimpleComparison.preprocess_batch(calculated_temps[accepted])
+
+# Time each accepted reading from now, one interval apart
+start_time = clock.time()
+timestamps = [time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start_time + index * reading_interval_seconds))
+              for index in range(len(remarks))]
+
+for current_datetime, location, sensor_id, original_temp, calculated_temp, distance, temp_difference, remark in zip(
+        timestamps, locations, sensor_ids[accepted], original_temps[accepted], calculated_temps[accepted],
+        distances[accepted], temp_differences[accepted], remarks):
+    # Print information
+    print(
+        f"Time: {current_datetime}, Loc: {location}, "
+        f"Orig Temp: {original_temp:.2f}°C, Calc Temp: {calculated_temp:.2f}°C, "
+        f"Dist: {distance:.2f}m, Diff: {temp_difference:.2f}°C, ID: {sensor_id}"
+    )
+
+    # Log the data including the distance
+    diary.Diary.body_temperature.append(
+        current_datetime, location, original_temp,
+        calculated_temp, distance, remark, sensor_id
+    )
+
+print("")  # Add space after the block for better readability
+
+# Stop monitoring with the main temperature sensor
+main_temp_sensor.stop()
+
+dispatcher.join()
 
 # Log the process with the required arguments
 diary.log_body_temperature()
@@ -1,12 +1,30 @@
-import time, co2_processor_2, diary
+import co2_processor_2, diary, event_bus
 from co2_processor_2 import graph_plot
+from action_dispatcher import dispatcher
+from co2_follow import CO2Follower
+from processor import Processor
+from scheduler import Scheduler
 
 duration_seconds = 5
+poll_interval_seconds = 1
 
-st = time.time()
+# Readings are published on the CO2 topic; the processor handles them from its own queue
+co2_processor = Processor(lambda reading: co2_processor_2.CO2Processor.handle_co2_levels(*reading),
+                          action=None, publisher=None, subscriber=event_bus.CO2,
+                          time_frequency=poll_interval_seconds)
+co2_processor.start()
 
-while time.time() - st <= duration_seconds:
-    co2_processor_2.CO2Processor.process_conditions()
+# Follow the export: each cycle only parses rows appended since the previous one
+follower = CO2Follower(lambda *reading: event_bus.publish(event_bus.CO2, reading))
+
+# Poll every interval and flush the diary periodically until the duration is up
+scheduler = Scheduler()
+scheduler.every(poll_interval_seconds, follower.poll, delay=0)
+scheduler.every(diary.DEFAULT_FLUSH_INTERVAL, diary.Diary.co2_emission.flush)
+scheduler.run(duration_seconds)
+
+event_bus.bus.join()
+dispatcher.join()
 
 diary.log_co2_emission()
 graph_plot()
@@ -0,0 +1,110 @@
+import threading
+
+import event_bus
+from event_bus import Reading, Subscription
+
+
+class GatedHandler:
+    """
+    Records what a subscription delivers, holding the worker on the first
+    message until released so the queue behind it can be filled.
+    """
+
+    def __init__(self):
+        self.received = []
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def __call__(self, message):
+        self.started.set()
+        self.gate.wait()
+        self.received.append(message)
+
+
+def filled_subscription(handler, messages, **options):
+    # The first message occupies the worker, the rest wait in the queue
+    subscription = Subscription("test", handler, **options)
+    subscription.put(messages[0])
+    handler.started.wait()
+    for message in messages[1:]:
+        subscription.put(message)
+    return subscription
+
+
+def drain(handler, subscription):
+    handler.gate.set()
+    subscription.join()
+    subscription.close()
+
+
+def check(name, actual, expected):
+    status = "ok" if actual == expected else "FAILED"
+    print(f"{name}: {actual} ({status})")
+    assert actual == expected, f"{name}: expected {expected}, got {actual}"
+
+
+# DROP_OLDEST: with 3 places, only the newest 3 of the waiting messages survive
+handler = GatedHandler()
+subscription = filled_subscription(handler, list(range(7)), maxsize=3, policy=event_bus.DROP_OLDEST)
+drain(handler, subscription)
+check("drop_oldest delivered", handler.received, [0, 4, 5, 6])
+check("drop_oldest dropped", subscription.dropped, 3)
+
+# BLOCK: a publisher to a full queue waits until the worker makes room, and nothing is lost
+handler = GatedHandler()
+subscription = filled_subscription(handler, [0, 1, 2], maxsize=2, policy=event_bus.BLOCK)
+publisher = threading.Thread(target=subscription.put, args=(3,))
+publisher.start()
+publisher.join(0.2)
+check("block publisher waiting", publisher.is_alive(), True)
+handler.gate.set()
+publisher.join()
+drain(handler, subscription)
+check("block delivered", handler.received, [0, 1, 2, 3])
+check("block dropped", subscription.dropped, 0)
+
+# COALESCE: a newer reading of a waiting sensor replaces it and goes to the back
+readings = [Reading(event_bus.CO2, sensor, "lounge", t, t) for t, sensor in enumerate("xababa")]
+handler = GatedHandler()
+subscription = filled_subscription(handler, readings, maxsize=4, policy=event_bus.COALESCE, key=event_bus.by_sensor)
+drain(handler, subscription)
+check("coalesce delivered", [(r.sensor, r.value) for r in handler.received], [("x", 0), ("b", 4), ("a", 5)])
+check("coalesce dropped", subscription.dropped, 3)
+
+# COALESCE keeps the latest command last: with the worker busy, close, open, close
+# must leave the door closed, so the first close gives way to the second
+handler = GatedHandler()
+subscription = filled_subscription(handler, ["busy", "close", "open", "close"], policy=event_bus.COALESCE,
+                                   key=lambda command: command)
+drain(handler, subscription)
+check("coalesce order", handler.received, ["busy", "open", "close"])
+check("coalesce order dropped", subscription.dropped, 1)
+
+# COALESCE when full: a new key evicts the oldest key, even if it was that sensor's only reading
+readings = [Reading(event_bus.CO2, sensor, "lounge", t, t) for t, sensor in enumerate("xabc")]
+handler = GatedHandler()
+evicted = []
+subscription = filled_subscription(handler, readings, maxsize=2, policy=event_bus.COALESCE, key=event_bus.by_sensor,
+                                   on_drop=evicted.append)
+drain(handler, subscription)
+check("coalesce full delivered", [r.sensor for r in handler.received], ["x", "b", "c"])
+check("coalesce full dropped", subscription.dropped, 1)
+check("coalesce full reported", [r.sensor for r in evicted], ["a"])
+
+# Batching: the handler gets whatever is queued, up to batch_size, without waiting for more
+handler = GatedHandler()
+subscription = filled_subscription(handler, list(range(8)), batch_size=3)
+drain(handler, subscription)
+check("batches", handler.received, [[0], [1, 2, 3], [4, 5, 6], [7]])
+check("batch delivered", subscription.delivered, 8)
+
+# EventBus: every subscriber of a topic gets its own copy
+bus = event_bus.EventBus()
+first, second = [], []
+bus.subscribe(event_bus.MOTION, first.append)
+bus.subscribe(event_bus.MOTION, second.append)
+check("publish subscribers", bus.publish(event_bus.MOTION, "motion"), 2)
+bus.join()
+check("bus delivered", (first, second), (["motion"], ["motion"]))
+
+print("All event bus checks passed.")
@@ -1,12 +1,17 @@
-import time
 from detect_person_processor import DetectPersonProcessor
 import diary
+from action_dispatcher import dispatcher
+from scheduler import Scheduler
 
 duration_seconds = 120
+check_interval_seconds = 4
 
-start_time = time.time()
+# One motion check every 4 seconds, with the diary flushed periodically
+scheduler = Scheduler()
+scheduler.every(check_interval_seconds, DetectPersonProcessor.conditions, delay=0)
+scheduler.every(diary.DEFAULT_FLUSH_INTERVAL, diary.Diary.motion_sensor.flush)
+scheduler.run(duration_seconds)
 
-while time.time() - start_time <= duration_seconds:
-    DetectPersonProcessor.conditions()
+dispatcher.join()
 
 diary.log_motion_sensor()
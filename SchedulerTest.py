@@ -0,0 +1,62 @@
+import clock
+from scheduler import Scheduler
+
+# Under the virtual clock each run jumps from one firing to the next, so these take no wall time
+clock.use(clock.VirtualClock("2024-01-01 07:00:00"))
+
+# Periodic, one-shot and cancelled timers over 5 s
+scheduler = Scheduler()
+fired = []
+ticks = scheduler.every(1, lambda: fired.append(round(clock.monotonic(), 3)))
+once = scheduler.after(2.5, lambda: None)
+cancelled = scheduler.every(1, lambda: None)
+cancelled.cancel()
+scheduler.run(5)
+
+print(f"Periodic timer fired at {fired}")
+print(f"One-shot runs: {once.runs}, cancelled runs: {cancelled.runs}, timers left: {len(scheduler)}")
+assert ticks.runs == 5 and fired == [1.0, 2.0, 3.0, 4.0, 5.0]
+assert once.runs == 1 and cancelled.runs == 0
+assert len(scheduler) == 1
+
+# A callback that overruns its period: the missed firings are skipped, the timer
+# fires once late and then keeps to its original period instead of catching up
+scheduler = Scheduler()
+start = clock.monotonic()
+late = []
+
+
+def slow_check():
+    late.append(round(clock.monotonic() - start, 3))
+    if len(late) == 1:
+        clock.sleep(3.5)
+
+
+slow = scheduler.every(1, slow_check, delay=0)
+scheduler.run(10)
+
+print(f"Overrunning timer fired at {late}, missed {slow.missed}")
+assert late == [0.0, 3.5, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+assert slow.missed == 2
+
+# Timers due more than one revolution of the wheel ahead wait for their own revolution
+scheduler = Scheduler(resolution=0.1, slots=8)
+far = scheduler.after(5, lambda: None)
+scheduler.run(4.9)
+far_early = far.runs
+scheduler.run(0.1)
+
+print(f"Timer 5 s ahead on a 0.8 s wheel: {far_early} runs at 4.9 s, {far.runs} at 5 s")
+assert (far_early, far.runs) == (0, 1)
+
+# stop() from a callback ends a run that has no duration
+scheduler = Scheduler()
+scheduler.every(1, lambda: None)
+scheduler.after(3, scheduler.stop)
+start = clock.monotonic()
+scheduler.run()
+
+print(f"Stopped after {clock.monotonic() - start:.1f} s")
+assert abs(clock.monotonic() - start - 3) < 1e-6
+
+print("All scheduler checks passed.")
@@ -0,0 +1,143 @@
+import random
+import threading
+import clock
+import event_bus
+
+# Seconds each actuator waits after an action before running the next one.
+# A (low, high) tuple picks a random pause in that range.
+DEFAULT_PACING = {
+    "robot": (3, 9),
+    "door": 2,
+    "window": 2,
+    "heating": 3,
+    "comm": 3,
+}
+
+# The most commands waiting per actuator
+DEFAULT_MAXSIZE = 16
+
+
+def _command_key(command):
+    # Identical commands coalesce; ones with unhashable arguments are kept apart
+    try:
+        hash(command)
+    except TypeError:
+        return id(command)
+    return command
+
+
+class ActionDispatcher:
+    """
+    Runs actuator commands on background workers so sensor processing never waits.
+
+    Each actuator (door, window, robot, ...) gets its own bounded queue and worker
+    thread. Commands for one actuator run in order with a pause between them;
+    different actuators run independently of each other. Under an alarm storm a
+    command that is already waiting moves to the back of the queue instead of
+    being queued twice, so the last command submitted is always the last one
+    run. Once an actuator has maxsize commands waiting the oldest is dropped and
+    logged, so memory stays bounded and join() never waits for a backlog of
+    repeated commands.
+    """
+
+    def __init__(self, pacing=None, default_pacing=2, maxsize=DEFAULT_MAXSIZE, policy=event_bus.COALESCE):
+        """
+        Initializes the ActionDispatcher.
+
+        Args:
+            pacing (dict, optional): Pause per actuator name, in seconds or as a
+                (low, high) range. Defaults to DEFAULT_PACING.
+            default_pacing (float): Pause for actuators not listed in pacing.
+            maxsize (int): The most commands waiting per actuator.
+            policy (str): What a full or repeated command does, see event_bus:
+                COALESCE (default) moves a repeated command to the back instead of
+                queueing it twice, DROP_OLDEST only drops when full, and BLOCK
+                makes submit() wait.
+        """
+        self.pacing = dict(DEFAULT_PACING if pacing is None else pacing)
+        self.default_pacing = default_pacing
+        self.maxsize = maxsize
+        self.policy = policy
+        self._queues = {}
+        self._ready_at = {}  # Monotonic time each actuator may act again
+        self._lock = threading.Lock()
+        # Pacing has its own generator: drawing from the shared one on the worker
+        # threads would shift the drivers' random choices depending on thread timing
+        self._random = random.Random()
+
+    def submit(self, actuator, action, *args):
+        """
+        Queues an action and returns immediately.
+
+        Args:
+            actuator (str): The actuator the action drives, e.g. "door".
+            action (callable): The function to run, e.g. door_action.adjustDoor.
+            *args: Arguments passed to the action.
+        """
+        self._queue_for(actuator).put((action, args))
+
+    def join(self):
+        """
+        Blocks until every queued action has run.
+
+        The workers are daemon threads, so a driver calls this once its run is
+        over and before it logs its results: otherwise actions still waiting
+        would print after the summary, or be lost when the program exits.
+        """
+        for queue in list(self._queues.values()):
+            queue.join()
+
+    @property
+    def dropped(self):
+        """Commands dropped or merged per actuator."""
+        return {actuator: queue.dropped for actuator, queue in self._queues.items()}
+
+    def _queue_for(self, actuator):
+        with self._lock:
+            queue = self._queues.get(actuator)
+            if queue is None:
+                queue = event_bus.Subscription(
+                    f"actuator-{actuator}", lambda command: self._run(actuator, command),
+                    maxsize=self.maxsize, policy=self.policy, key=_command_key,
+                    on_drop=lambda command: self._dropped(actuator, command))
+                self._queues[actuator] = queue
+            return queue
+
+    def _dropped(self, actuator, command):
+        action, args = command
+        name = getattr(action, '__name__', repr(action))
+        print(f"Dropped {name}{args} on {actuator}: {self.maxsize} commands already waiting")
+
+    def _pause(self, actuator):
+        pacing = self.pacing.get(actuator, self.default_pacing)
+        if isinstance(pacing, tuple):
+            return self._random.uniform(*pacing)
+        return pacing
+
+    def _run(self, actuator, command):
+        action, args = command
+        # The pause is taken before the next action, so join() doesn't wait for the last one
+        wait = self._ready_at.get(actuator, 0.0) - clock.monotonic()
+        if wait > 0:
+            clock.sleep(wait)
+        try:
+            action(*args)
+        except Exception as e:
+            print(f"Action on {actuator} failed: {e}")
+        finally:
+            self._ready_at[actuator] = clock.monotonic() + self._pause(actuator)
+
+
+dispatcher = ActionDispatcher()
+
+
+def dispatch(actuator, action, *args):
+    """
+    Queues an action on the shared dispatcher.
+
+    Args:
+        actuator (str): The actuator the action drives, e.g. "door".
+        action (callable): The function to run.
+        *args: Arguments passed to the action.
+    """
+    dispatcher.submit(actuator, action, *args)
@@ -1,40 +1,26 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from datetime import datetime
-import numpy as np
+from plot_lod import plot_lod
+from room_dataset import RoomDataset
 
 def plot_combined_temperature_data(csv_files, room_names, colors, time_column='time', temp_column='temp_c'):
     
-    plt.figure(figsize=(14, 8))
+    # Every room file is read once; the combined summary comes from the same arrays
+    dataset = RoomDataset(csv_files, room_names, time_column=time_column)
+    room_colors = dict(zip(room_names, colors))
     
-    all_temps = []
-    all_times = []
+    plt.figure(figsize=(14, 8))
     
-    for i, (csv_file, room_name, color) in enumerate(zip(csv_files, room_names, colors)):
-        try:
-            df = pd.read_csv(csv_file)
-            print(f"Successfully loaded data from {csv_file}")
-            print(f"Data shape: {df.shape}")
-            
-            df['datetime'] = pd.to_datetime('2024-01-01 ' + df[time_column].astype(str))
-            df[temp_column] = pd.to_numeric(df[temp_column], errors='coerce')
-            
-            plt.plot(df['datetime'], df[temp_column], 
-                    color=color, linewidth=2, marker='o', markersize=2, 
+    if temp_column in dataset:
+        summary = dataset.summary(temp_column)
+        for room_name in dataset.rooms:
+            times, temps = dataset.series(room_name, temp_column)
+            plot_lod(plt.gca(), times, temps, 
+                    color=room_colors[room_name], linewidth=2, marker='o', markersize=2, 
                     label=f'{room_name}', alpha=0.8)
             
-            all_temps.extend(df[temp_column].dropna().tolist())
-            all_times.extend(df['datetime'].tolist())
-            
-            print(f"{room_name} - Min: {df[temp_column].min():.1f}°C, Max: {df[temp_column].max():.1f}°C, Mean: {df[temp_column].mean():.1f}°C")
-            
-        except FileNotFoundError:
-            print(f"Error: File '{csv_file}' not found.")
-            continue
-        except Exception as e:
-            print(f"Error processing {csv_file}: {e}")
-            continue
+            low, high, mean = summary[room_name]
+            print(f"{room_name} - Min: {low:.1f}°C, Max: {high:.1f}°C, Mean: {mean:.1f}°C")
     
     plt.title('Ambient Temperature Monitoring', fontsize=16, fontweight='bold')
     plt.xlabel('Time (per 10 minutes)', fontsize=12)
@@ -52,9 +38,11 @@ def plot_combined_temperature_data(csv_files, room_names, colors, time_column='t
     plt.show()
     
     print("\n=== COMBINED DATA SUMMARY ===")
-    if all_temps:
-        print(f"Overall temperature range: {min(all_temps):.1f} - {max(all_temps):.1f}°C")
-        print(f"Total data points: {len(all_temps)}")
+    if temp_column in dataset:
+        low, high, count = dataset.overall_range(temp_column)
+        if count:
+            print(f"Overall temperature range: {low:.1f} - {high:.1f}°C")
+            print(f"Total data points: {count}")
 
 if __name__ == "__main__":
     csv_files = [
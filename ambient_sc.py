@@ -1,7 +1,6 @@
-import time
-import numpy as np
 import door_action
 import diary
+from action_dispatcher import dispatch
 from temp_sensor import TemperatureSensor
 from commAction import comm_action
 from heating_system import controlHeatingSystem
@@ -38,10 +37,9 @@ class AmbientSimpleComparison(TemperatureSensor):
             data (float): The current ambient temperature.
         """
         print(f'Ambient Temperature: {data:.2f}°C (Low Temperature)')
-        door_action.closeDoor()
-        controlHeatingSystem()
-        activate_robot()
-        time.sleep(np.random.uniform(3, 9))
+        dispatch("door", door_action.closeDoor)
+        dispatch("heating", controlHeatingSystem)
+        dispatch("robot", activate_robot)
         remark = "Low Temperature"
         diary.Diary.temp_range2 = remark
         print("")
@@ -54,11 +52,10 @@ class AmbientSimpleComparison(TemperatureSensor):
             data (float): The current ambient temperature.
         """
         print(f'Ambient Temperature: {data:.2f}°C (High Temperature)')
-        door_action.openDoor()
-        controlHeatingSystem()
-        comm_action()
-        adjust_window()
-        time.sleep(np.random.uniform(3, 9))
+        dispatch("door", door_action.openDoor)
+        dispatch("heating", controlHeatingSystem)
+        dispatch("comm", comm_action)
+        dispatch("window", adjust_window)
         remark = "High Temperature"
         diary.Diary.temp_range2 = remark
         print("")
@@ -1,42 +1,8 @@
-# temp_sensor.py
-
-class TemperatureSensor:
-    def __init__(self, name, start_time, stop_time, location=None, temperature_data=None):
-        self.name = name
-        self.start_time = start_time
-        self.stop_time = stop_time
-        self.location = location
-        self.temperature_data = temperature_data
-        self.current_temp_index = 0
-
-        # if self.temperature_data is not None:
-        #     print(f"Temperature data initialized for {self.name}.")
-        # else:
-        #     print(f"Temperature data is None for {self.name}.")
-
-    def update_temperature(self):
-        # Ensure the temperature data is loaded
-        if self.temperature_data is not None:
-            if self.current_temp_index < len(self.temperature_data):
-                self.current_temp = self.temperature_data.iloc[self.current_temp_index]['TEMPERATURE']
-                self.current_temp_index += 1
-            else:
-                # Loop over the data if it runs out
-                self.current_temp_index = 0
-                self.current_temp = self.temperature_data.iloc[self.current_temp_index]['TEMPERATURE']
-        else:
-            raise ValueError("Temperature data is not loaded properly.")
-
-    def getdata(self):
-        self.update_temperature()
-        return self.current_temp
-
-
 import pandas as pd
 import matplotlib.pyplot as plt
-import mplcursors
 from itertools import cycle
 import numpy as np
+from plot_hover import HoverText
 
 
 def graph_plot():
@@ -84,30 +50,23 @@ def graph_plot():
         unique_locations = df['LOCATION'].unique()
         colors = plt.cm.tab10(np.linspace(0, 1, len(unique_locations)))
 
-        lines = []
+        hover = HoverText()
         color_cycle = cycle(colors)
         for location in unique_locations:
             location_data = df[df['LOCATION'] == location]
             color = next(color_cycle)
             line, = ax.plot(location_data['DATE / TIME'], location_data['AMBIENT TEMPERATURE'], marker='o',
                             linestyle='-', color=color, linewidth=1.5, markersize=4, label=location)
-            lines.append((line, location_data))
-
-        # Define the hover function
-        def on_hover(event):
-            for line, location_data in lines:
-                if event.artist == line:
-                    ind = event.target.index
-                    location = location_data.iloc[ind]['LOCATION']
-                    temperature = location_data.iloc[ind]['AMBIENT TEMPERATURE']
-                    current_datetime = location_data.iloc[ind]['DATE / TIME']
-                    temp_range = location_data.iloc[ind]['TEMPERATURE RANGE']
-                    event.annotation.set_text(
-                        f"{current_datetime}\nLocation: {location}\nTemperature: {temperature}\nRange: {temp_range}")
+
+            hover.add(line, (
+                f"{pd.Timestamp(date_time)}\nLocation: {location}\nTemperature: {temperature}\nRange: {temperature_range}"
+                for date_time, temperature, temperature_range in zip(
+                    location_data['DATE / TIME'].to_numpy(), location_data['AMBIENT TEMPERATURE'].to_numpy(),
+                    location_data['TEMPERATURE RANGE'].to_numpy())
+            ))
 
         # Enable cursor with hover functionality
-        cursor = mplcursors.cursor(hover=True)
-        cursor.connect("add", on_hover)
+        hover.connect()
 
         # Improve layout and legend
         ax.legend(title='Location', fontsize=9, title_fontsize='10', loc='best', fancybox=True, framealpha=0.5)
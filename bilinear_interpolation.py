@@ -1,8 +1,8 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import os
 import mplcursors
+from calibration import load_calibration_grids
 
 
 class Actions:
@@ -14,93 +14,6 @@ class Actions:
             print("Normal")
 
 
-def parse_sensor_data(csv_file):
-    """Parse sensor data from CSV files"""
-    if not os.path.isfile(csv_file):
-        raise FileNotFoundError(f"File '{csv_file}' not found")
-
-    df = pd.read_csv(csv_file, header=None)
-    sensors = {}
-    current_sensor = None
-    distances = []
-    data_rows = []
-    expecting_distances = False
-
-    for _, row in df.iterrows():
-        if pd.notna(row[1]) and ('MLX' in row[1] or 'RS-T10' in row[1]):
-            if current_sensor:
-                data_df = pd.DataFrame(data_rows, columns=distances)
-                data_df.set_index('AmbientTemp', inplace=True)
-                data_df = data_df.interpolate(method='linear', axis=0).interpolate(method='linear', axis=1)
-                sensors[current_sensor] = data_df
-                data_rows = []
-                distances = []
-            current_sensor = row[1]
-            expecting_distances = True
-            continue
-
-        if expecting_distances:
-            distances = ['AmbientTemp'] + [float(str(col).replace('m', '')) for col in row[1:6]]
-            expecting_distances = False
-            continue
-
-        if pd.notna(row[0]):
-            try:
-                ambient_temp = float(row[0])
-                values = []
-                for i in range(1, 6):
-                    cell_value = row[i]
-                    try:
-                        val = float(str(cell_value)) if pd.notna(cell_value) else np.nan
-                    except ValueError:
-                        val = np.nan
-                    values.append(val)
-                data_rows.append([ambient_temp] + values)
-            except ValueError:
-                continue
-
-    if current_sensor:
-        data_df = pd.DataFrame(data_rows, columns=distances)
-        data_df.set_index('AmbientTemp', inplace=True)
-        data_df = data_df.interpolate(method='linear', axis=0).interpolate(method='linear', axis=1)
-        sensors[current_sensor] = data_df
-
-    return sensors
-
-
-def bilinear_interpolation(x, y, x_coords, y_coords, z_grid):
-    """Perform bilinear interpolation"""
-    x_idx = np.searchsorted(x_coords, x) - 1
-    if x_idx < 0:
-        x_idx = 0
-    elif x_idx >= len(x_coords) - 1:
-        x_idx = len(x_coords) - 2
-    x1, x2 = x_coords[x_idx], x_coords[x_idx + 1]
-
-    y_idx = np.searchsorted(y_coords, y) - 1
-    if y_idx < 0:
-        y_idx = 0
-    elif y_idx >= len(y_coords) - 1:
-        y_idx = len(y_coords) - 2
-    y1, y2 = y_coords[y_idx], y_coords[y_idx + 1]
-
-    Q11 = z_grid[y_idx, x_idx]
-    Q12 = z_grid[y_idx + 1, x_idx]
-    Q21 = z_grid[y_idx, x_idx + 1]
-    Q22 = z_grid[y_idx + 1, x_idx + 1]
-
-    dx = x2 - x1
-    dy = y2 - y1
-
-    if dx == 0 and dy == 0: return Q11
-    if dx == 0: return (Q11 * (y2 - y) + Q12 * (y - y1)) / dy
-    if dy == 0: return (Q11 * (x2 - x) + Q21 * (x - x1)) / dx
-
-    f_y1 = ((x2 - x) / dx) * Q11 + ((x - x1) / dx) * Q21
-    f_y2 = ((x2 - x) / dx) * Q12 + ((x - x1) / dx) * Q22
-    return ((y2 - y) / dy) * f_y1 + ((y - y1) / dy) * f_y2
-
-
 def plot_2d(sensor_name, df, data_type):
     """Plot 2D line graph for sensor data"""
     plt.figure(figsize=(12, 7))
@@ -255,11 +168,8 @@ def main():
 
     try:
         # Load both datasets
-        mean_data = parse_sensor_data("bi-linear_tables.csv")
-        std_data = parse_sensor_data("bi-linear_tables_2.csv")
-        sensors = {name: {'mean': mean_data[name], 'std': std_data[name]}
-                   for name in mean_data}
-    except FileNotFoundError as e:
+        sensors = load_calibration_grids("bi-linear_tables.csv", "bi-linear_tables_2.csv")
+    except (FileNotFoundError, ValueError) as e:
         print(f"Error: {e}")
         return
 
@@ -267,8 +177,8 @@ def main():
     if input("\nGenerate 2D visualizations? (y/n): ").lower() == 'y':
         for sensor_name in sensors:
             print(f"\nGenerating 2D plots for {sensor_name}...")
-            plot_2d(sensor_name, sensors[sensor_name]['mean'], 'Mean')
-            plot_2d(sensor_name, sensors[sensor_name]['std'], 'Standard Deviation')
+            plot_2d(sensor_name, sensors[sensor_name].table('mean'), 'Mean')
+            plot_2d(sensor_name, sensors[sensor_name].table('std'), 'Standard Deviation')
 
     # Measurement Analysis
     if input("\nAnalyze measurements? (y/n): ").lower() == 'y':
@@ -286,45 +196,30 @@ def main():
                 missing = required_columns - set(new_data.columns)
                 raise ValueError(f"Missing columns: {missing}")
 
-            results = []
-            for _, row in new_data.iterrows():
-                try:
-                    distance = float(row['Distance'])
-                    ambient_temp = float(row['AmbientTemp'])
-                    measured_temp = float(row['MeasuredTemp'])
-                except ValueError:
-                    raise ValueError("Non-numeric values in input data")
-
-                mean_val = bilinear_interpolation(
-                    distance, ambient_temp,
-                    sensors[sensor_name]['mean'].columns.astype(float),
-                    sensors[sensor_name]['mean'].index.astype(float),
-                    sensors[sensor_name]['mean'].values
-                )
-
-                std_val = bilinear_interpolation(
-                    distance, ambient_temp,
-                    sensors[sensor_name]['std'].columns.astype(float),
-                    sensors[sensor_name]['std'].index.astype(float),
-                    sensors[sensor_name]['std'].values
-                )
-
-                diff = measured_temp - mean_val
-                status = "Within Range" if -2 <= diff <= 2 else "Out of Range"
-
-                if status == "Out of Range":
-                    Actions.take_action(status)
-
-                results.append({
-                    'Sensor': sensor_name,
-                    'Distance': distance,
-                    'AmbientTemp': ambient_temp,
-                    'MeasuredTemp': measured_temp,
-                    'MeanTemp': mean_val,
-                    'StdDev': std_val,
-                    'Difference': diff,
-                    'Status': status
-                })
+            try:
+                readings = new_data[['Distance', 'AmbientTemp', 'MeasuredTemp']].astype(float)
+            except (ValueError, TypeError):
+                raise ValueError("Non-numeric values in input data")
+
+            # Every row is interpolated at once
+            mean_vals, std_vals = sensors[sensor_name].interpolate(readings['Distance'], readings['AmbientTemp'])
+            diffs = readings['MeasuredTemp'].to_numpy() - mean_vals
+            in_range = (diffs >= -2) & (diffs <= 2)
+            statuses = np.where(in_range, "Within Range", "Out of Range")
+
+            for _ in range(np.count_nonzero(~in_range)):
+                Actions.take_action("Out of Range")
+
+            results = {
+                'Sensor': sensor_name,
+                'Distance': readings['Distance'].to_numpy(),
+                'AmbientTemp': readings['AmbientTemp'].to_numpy(),
+                'MeasuredTemp': readings['MeasuredTemp'].to_numpy(),
+                'MeanTemp': mean_vals,
+                'StdDev': std_vals,
+                'Difference': diffs,
+                'Status': statuses
+            }
 
             results_df = pd.DataFrame(results)
             results_df.to_csv('interpolated_results.csv', index=False)
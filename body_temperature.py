@@ -1,92 +1,8 @@
 import pandas as pd
 import numpy as np
-import os
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-
-def parse_sensor_data(csv_file):
-    if not os.path.isfile(csv_file):
-        raise FileNotFoundError(f"File '{csv_file}' not found")
-
-    df = pd.read_csv(csv_file, header=None)
-    sensors = {}
-    current_sensor = None
-    distances = []
-    data_rows = []
-    expecting_distances = False
-
-    for _, row in df.iterrows():
-        if pd.notna(row[1]) and ('MLX' in row[1] or 'RS-T10' in row[1]):
-            if current_sensor:
-                data_df = pd.DataFrame(data_rows, columns=distances)
-                data_df.set_index('AmbientTemp', inplace=True)
-                data_df = data_df.interpolate(method='linear', axis=0).interpolate(method='linear', axis=1)
-                sensors[current_sensor] = data_df
-                data_rows = []
-                distances = []
-            current_sensor = row[1]
-            expecting_distances = True
-            continue
-
-        if expecting_distances:
-            distances = ['AmbientTemp'] + [float(str(col).replace('m', '')) for col in row[1:6] if pd.notna(col)]
-            expecting_distances = False
-            continue
-
-        if pd.notna(row[0]) and str(row[0]).replace('.','').isdigit():
-            try:
-                ambient_temp = float(row[0])
-                values = []
-                for i in range(1, min(len(row), len(distances))):
-                    cell_value = row[i]
-                    try:
-                        val = float(str(cell_value)) if pd.notna(cell_value) else np.nan
-                    except ValueError:
-                        val = np.nan
-                    values.append(val)
-                if len(values) == len(distances) - 1:
-                    data_rows.append([ambient_temp] + values)
-            except ValueError:
-                continue
-
-    if current_sensor:
-        data_df = pd.DataFrame(data_rows, columns=distances)
-        data_df.set_index('AmbientTemp', inplace=True)
-        data_df = data_df.interpolate(method='linear', axis=0).interpolate(method='linear', axis=1)
-        sensors[current_sensor] = data_df
-
-    return sensors
-
-def bilinear_interpolation(x, y, x_coords, y_coords, z_grid):
-    x_idx = np.searchsorted(x_coords, x) - 1
-    if x_idx < 0:
-        x_idx = 0
-    elif x_idx >= len(x_coords) - 1:
-        x_idx = len(x_coords) - 2
-    x1, x2 = x_coords[x_idx], x_coords[x_idx + 1]
-
-    y_idx = np.searchsorted(y_coords, y) - 1
-    if y_idx < 0:
-        y_idx = 0
-    elif y_idx >= len(y_coords) - 1:
-        y_idx = len(y_coords) - 2
-    y1, y2 = y_coords[y_idx], y_coords[y_idx + 1]
-
-    Q11 = z_grid[y_idx, x_idx]
-    Q12 = z_grid[y_idx + 1, x_idx]
-    Q21 = z_grid[y_idx, x_idx + 1]
-    Q22 = z_grid[y_idx + 1, x_idx + 1]
-
-    dx = x2 - x1
-    dy = y2 - y1
-
-    if dx == 0 and dy == 0: return Q11
-    if dx == 0: return (Q11 * (y2 - y) + Q12 * (y - y1)) / dy
-    if dy == 0: return (Q11 * (x2 - x) + Q21 * (x - x1)) / dx
-
-    f_y1 = ((x2 - x) / dx) * Q11 + ((x - x1) / dx) * Q21
-    f_y2 = ((x2 - x) / dx) * Q12 + ((x - x1) / dx) * Q22
-    return ((y2 - y) / dy) * f_y1 + ((y - y1) / dy) * f_y2
+from calibration import load_calibration_grids
 
 def plot_body_temperature_analysis(df):
     try:
@@ -137,13 +53,10 @@ def plot_body_temperature_analysis(df):
     print("Plot saved as 'body_temperature_analysis.png'")
     plt.show()
 
-def process_body_temperature_data():
+def process_body_temperature_data(use_lookup_table=False):
     try:
-        mean_data = parse_sensor_data('bi-linear_tables.csv')
-        std_data = parse_sensor_data('bi-linear_tables_2.csv')
-        sensors = {name: {'mean': mean_data[name], 'std': std_data[name]}
-                   for name in mean_data}
-    except FileNotFoundError as e:
+        sensors = load_calibration_grids('bi-linear_tables.csv', 'bi-linear_tables_2.csv')
+    except (FileNotFoundError, ValueError) as e:
         print(f"Error loading sensor tables: {e}")
         return
     
@@ -171,61 +84,53 @@ def process_body_temperature_data():
         print(f"Error: body_temperature1.csv not found")
         return
     
-    processed_data = []
-    
-    for idx, row in df.iterrows():
-        try:
-            time = row['time']
-            room = row['room']
-            distance = float(row['distance_m'])
-            ambient_temp = float(row['ambient_temp_c'])
-            measured_temp = float(row['measured_body_temp_c'])
-            
-            # Calculate interpolated mean (body temperature)
-            interpolated_mean = bilinear_interpolation(
-                distance, ambient_temp,
-                sensors[sensor_name]['mean'].columns.astype(float),
-                sensors[sensor_name]['mean'].index.astype(float),
-                sensors[sensor_name]['mean'].values
-            )
-            
-            # Calculate interpolated standard deviation
-            interpolated_std = bilinear_interpolation(
-                distance, ambient_temp,
-                sensors[sensor_name]['std'].columns.astype(float),
-                sensors[sensor_name]['std'].index.astype(float),
-                sensors[sensor_name]['std'].values
-            )
-            
-            lower_bound = interpolated_mean - interpolated_std
-            upper_bound = interpolated_mean + interpolated_std
-            
-            within_range = "Yes" if lower_bound <= measured_temp <= upper_bound else "No"
-            
-            if within_range == "Yes":
-                action_taken = "Routine logging"
-            else:
-                action_taken = "Alert GP, adjust HVAC, dispatch robot"
-            
-            processed_data.append({
-                'time': time,
-                'room': room,
-                'distance_m': distance,
-                'ambient_temp_c': ambient_temp,
-                'measured_body_temp_c': measured_temp,
-                'body_temp': round(interpolated_mean, 2),  # Store interpolated mean
-                'mean_temp_c': round(interpolated_mean, 2),  # Same as body_temp (for compatibility)
-                'standard_dev': round(interpolated_std, 2),
-                'within_range': within_range,
-                'action_taken': action_taken
-            })
-            
-        except Exception as e:
-            print(f"Error processing row {idx}: {e}")
-            continue
+    numeric_columns = ['distance_m', 'ambient_temp_c', 'measured_body_temp_c']
+    try:
+        readings = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
+    except KeyError as e:
+        print(f"Error processing rows: missing column {e}")
+        return None
+
+    # Rows with values that aren't numbers are reported and skipped
+    invalid = (readings.isna() & df[numeric_columns].notna()).any(axis=1)
+    for idx in df.index[invalid]:
+        print(f"Error processing row {idx}: non-numeric value in {df.loc[idx, numeric_columns].tolist()}")
+    df, readings = df[~invalid], readings[~invalid]
+
+    distances = readings['distance_m'].to_numpy()
+    ambient_temps = readings['ambient_temp_c'].to_numpy()
+    measured_temps = readings['measured_body_temp_c'].to_numpy()
+
+    # Camera readings come at 1 cm / 0.1 °C resolution, so a dense table can replace the interpolation
+    calibration = sensors[sensor_name]
+    if use_lookup_table:
+        calibration = sensors[sensor_name].lookup_table(distance_step=0.01, temp_step=0.1)
+        errors = calibration.accuracy(sensors[sensor_name], distances, ambient_temps)
+        print(calibration.memory_report())
+        print(f"Lookup table error - Mean: {errors['mean_max_error']:.4f}°C, Std: {errors['std_max_error']:.4f}°C")
+
+    # Reference mean (body temperature) and standard deviation for every row at once
+    interpolated_means, interpolated_stds = calibration.interpolate(distances, ambient_temps)
+
+    lower_bounds = interpolated_means - interpolated_stds
+    upper_bounds = interpolated_means + interpolated_stds
+    within = (lower_bounds <= measured_temps) & (measured_temps <= upper_bounds)
+
+    processed_data = pd.DataFrame({
+        'time': df['time'].to_numpy(),
+        'room': df['room'].to_numpy(),
+        'distance_m': distances,
+        'ambient_temp_c': ambient_temps,
+        'measured_body_temp_c': measured_temps,
+        'body_temp': np.round(interpolated_means, 2),  # Store interpolated mean
+        'mean_temp_c': np.round(interpolated_means, 2),  # Same as body_temp (for compatibility)
+        'standard_dev': np.round(interpolated_stds, 2),
+        'within_range': np.where(within, "Yes", "No"),
+        'action_taken': np.where(within, "Routine logging", "Alert GP, adjust HVAC, dispatch robot")
+    })
     
-    if processed_data:
-        result_df = pd.DataFrame(processed_data)
+    if len(processed_data):
+        result_df = processed_data
         output_file = 'body_temperature_processed.csv'
         result_df.to_csv(output_file, index=False)
         
@@ -234,7 +139,7 @@ def process_body_temperature_data():
         
         plot_body_temperature_analysis(result_df)
         
-        normal_count = sum(1 for row in processed_data if row['within_range'] == 'Yes')
+        normal_count = int(np.count_nonzero(within))
         abnormal_count = len(processed_data) - normal_count
         
         print(f"Normal readings: {normal_count}")
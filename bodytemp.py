@@ -1,6 +1,7 @@
 import random
-import time
+import event_bus
 from sensor import Sensor
+from sensor_runtime import run_sensors
 
 
 class TemperatureSensor(Sensor):
@@ -12,6 +13,10 @@ class TemperatureSensor(Sensor):
         T (float): The current temperature.
     """
 
+    # Range of the starting temperature, in °C
+    min_temp = 36.1
+    max_temp = 37.2
+
     def __init__(self, name, start_time, stop_time=None, location=None):
         """
         Initializes the TemperatureSensor.
@@ -22,20 +27,23 @@ class TemperatureSensor(Sensor):
             stop_time (str, optional): The stop time for data collection. Defaults to None.
             location (str, optional): The location of the sensor. Defaults to None.
         """
-        super().__init__(name, datatype="float", start_time=start_time, stop_time=stop_time, location=location)
+        super().__init__(name, datatype="float", start_time=start_time, stop_time=stop_time, location=location,
+                         topic=event_bus.BODY_TEMPERATURE)
         self.temp_increase_rate = 0.05
         self.T = random.uniform(self.min_temp, self.max_temp)
 
-    def start(self):
+    def start(self, interval=1.0):
         """
-        Starts the sensor to collect and publish data.
+        Collects and publishes data every interval seconds between start_time and stop_time.
+
+        Blocks until the window closes or stop() is called. To run many sensors
+        together, add them to a sensor_runtime.SensorRuntime instead.
+
+        Parameters:
+            interval (float): Seconds between readings.
         """
-        while self.is_running and self.time >= self.start_time and (
-                self.stop_time is None or self.time <= self.stop_time):
-            self.publishsensordata(self.getdata())
-            time.sleep(1)
-            current_datetime = time.localtime()
-            self.time = time.strftime("%H:%M:%S", current_datetime)
+        super().start()
+        run_sensors([self], interval)
 
     def getdata(self):
         """
@@ -97,7 +105,7 @@ class AmbientTemperature:
 
 import pandas as pd
 import matplotlib.pyplot as plt
-import mplcursors
+from plot_hover import HoverText
 import numpy as np
 
 def graph_plot_body_temperature():
@@ -136,29 +144,23 @@ def graph_plot_body_temperature():
         # Plot each location with a unique color
         unique_locations = df['LOCATION'].unique()
         colors = plt.cm.tab10(np.linspace(0, 1, len(unique_locations)))
-        lines = []
+        hover = HoverText()
 
         for location, color in zip(unique_locations, colors):
             location_data = df[df['LOCATION'] == location]
             line, = ax.plot(location_data['DATE / TIME'], location_data['TEMPERATURE'], marker='o',
                             linestyle='-', color=color, linewidth=1.5, markersize=4, label=location)
-            lines.append((line, location_data))
-
-        # Define the hover function
-        def on_hover(event):
-            for line, location_data in lines:
-                if event.artist == line:
-                    ind = event.target.index
-                    location = location_data.iloc[ind]['LOCATION']
-                    temperature = location_data.iloc[ind]['TEMPERATURE']
-                    current_datetime = location_data.iloc[ind]['DATE / TIME']
-                    temp_range = location_data.iloc[ind]['TEMPERATURE RANGE']
-                    event.annotation.set_text(
-                        f"Date/Time: {current_datetime}\nLocation: {location}\nTemperature: {temperature} °C\nRange: {temp_range}")
+
+            hover.add(line, (
+                f"Date/Time: {pd.Timestamp(date_time)}\nLocation: {location}\n"
+                f"Temperature: {temperature} °C\nRange: {temperature_range}"
+                for date_time, temperature, temperature_range in zip(
+                    location_data['DATE / TIME'].to_numpy(), location_data['TEMPERATURE'].to_numpy(),
+                    location_data['TEMPERATURE RANGE'].to_numpy())
+            ))
 
         # Enable cursor with hover functionality
-        cursor = mplcursors.cursor(hover=True)
-        cursor.connect("add", on_hover)
+        hover.connect()
 
         # Improve layout and legend
         ax.legend(title='Location', fontsize=9, title_fontsize='10', loc='best', fancybox=True, framealpha=0.5)
@@ -174,15 +176,15 @@ def graph_plot_body_temperature():
 
 import pandas as pd
 import matplotlib.pyplot as plt
-import mplcursors
 import numpy as np
 
 
 def graph_plot_body_temperature2():
     import pandas as pd
     import matplotlib.pyplot as plt
-    import mplcursors
     import numpy as np
+    from plot_lod import plot_lod
+    from plot_hover import HoverText
 
     try:
         # Load the CSV file
@@ -226,12 +228,13 @@ def graph_plot_body_temperature2():
         # Plot each sensor ID with a unique color
         unique_sensors = df['SENSOR ID'].unique()
         colors = plt.cm.tab10(np.linspace(0, 1, len(unique_sensors)))
-        lines = []
+        hover = HoverText()
 
         for sensor_id, color in zip(unique_sensors, colors):
             sensor_data = df[df['SENSOR ID'] == sensor_id]
             if not sensor_data.empty:  # Ensure there's data for the sensor
-                line, = ax.plot(
+                lod = plot_lod(
+                    ax,
                     sensor_data['DISTANCE'].astype(float),
                     sensor_data['CALC TEMPERATURE'].astype(float),
                     marker='o',
@@ -241,25 +244,16 @@ def graph_plot_body_temperature2():
                     markersize=4,
                     label=sensor_id,
                 )
-                lines.append((line, sensor_data))
-
-        # Define the hover function
-        def on_hover(event):
-            for line, sensor_data in lines:
-                if event.artist == line:
-                    ind = event.target.index
-                    sensor_id = sensor_data.iloc[ind]['SENSOR ID']
-                    calc_temp = sensor_data.iloc[ind]['CALC TEMPERATURE']
-                    distance = sensor_data.iloc[ind]['DISTANCE']
-                    event.annotation.set_text(
-                        f"Sensor ID: {sensor_id}\n"
-                        f"Distance: {distance:.2f} m\n"
-                        f"Calculated Temperature: {calc_temp:.2f}°C"
-                    )
+                hover.add(lod, (
+                    f"Sensor ID: {sensor_id}\n"
+                    f"Distance: {distance:.2f} m\n"
+                    f"Calculated Temperature: {calc_temp:.2f}°C"
+                    for distance, calc_temp in zip(sensor_data['DISTANCE'].to_numpy(dtype=float),
+                                                   sensor_data['CALC TEMPERATURE'].to_numpy(dtype=float))
+                ))
 
         # Enable cursor with hover functionality
-        cursor = mplcursors.cursor(hover=True)
-        cursor.connect("add", on_hover)
+        hover.connect()
 
         # Improve layout and legend
         ax.legend(title='Sensor ID', fontsize=9, title_fontsize='10', loc='best', fancybox=True, framealpha=0.5)
@@ -0,0 +1,451 @@
+import os
+
+import numpy as np
+import pandas as pd
+from sensor_cache import CACHE_DIR, cache_location, read_columns, write_columns
+
+# Text in the second column that starts a sensor's block in the calibration tables
+SENSOR_PATTERN = r'MLX|RS-T10'
+
+
+def _fill_gaps(values):
+    """
+    Fills NaNs down each column by linear interpolation between the nearest valid rows.
+
+    Matches DataFrame.interpolate(method='linear', axis=0): trailing gaps take the
+    last valid value and leading gaps stay NaN.
+    """
+    values = np.array(values, dtype=np.float64)
+    positions = np.arange(len(values))[:, None]
+    valid = ~np.isnan(values)
+    previous = np.maximum.accumulate(np.where(valid, positions, -1), axis=0)
+    following = np.minimum.accumulate(np.where(valid, positions, len(values))[::-1], axis=0)[::-1]
+
+    gaps = ~valid & (previous >= 0)
+    rows, cols = np.nonzero(gaps)
+    before, after = previous[rows, cols], following[rows, cols]
+    start = values[before, cols]
+    inside = after < len(values)
+    end = np.where(inside, values[np.minimum(after, len(values) - 1), cols], start)
+    span = np.where(inside, after - before, 1)
+    values[rows, cols] = (end - start) / span * (rows - before) + start
+    return values
+
+
+def parse_sensor_data(csv_file):
+    """
+    Parses a calibration table file into one table per sensor.
+
+    Each block starts with a row naming the sensor in its second column, followed
+    by a row of distances ('1m', '2m', ...) and one row per ambient temperature.
+    Header rows are found with a single vectorized match and all reading rows are
+    converted to numbers in one pass, so the cost grows linearly with the file
+    size, whatever the number of sensors, distances or temperatures. Missing or
+    non-numeric cells are filled by linear interpolation along both axes.
+
+    Args:
+        csv_file (str): The table file, e.g. 'bi-linear_tables.csv'.
+
+    Returns:
+        dict: Sensor name -> DataFrame indexed by ambient temperature ('AmbientTemp'),
+        with the distances in metres as columns.
+    """
+    if not os.path.isfile(csv_file):
+        raise FileNotFoundError(f"File '{csv_file}' not found")
+
+    df = pd.read_csv(csv_file, header=None, dtype=object, encoding='utf-8-sig', skip_blank_lines=False)
+    if df.shape[1] < 2:
+        return {}
+
+    labels = df[1].astype('string').str.strip()
+    headers = np.flatnonzero(labels.str.contains(SENSOR_PATTERN, na=False).to_numpy(dtype=bool))
+    ambient_temps = pd.to_numeric(df[0], errors='coerce').to_numpy(dtype=np.float64)
+    cells = df.iloc[:, 1:].to_numpy()
+
+    # Only the reading rows are converted: not the sensor or distance rows, nor rows without a temperature
+    data_rows = ~np.isnan(ambient_temps)
+    data_rows[headers] = False
+    data_rows[headers[headers + 1 < len(df)] + 1] = False
+    block = cells[data_rows]
+    try:
+        numbers = block.astype(np.float64)
+    except (ValueError, TypeError):
+        numbers = pd.DataFrame(block).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+    values = np.full(cells.shape, np.nan)
+    values[data_rows] = numbers
+
+    sensors = {}
+    for start, stop in zip(headers, np.append(headers[1:], len(df))):
+        if start + 1 >= stop:
+            continue
+        distance_cells = cells[start + 1]
+        columns = np.flatnonzero(pd.notna(distance_cells))
+        distances = pd.to_numeric(pd.Series(distance_cells[columns], dtype=str).str.replace('m', '').str.strip(),
+                                  errors='coerce')
+
+        rows = np.arange(start + 2, stop)
+        rows = rows[~np.isnan(ambient_temps[rows])]
+        # Gaps are filled down the temperatures first, then across the distances
+        block = _fill_gaps(_fill_gaps(values[np.ix_(rows, columns)]).T).T
+        sensors[str(labels.iloc[start])] = pd.DataFrame(
+            block, index=pd.Index(ambient_temps[rows], name='AmbientTemp'), columns=distances.to_numpy(dtype=np.float64)
+        )
+
+    return sensors
+
+
+def bilinear_interpolation_array(x, y, x_coords, y_coords, z_grid):
+    """
+    Bilinear interpolation of many points at once.
+
+    Each point is interpolated in its grid cell: the cell is found with
+    searchsorted and clamped to the grid, so points outside the grid are
+    extrapolated from the edge cell, and an axis with a zero-width cell falls
+    back to interpolating along the other axis only.
+
+    Args:
+        x (array-like): The x values (distances), one per point.
+        y (array-like): The y values (ambient temperatures), one per point.
+        x_coords (array-like): The sorted grid x coordinates.
+        y_coords (array-like): The sorted grid y coordinates.
+        z_grid (array-like): The grid values, shaped (len(y_coords), len(x_coords)).
+
+    Returns:
+        numpy.ndarray: The interpolated value of every point.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    x_coords = np.asarray(x_coords, dtype=np.float64)
+    y_coords = np.asarray(y_coords, dtype=np.float64)
+    z_grid = np.asarray(z_grid, dtype=np.float64)
+
+    x_idx = np.clip(np.searchsorted(x_coords, x) - 1, 0, len(x_coords) - 2)
+    y_idx = np.clip(np.searchsorted(y_coords, y) - 1, 0, len(y_coords) - 2)
+    x1, x2 = x_coords[x_idx], x_coords[x_idx + 1]
+    y1, y2 = y_coords[y_idx], y_coords[y_idx + 1]
+
+    Q11 = z_grid[y_idx, x_idx]
+    Q12 = z_grid[y_idx + 1, x_idx]
+    Q21 = z_grid[y_idx, x_idx + 1]
+    Q22 = z_grid[y_idx + 1, x_idx + 1]
+
+    dx = x2 - x1
+    dy = y2 - y1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tx = np.where(dx == 0, 0.0, (x - x1) / dx)
+        ty = np.where(dy == 0, 0.0, (y - y1) / dy)
+
+    f_y1 = (1 - tx) * Q11 + tx * Q21
+    f_y2 = (1 - tx) * Q12 + tx * Q22
+    return (1 - ty) * f_y1 + ty * f_y2
+
+
+class CalibrationGrid:
+    """
+    One sensor's calibration tables as contiguous float64 arrays.
+
+    Attributes:
+        name (str): The sensor name, e.g. 'MLX-P'.
+        distances (numpy.ndarray): The distance axis in metres.
+        ambient_temps (numpy.ndarray): The ambient temperature axis.
+        mean (numpy.ndarray): Reference mean temperatures, (ambient_temps x distances).
+        std (numpy.ndarray): Reference standard deviations, same shape.
+    """
+
+    def __init__(self, name, distances, ambient_temps, mean, std):
+        """
+        Initializes the CalibrationGrid.
+
+        Args:
+            name (str): The sensor name.
+            distances (array-like): The sorted distance axis.
+            ambient_temps (array-like): The sorted ambient temperature axis.
+            mean (array-like): The mean grid, (len(ambient_temps), len(distances)).
+            std (array-like): The standard deviation grid, same shape.
+        """
+        self.name = name
+        self.distances = np.ascontiguousarray(distances, dtype=np.float64)
+        self.ambient_temps = np.ascontiguousarray(ambient_temps, dtype=np.float64)
+        self.mean = np.ascontiguousarray(mean, dtype=np.float64)
+        self.std = np.ascontiguousarray(std, dtype=np.float64)
+
+    @staticmethod
+    def from_tables(name, mean_table, std_table):
+        """
+        Builds a grid from parsed mean and std tables.
+
+        Args:
+            name (str): The sensor name.
+            mean_table (pandas.DataFrame): Indexed by ambient temperature, with distances as columns.
+            std_table (pandas.DataFrame): The same layout as mean_table.
+
+        Returns:
+            CalibrationGrid: The grid.
+        """
+        distances = mean_table.columns.astype(float)
+        ambient_temps = mean_table.index.astype(float)
+        if not (np.array_equal(distances, std_table.columns.astype(float))
+                and np.array_equal(ambient_temps, std_table.index.astype(float))):
+            raise ValueError(f"Mean and standard deviation tables of '{name}' have different axes")
+        return CalibrationGrid(name, distances, ambient_temps, mean_table.values, std_table.values)
+
+    def interpolate(self, distances, ambient_temps):
+        """
+        Interpolates the reference mean and standard deviation for every reading.
+
+        Args:
+            distances (array-like): The distance of each reading in metres.
+            ambient_temps (array-like): The ambient temperature of each reading.
+
+        Returns:
+            tuple: (mean, std) arrays, one value per reading.
+        """
+        return (bilinear_interpolation_array(distances, ambient_temps, self.distances, self.ambient_temps, self.mean),
+                bilinear_interpolation_array(distances, ambient_temps, self.distances, self.ambient_temps, self.std))
+
+    def table(self, kind='mean'):
+        """
+        Returns the 'mean' or 'std' grid as a DataFrame indexed by ambient temperature, for plotting.
+        """
+        return pd.DataFrame(getattr(self, kind), index=self.ambient_temps, columns=self.distances)
+
+    def lookup_table(self, distance_step=0.01, temp_step=0.1, distance_range=None, temp_range=None, dtype=np.float64):
+        """
+        Precomputes the interpolated mean and std over a dense quantized grid.
+
+        Args:
+            distance_step (float): The distance resolution in metres. Defaults to 1 cm.
+            temp_step (float): The ambient temperature resolution. Defaults to 0.1 °C.
+            distance_range (tuple, optional): (min, max) distance covered. Defaults
+                to the calibrated distances.
+            temp_range (tuple, optional): (min, max) ambient temperature covered.
+                Defaults to the calibrated temperatures.
+            dtype: The table dtype; float32 halves the memory.
+
+        Returns:
+            CalibrationLUT: The lookup table.
+        """
+        distance_range = distance_range or (self.distances[0], self.distances[-1])
+        temp_range = temp_range or (self.ambient_temps[0], self.ambient_temps[-1])
+        distances = distance_range[0] + distance_step * np.arange(int(round((distance_range[1] - distance_range[0]) / distance_step)) + 1)
+        temps = temp_range[0] + temp_step * np.arange(int(round((temp_range[1] - temp_range[0]) / temp_step)) + 1)
+        grid_temps, grid_distances = np.meshgrid(temps, distances, indexing='ij')
+        mean, std = self.interpolate(grid_distances.ravel(), grid_temps.ravel())
+        return CalibrationLUT(self.name, distance_range[0], distance_step, len(distances),
+                              temp_range[0], temp_step, len(temps), mean.astype(dtype), std.astype(dtype))
+
+
+class CalibrationLUT:
+    """
+    A sensor's calibration precomputed at a fixed distance/temperature resolution.
+
+    A reading is snapped to the nearest grid cell, so a query is one integer index
+    and two array lookups per reading. Readings outside the covered range are
+    clamped to its edge, unlike the exact interpolation, which extrapolates.
+
+    Attributes:
+        name (str): The sensor name.
+        shape (tuple): (temperature steps, distance steps).
+        mean (numpy.ndarray): The flattened mean table.
+        std (numpy.ndarray): The flattened std table.
+    """
+
+    def __init__(self, name, distance_start, distance_step, distance_count, temp_start, temp_step, temp_count, mean, std):
+        """
+        Initializes the CalibrationLUT; see CalibrationGrid.lookup_table().
+
+        Args:
+            name (str): The sensor name.
+            distance_start, distance_step, distance_count: The distance axis.
+            temp_start, temp_step, temp_count: The ambient temperature axis.
+            mean, std (numpy.ndarray): The flattened tables, temperature-major.
+        """
+        self.name = name
+        self.distance_start = distance_start
+        self.distance_step = distance_step
+        self.temp_start = temp_start
+        self.temp_step = temp_step
+        self.shape = (temp_count, distance_count)
+        self.mean = mean
+        self.std = std
+
+    @property
+    def nbytes(self):
+        return self.mean.nbytes + self.std.nbytes
+
+    def memory_report(self):
+        """Returns a one-line summary of the table size and memory use."""
+        return (f"{self.name} lookup table: {self.shape[0]} x {self.shape[1]} cells "
+                f"({self.distance_step * 100:g} cm x {self.temp_step:g} °C), {self.nbytes / 1024:.1f} KiB")
+
+    def index(self, distances, ambient_temps):
+        """
+        Returns the flat table index of every reading.
+        """
+        d = np.clip(np.rint((np.asarray(distances, dtype=np.float64) - self.distance_start) / self.distance_step),
+                    0, self.shape[1] - 1)
+        t = np.clip(np.rint((np.asarray(ambient_temps, dtype=np.float64) - self.temp_start) / self.temp_step),
+                    0, self.shape[0] - 1)
+        return np.nan_to_num(t).astype(np.intp) * self.shape[1] + np.nan_to_num(d).astype(np.intp)
+
+    def interpolate(self, distances, ambient_temps):
+        """
+        Looks up the reference mean and standard deviation for every reading.
+
+        Args:
+            distances (array-like): The distance of each reading in metres.
+            ambient_temps (array-like): The ambient temperature of each reading.
+
+        Returns:
+            tuple: (mean, std) arrays, one value per reading; NaN where a reading is missing.
+        """
+        distances = np.asarray(distances, dtype=np.float64)
+        ambient_temps = np.asarray(ambient_temps, dtype=np.float64)
+        index = self.index(distances, ambient_temps)
+        missing = np.isnan(distances) | np.isnan(ambient_temps)
+        mean = np.where(missing, np.nan, self.mean[index])
+        std = np.where(missing, np.nan, self.std[index])
+        return mean, std
+
+    def accuracy(self, grid, distances=None, ambient_temps=None, samples=10000):
+        """
+        Compares the table against the exact interpolation of a CalibrationGrid.
+
+        Args:
+            grid (CalibrationGrid): The grid the table was built from.
+            distances, ambient_temps (array-like, optional): The readings to check.
+                Defaults to random points over the covered range.
+            samples (int): The number of random points.
+
+        Returns:
+            dict: Maximum and mean absolute error of the mean and std lookups.
+        """
+        if distances is None or ambient_temps is None:
+            rng = np.random.default_rng(0)
+            distances = rng.uniform(self.distance_start, self.distance_start + self.distance_step * (self.shape[1] - 1), samples)
+            ambient_temps = rng.uniform(self.temp_start, self.temp_start + self.temp_step * (self.shape[0] - 1), samples)
+        exact_mean, exact_std = grid.interpolate(distances, ambient_temps)
+        mean, std = self.interpolate(distances, ambient_temps)
+        mean_error = np.abs(mean - exact_mean)
+        std_error = np.abs(std - exact_std)
+        return {
+            'mean_max_error': float(np.nanmax(mean_error)),
+            'mean_avg_error': float(np.nanmean(mean_error)),
+            'std_max_error': float(np.nanmax(std_error)),
+            'std_avg_error': float(np.nanmean(std_error)),
+        }
+
+
+def load_calibration_grids(mean_file='bi-linear_tables.csv', std_file='bi-linear_tables_2.csv'):
+    """
+    Loads every sensor's calibration grid through a binary cache.
+
+    The first load parses both tables and stores the grids as .npy files; later
+    loads memory-map them. The cache is rebuilt when either table file changes
+    (size or modification time).
+
+    Args:
+        mean_file (str): The table of reference means.
+        std_file (str): The table of reference standard deviations.
+
+    Returns:
+        dict: Sensor name -> CalibrationGrid.
+    """
+    std_stat = os.stat(std_file)
+    target = cache_location(mean_file, os.path.abspath(std_file), std_stat.st_size, std_stat.st_mtime_ns,
+                            cache_dir=os.path.join(CACHE_DIR, 'calibration'))
+    cached = read_columns(target)
+    if cached is None:
+        mean_data = parse_sensor_data(mean_file)
+        std_data = parse_sensor_data(std_file)
+        grids = {name: CalibrationGrid.from_tables(name, mean_data[name], std_data[name]) for name in mean_data}
+        columns = {}
+        for name, grid in grids.items():
+            for field in ('distances', 'ambient_temps', 'mean', 'std'):
+                columns[f"{name}/{field}"] = getattr(grid, field)
+        try:
+            write_columns(target, columns, {'sensors': list(grids)})
+        except OSError as e:
+            print(f"Could not write calibration cache for '{mean_file}': {e}")
+        return grids
+
+    columns, meta = cached
+    return {name: CalibrationGrid(name, *(columns[f"{name}/{field}"] for field in ('distances', 'ambient_temps', 'mean', 'std')))
+            for name in meta['sensors']}
+
+
+class LinearCalibration:
+    """
+    Per-sensor linear models that turn a reading's distance into a calculated temperature.
+
+    Each sensor has calculated = slope * distance + intercept. The coefficients come
+    from a config table, so a new sensor only needs a new row there.
+
+    Attributes:
+        sensors (list): The sensor IDs with a model.
+        slopes (numpy.ndarray): The slope of each sensor.
+        intercepts (numpy.ndarray): The intercept of each sensor.
+    """
+
+    def __init__(self, models):
+        """
+        Initializes the LinearCalibration.
+
+        Args:
+            models (dict): Sensor ID -> (slope, intercept).
+        """
+        self.sensors = [str(sensor).strip() for sensor in models]
+        self.slopes = np.array([slope for slope, _ in models.values()], dtype=np.float64)
+        self.intercepts = np.array([intercept for _, intercept in models.values()], dtype=np.float64)
+
+    @staticmethod
+    def from_csv(config_file='sensor_formulas.csv'):
+        """
+        Loads the models from a table with 'SENSOR ID', 'SLOPE' and 'INTERCEPT' columns.
+
+        Args:
+            config_file (str): The config table.
+
+        Returns:
+            LinearCalibration: The models.
+        """
+        if not os.path.isfile(config_file):
+            raise FileNotFoundError(f"File '{config_file}' not found")
+        config = pd.read_csv(config_file, skipinitialspace=True)
+        config.columns = [str(col).strip().upper() for col in config.columns]
+        missing = {'SENSOR ID', 'SLOPE', 'INTERCEPT'} - set(config.columns)
+        if missing:
+            raise ValueError(f"Missing columns in '{config_file}': {missing}")
+        return LinearCalibration({sensor: (slope, intercept) for sensor, slope, intercept
+                                  in zip(config['SENSOR ID'], config['SLOPE'], config['INTERCEPT'])})
+
+    def apply(self, sensor_ids, distances):
+        """
+        Calculates the temperature of every reading with its sensor's model.
+
+        Readings are grouped by sensor ID and every group's coefficients are
+        applied in one array expression.
+
+        Args:
+            sensor_ids (array-like): The sensor ID of each reading.
+            distances (array-like): The distance of each reading.
+
+        Returns:
+            numpy.ndarray: The calculated temperatures; NaN for sensors without a model.
+        """
+        sensor_ids = pd.Series(sensor_ids, dtype=object).astype(str).str.strip()
+        codes, groups = pd.factorize(sensor_ids)
+        lookup = {sensor: i for i, sensor in enumerate(self.sensors)}
+        # Index -1 picks the trailing NaN, for sensors without a model
+        model = np.array([lookup.get(sensor, -1) for sensor in groups], dtype=np.intp)[codes]
+        slopes = np.append(self.slopes, np.nan)[model]
+        intercepts = np.append(self.intercepts, np.nan)[model]
+        return slopes * np.asarray(distances, dtype=np.float64) + intercepts
+
+    @staticmethod
+    def accept(calculated, original, tolerance=2.0):
+        """
+        Returns True for every reading whose calculated temperature is within tolerance of the measured one.
+        """
+        difference = np.asarray(calculated, dtype=np.float64) - np.asarray(original, dtype=np.float64)
+        return (difference >= -tolerance) & (difference <= tolerance)
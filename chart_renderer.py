@@ -0,0 +1,155 @@
+import hashlib
+import importlib
+import inspect
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def _load_function(spec):
+    module_name, function_name = spec.split(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _job_hash(job):
+    """
+    Hashes everything that determines a chart: the function and the source of
+    its module, its arguments and its input files.
+
+    Editing the plotting function, or a helper in its module, changes the hash.
+    Changes in other modules it calls do not.
+    """
+    function = _load_function(job['function'])
+    digest = hashlib.sha256()
+    digest.update(f"{function.__module__}.{function.__qualname__}".encode('utf-8'))
+    with open(inspect.getsourcefile(function), 'rb') as file:
+        digest.update(file.read())
+    digest.update(pickle.dumps((job.get('args', ()), job.get('kwargs', {}))))
+    for input_file in job.get('inputs', []):
+        digest.update(input_file.encode('utf-8'))
+        with open(input_file, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _output_files(output, count):
+    stem, ext = os.path.splitext(output)
+    return [output] + [f"{stem}-{i}{ext}" for i in range(2, count + 1)]
+
+
+def _render(job):
+    """Runs one chart job in a worker process and saves its figures instead of showing them."""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    import matplotlib.pyplot as plt
+
+    saved = []
+
+    def save_open_figures(*args, **kwargs):
+        figures = [plt.figure(number) for number in plt.get_fignums()]
+        for figure, output_file in zip(figures, _output_files(job['output'], len(figures) + len(saved))[len(saved):]):
+            figure.savefig(output_file, dpi=job.get('dpi', 150), bbox_inches='tight')
+            saved.append(output_file)
+        plt.close('all')
+
+    plt.show = save_open_figures
+    function = _load_function(job['function'])
+    function(*job.get('args', ()), **job.get('kwargs', {}))
+    save_open_figures()
+    return saved
+
+
+def render_jobs(jobs, max_workers=None):
+    """
+    Renders chart jobs to image files on a non-interactive backend, in parallel.
+
+    Each job is a dict with:
+        function (str): The plotting entry point as 'module:function',
+            e.g. 'co2_processor_2:graph_plot'. Whatever it would plt.show()
+            is saved instead.
+        output (str): The image to write; the extension picks the format
+            (.png, .svg, ...). Further figures go to '<stem>-2<ext>', ...
+        args (tuple, optional) / kwargs (dict, optional): Passed to the function.
+        inputs (list, optional): Data files the chart is drawn from.
+        dpi (int, optional): Resolution of raster output. Defaults to 150.
+
+    A job is skipped when its output exists and the hash of its function (name
+    and module source), arguments and input files matches the one stored next to it ('<output>.sha256').
+
+    Args:
+        jobs (list): The chart jobs.
+        max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+
+    Returns:
+        dict: The status of each job by output file: 'rendered', 'skipped' or
+        'failed: <error>'.
+    """
+    status = {}
+    pending = {}
+    for job in jobs:
+        try:
+            job_hash = _job_hash(job)
+        except (OSError, ImportError, AttributeError, TypeError) as e:
+            status[job['output']] = f"failed: {e}"
+            continue
+        hash_file = job['output'] + '.sha256'
+        if os.path.isfile(job['output']) and os.path.isfile(hash_file):
+            with open(hash_file, encoding='utf-8') as file:
+                if file.read().strip() == job_hash:
+                    status[job['output']] = 'skipped'
+                    continue
+        pending[job['output']] = (job, job_hash)
+
+    if not pending:
+        return status
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_render, job): output for output, (job, _) in pending.items()}
+        for future in as_completed(futures):
+            output = futures[future]
+            try:
+                saved = future.result()
+            except Exception as e:
+                status[output] = f"failed: {e}"
+                continue
+            if not saved:
+                status[output] = "failed: the job produced no figure"
+                continue
+            with open(output + '.sha256', 'w', encoding='utf-8') as file:
+                file.write(pending[output][1])
+            status[output] = 'rendered'
+    return status
+
+
+if __name__ == "__main__":
+    rooms = ['bedroom', 'dining', 'kitchen', 'lounge']
+    os.makedirs('reports', exist_ok=True)
+
+    chart_jobs = [
+        {
+            'function': 'co2_processor_2:graph_plot',
+            'inputs': ['co2_csv_file.csv'],
+            'output': 'reports/co2_by_sensor.png',
+        },
+        {
+            'function': 'bilinear_interpolation:run_scenario',
+            'output': 'reports/scenario.svg',
+        },
+    ]
+    for room in rooms:
+        chart_jobs.append({
+            'function': 'co2_data_all_rooms:plot_combined_co2_data',
+            'args': ([f'co2_data_{room}.csv'], [room.capitalize()], ['black']),
+            'inputs': [f'co2_data_{room}.csv'],
+            'output': f'reports/co2_{room}.png',
+        })
+        chart_jobs.append({
+            'function': 'amb_temp_all_rooms:plot_combined_temperature_data',
+            'args': ([f'ambient_temperature_{room}.csv'], [room.capitalize()], ['black']),
+            'inputs': [f'ambient_temperature_{room}.csv'],
+            'output': f'reports/ambient_temperature_{room}.png',
+        })
+
+    for output, result in sorted(render_jobs(chart_jobs).items()):
+        print(f"{output}: {result}")
@@ -0,0 +1,133 @@
+import os
+import random
+import threading
+import time as _time
+
+# Environment variables that select the clock for a run:
+#   SIM_CLOCK=virtual             run in virtual time (default: wall clock)
+#   SIM_START=2024-01-01 07:00:00 the virtual start time (local time)
+#   SIM_SEED=42                   seed the random choices so runs repeat exactly
+CLOCK_ENV = 'SIM_CLOCK'
+START_ENV = 'SIM_START'
+SEED_ENV = 'SIM_SEED'
+START_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class WallClock:
+    """
+    The real clock: sleeping waits and timestamps come from the system time.
+    """
+
+    def time(self):
+        return _time.time()
+
+    def monotonic(self):
+        return _time.monotonic()
+
+    def sleep(self, seconds):
+        _time.sleep(seconds)
+
+    def strftime(self, fmt):
+        return _time.strftime(fmt, _time.localtime(self.time()))
+
+
+class VirtualClock:
+    """
+    A simulated clock that jumps straight to the end of every sleep.
+
+    Only the driving thread (the one that created the clock, unless set with
+    drive()) moves time forward: its sleep() advances the clock instantly. Sleeps
+    on other threads, such as actuator workers pacing their actions, return at
+    once without moving time, so background work never holds up the simulation.
+    A run that would take hours of wall time finishes in seconds, and with the
+    same start time and random seed it produces the same timestamps every time.
+
+    Attributes:
+        now (float): The current virtual time in seconds since the epoch.
+    """
+
+    def __init__(self, start=None):
+        """
+        Initializes the VirtualClock.
+
+        Args:
+            start (float or str, optional): The start time, as epoch seconds or a
+                'YYYY-MM-DD HH:MM:SS' local time. Defaults to the current wall time.
+        """
+        if isinstance(start, str):
+            start = _time.mktime(_time.strptime(start, START_FORMAT))
+        self.now = float(_time.time() if start is None else start)
+        self._origin = self.now
+        self._lock = threading.Lock()
+        self._driver = threading.current_thread()
+
+    def drive(self, thread=None):
+        """Makes thread (default: the calling thread) the one that advances time."""
+        self._driver = thread or threading.current_thread()
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now - self._origin
+
+    def sleep(self, seconds):
+        if threading.current_thread() is self._driver:
+            self.advance(seconds)
+        else:
+            _time.sleep(0)
+
+    def advance(self, seconds):
+        """Moves the clock forward."""
+        with self._lock:
+            self.now += max(float(seconds), 0.0)
+
+    def strftime(self, fmt):
+        return _time.strftime(fmt, _time.localtime(self.now))
+
+
+def _from_environment():
+    if os.environ.get(SEED_ENV):
+        random.seed(int(os.environ[SEED_ENV]))
+    if os.environ.get(CLOCK_ENV, '').lower() == 'virtual':
+        return VirtualClock(os.environ.get(START_ENV) or None)
+    return WallClock()
+
+
+_clock = _from_environment()
+
+
+def current():
+    """Returns the clock in use."""
+    return _clock
+
+
+def use(new_clock):
+    """
+    Installs the clock every sensor, processor, action and diary timestamp goes through.
+
+    Args:
+        new_clock (WallClock or VirtualClock): The clock to use.
+
+    Returns:
+        The clock, for chaining.
+    """
+    global _clock
+    _clock = new_clock
+    return new_clock
+
+
+def time():
+    return _clock.time()
+
+
+def monotonic():
+    return _clock.monotonic()
+
+
+def sleep(seconds):
+    _clock.sleep(seconds)
+
+
+def strftime(fmt):
+    return _clock.strftime(fmt)
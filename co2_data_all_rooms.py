@@ -1,34 +1,27 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from datetime import datetime
 import numpy as np
+from plot_lod import plot_lod
+from room_dataset import RoomDataset
 
 def plot_combined_co2_data(csv_files, room_names, colors, time_column='time', co2_column='co2_ppm', rate_column='rate_of_change'):
     
+    # Every room file is read once and serves both figures and all statistics
+    dataset = RoomDataset(csv_files, room_names, time_column=time_column)
+    room_colors = dict(zip(room_names, colors))
+    
     plt.figure(figsize=(14, 8))
     
-    for i, (csv_file, room_name, color) in enumerate(zip(csv_files, room_names, colors)):
-        try:
-            df = pd.read_csv(csv_file)
-            print(f"Successfully loaded data from {csv_file}")
-            print(f"Data shape: {df.shape}")
-            
-            df['datetime'] = pd.to_datetime('2024-01-01 ' + df[time_column].astype(str))
-            df[co2_column] = pd.to_numeric(df[co2_column], errors='coerce')
-            
-            plt.plot(df['datetime'], df[co2_column], 
-                    color=color, linewidth=2, marker='o', markersize=2, 
+    if co2_column in dataset:
+        summary = dataset.summary(co2_column)
+        for room_name in dataset.rooms:
+            times, co2 = dataset.series(room_name, co2_column)
+            plot_lod(plt.gca(), times, co2, 
+                    color=room_colors[room_name], linewidth=2, marker='o', markersize=2, 
                     label=f'{room_name}', alpha=0.8)
             
-            print(f"{room_name} CO2 - Min: {df[co2_column].min():.0f} ppm, Max: {df[co2_column].max():.0f} ppm, Mean: {df[co2_column].mean():.0f} ppm")
-            
-        except FileNotFoundError:
-            print(f"Error: File '{csv_file}' not found.")
-            continue
-        except Exception as e:
-            print(f"Error processing {csv_file}: {e}")
-            continue
+            low, high, mean = summary[room_name]
+            print(f"{room_name} CO2 - Min: {low:.0f} ppm, Max: {high:.0f} ppm, Mean: {mean:.0f} ppm")
     
     plt.title('CO2 Levels Monitoring', fontsize=16, fontweight='bold')
     plt.xlabel('Time (per 10 minutes)', fontsize=12)
@@ -45,25 +38,16 @@ def plot_combined_co2_data(csv_files, room_names, colors, time_column='time', co
     
     plt.figure(figsize=(14, 8))
     
-    for i, (csv_file, room_name, color) in enumerate(zip(csv_files, room_names, colors)):
-        try:
-            df = pd.read_csv(csv_file)
-            
-            df['datetime'] = pd.to_datetime('2024-01-01 ' + df[time_column].astype(str))
-            df[rate_column] = pd.to_numeric(df[rate_column], errors='coerce').fillna(0)
-            
-            plt.plot(df['datetime'], df[rate_column], 
-                    color=color, linewidth=2, marker='o', markersize=2, 
+    if rate_column in dataset:
+        rates = np.nan_to_num(dataset.column(rate_column))
+        for row, room_name in enumerate(dataset.rooms):
+            present = dataset.present[row]
+            room_rates = rates[row, present]
+            plot_lod(plt.gca(), dataset.times[present], room_rates, 
+                    color=room_colors[room_name], linewidth=2, marker='o', markersize=2, 
                     label=f'{room_name}', alpha=0.8)
             
-            print(f"{room_name} Rate - Min: {df[rate_column].min():.0f}, Max: {df[rate_column].max():.0f}, Mean: {df[rate_column].mean():.1f}")
-            
-        except FileNotFoundError:
-            print(f"Error: File '{csv_file}' not found.")
-            continue
-        except Exception as e:
-            print(f"Error processing {csv_file}: {e}")
-            continue
+            print(f"{room_name} Rate - Min: {room_rates.min():.0f}, Max: {room_rates.max():.0f}, Mean: {room_rates.mean():.1f}")
     
     plt.title('CO2 Rate of Change Monitoring', fontsize=16, fontweight='bold')
     plt.xlabel('Time (per 10 minutes)', fontsize=12)
@@ -0,0 +1,59 @@
+from csv_tail import CSVTail
+from sensor_state import SensorStateStore
+
+
+class CO2Follower:
+    """
+    Follows a live CO2 export and classifies only the readings appended since the last poll.
+
+    The byte offset and each sensor's previous value and rolling baseline carry
+    over between polls, so the cost of a poll depends on the new data only.
+
+    Attributes:
+        tail (CSVTail): Tracks how far the file has been read.
+        sensor_state (SensorStateStore): Per-sensor previous value and baseline.
+    """
+
+    def __init__(self, handle_co2_levels, file_path='co2_csv_file.csv', window=6):
+        """
+        Initializes the CO2Follower.
+
+        Args:
+            handle_co2_levels (callable): Called per reading with (sensor_id,
+                current_datetime, co2_emission, change, moving_average), e.g.
+                CO2Processor.handle_co2_levels.
+            file_path (str): The CSV export to follow.
+            window (int): The number of readings in each sensor's baseline.
+        """
+        self.handle_co2_levels = handle_co2_levels
+        self.tail = CSVTail(file_path)
+        self.sensor_state = SensorStateStore(window=window)
+
+    def poll(self):
+        """
+        Processes the rows appended since the previous poll.
+
+        Returns:
+            list: The change in percentage of every new reading that has a previous
+            reading from the same sensor.
+        """
+        change_in_percentage = []
+
+        for row in self.tail.read_new_rows():
+            if len(row) < 3:
+                print(f"Skipping row due to insufficient columns: {row}")
+                continue
+
+            try:
+                sensor_id = row[0]
+                current_datetime = row[1]
+                co2_emission = int(row[2])
+            except ValueError as e:
+                print(f"Error in row {row}: {e}")
+                continue
+
+            change, moving_average = self.sensor_state.push(sensor_id, co2_emission, change_in_percentage)
+
+            self.handle_co2_levels(sensor_id, current_datetime, co2_emission, change, moving_average)
+
+        return change_in_percentage
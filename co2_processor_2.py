@@ -1,6 +1,7 @@
 import random
 import time
 import csv
+import numpy as np
 import pandas as pd
 import communication_action
 import windows_action
@@ -8,9 +9,84 @@ import door_action
 import robot_action
 import diary
 from co2_sensor import CO2Monitoring
+from rolling_stats import rolling_mean, percent_change
+from sensor_state import SensorStateStore
+from action_dispatcher import dispatch
+
+ACTION_NORMAL = "No Action. Normal Health"
+ACTION_DOUBLED = "Vent fan ON. Door opened. Window opened."
+ACTION_CRITICAL = "Reduce number of occupants. All vent fans ON. All doors opened. All windows opened"
+CO2_ACTIONS = [ACTION_NORMAL, ACTION_DOUBLED, ACTION_CRITICAL]
+
+
+def classify_co2(co2, groups=None, window=6):
+    """
+    Computes change, baseline and action for whole arrays of CO2 readings.
+
+    Args:
+        co2 (array-like): The readings, in time order.
+        groups (array-like, optional): A sensor key per reading; each sensor gets
+            its own previous value and baseline.
+        window (int): The number of readings in the moving-average baseline.
+
+    Returns:
+        tuple: (change, moving_average, action) arrays, where action holds the
+        index into CO2_ACTIONS, or -1 for a reading exactly on 2x the baseline.
+    """
+    co2 = np.asarray(co2, dtype=np.float64)
+    moving_average = rolling_mean(co2, window=window, groups=groups)
+    change = percent_change(co2, groups=groups)
+    action = np.select(
+        [co2 < moving_average * 2, co2 > moving_average * 2.5, co2 > moving_average * 2],
+        [0, 2, 1],
+        default=-1,
+    )
+    return change, moving_average, action
 
 
 class CO2Processor(CO2Monitoring):
+    @staticmethod
+    def process_conditions_batch(file_path='co2_csv_file.csv', column_name='co2'):
+        """
+        Classifies every reading of a CO2 export in one pass over whole columns.
+
+        Same rules as process_conditions: change is the percentage difference to the
+        sensor's previous reading, the baseline is that sensor's 6-reading moving
+        average, and a reading is normal below 2x the baseline, doubled above 2x and
+        critical above 2.5x.
+        Nothing is printed, logged or actuated.
+
+        Args:
+            file_path (str): The CSV export to analyse.
+            column_name (str): The column holding the CO2 readings.
+
+        Returns:
+            pandas.DataFrame: One row per valid reading with columns sensorID,
+            date time, co2 (int64), change (float64, %), moving_average (float64)
+            and action (categorical, missing when a reading sits exactly on 2x).
+        """
+        df = pd.read_csv(file_path, dtype={'sensorID': str, 'date time': str})
+        if column_name not in df.columns:
+            return pd.DataFrame(columns=['sensorID', 'date time', column_name, 'change', 'moving_average', 'action'])
+
+        co2 = pd.to_numeric(df[column_name], errors='coerce').to_numpy(dtype=np.float64)
+        valid = ~np.isnan(co2)
+        df, co2 = df[valid], co2[valid]
+
+        # Each sensor gets its own previous value and baseline
+        sensor_codes, _ = pd.factorize(df['sensorID'])
+        change, moving_average, action = classify_co2(co2, groups=sensor_codes)
+
+        result = pd.DataFrame({
+            'sensorID': df['sensorID'].to_numpy(),
+            'date time': df['date time'].to_numpy(),
+            column_name: co2.astype(np.int64),
+            'change': change,
+            'moving_average': moving_average,
+            'action': pd.Categorical.from_codes(action, categories=CO2_ACTIONS),
+        })
+        return result
+
     @staticmethod
     def process_conditions():
         change_in_percentage = []
@@ -23,10 +99,7 @@ class CO2Processor(CO2Monitoring):
             row_count = len(co2_emission_data)
             count = 1  # Start from the first data row (skip the header)
 
-            file_path = 'co2_csv_file.csv'
-            column_name = 'co2'
-            moving_average = CO2Processor.calculate_moving_average(file_path, column_name)
-            count_moving_average = 0
+            sensor_state = SensorStateStore(window=6)
 
             while count < row_count:
                 if len(co2_emission_data[count]) < 3:
@@ -38,24 +111,15 @@ class CO2Processor(CO2Monitoring):
                     sensor_id = co2_emission_data[count][0]
                     current_datetime = co2_emission_data[count][1]
                     co2_emission = int(co2_emission_data[count][2])
-
-                    if count > 1:  # Calculate change in percentage starting from the second data row
-                        previous_emission = int(co2_emission_data[count - 1][2])
-                        change = ((
-                                              co2_emission - previous_emission) / previous_emission) * 100 if previous_emission != 0 else 0
-                        change_in_percentage.append(change)
-                    else:
-                        change = 0  # No change for the first data point
-
                 except (IndexError, ValueError) as e:
                     print(f"Error at row {count}: {e}")
-                    change = None
+                    count += 1
+                    continue
 
-                if change is not None:
-                    CO2Processor.handle_co2_levels(sensor_id, current_datetime, co2_emission, change,
-                                                   moving_average[count_moving_average])
+                change, moving_average = sensor_state.push(sensor_id, co2_emission, change_in_percentage)
+
+                CO2Processor.handle_co2_levels(sensor_id, current_datetime, co2_emission, change, moving_average)
 
-                count_moving_average += 1
                 count += 1
 
         except FileNotFoundError:
@@ -70,31 +134,19 @@ class CO2Processor(CO2Monitoring):
         df = pd.read_csv(file_path)
         if column_name not in df.columns:
             return []
-        values = df[column_name]
-        moving_averages = []
-        for i in range(len(values)):
-            if i < 5:
-                average = values[:i + 1].mean()
-            else:
-                average = values[i - 5:i + 1].mean()
-            moving_averages.append(average)
-        return moving_averages
+        return rolling_mean(df[column_name], window=6).tolist()
 
     @staticmethod
     def handle_co2_levels(sensor_id, current_datetime, co2_emission, change, moving_average):
         if co2_emission < (moving_average * 2):
-            data = [sensor_id, current_datetime, co2_emission, f"{change:.2f}%", "No Action. Normal Health"]
-            diary.Diary.co2_range.append(data)
+            diary.Diary.co2_emission.append(sensor_id, current_datetime, co2_emission, change, ACTION_NORMAL)
             print(f"""
                 CO2 emitted at {current_datetime} is {co2_emission}ppm, which is NORMAL
                 Sensor ID = {sensor_id}
                 Change in Percentage = {change:.2f}%
             """)
-            time.sleep(2)
         elif co2_emission > (moving_average * 2.5):
-            data = [sensor_id, current_datetime, co2_emission, f"{change:.2f}%",
-                    "Reduce number of occupants. All vent fans ON. All doors opened. All windows opened"]
-            diary.Diary.co2_range.append(data)
+            diary.Diary.co2_emission.append(sensor_id, current_datetime, co2_emission, change, ACTION_CRITICAL)
             print(f"""
                 CO2 emitted at {current_datetime} is {co2_emission}ppm, which is ABNORMAL
                 Sensor ID = {sensor_id}
@@ -102,16 +154,11 @@ class CO2Processor(CO2Monitoring):
                 Change in Percentage = {change:.2f}%
             """)
             print("Ventilation fan ON")
-            robot_action.activate_robot_co2_check()
-            time.sleep(2)
-            door_action.adjustDoor()
-            time.sleep(2)
-            windows_action.adjust_window()
-            time.sleep(2)
+            dispatch("robot", robot_action.activate_robot_co2_check)
+            dispatch("door", door_action.adjustDoor)
+            dispatch("window", windows_action.adjust_window)
         elif co2_emission > (moving_average * 2):
-            data = [sensor_id, current_datetime, co2_emission, f"{change:.2f}%",
-                    "Vent fan ON. Door opened. Window opened."]
-            diary.Diary.co2_range.append(data)
+            diary.Diary.co2_emission.append(sensor_id, current_datetime, co2_emission, change, ACTION_DOUBLED)
             print(f"""
                 CO2 emitted at {current_datetime} is {co2_emission}ppm, which is ABNORMAL
                 Sensor ID = {sensor_id}
@@ -120,24 +167,23 @@ class CO2Processor(CO2Monitoring):
                 The emission rate has doubled. Reduce number of people in location.
             """)
             print("Ventilation fan ON")
-            time.sleep(2)
-            door_action.adjustDoor()
-            time.sleep(2)
-            windows_action.adjust_window()
-            time.sleep(2)
+            dispatch("door", door_action.adjustDoor)
+            dispatch("window", windows_action.adjust_window)
 
 
 
 
 import pandas as pd
 import matplotlib.pyplot as plt
-import mplcursors
 from itertools import cycle
 import numpy as np
+from sensor_cache import load_csv
+from plot_lod import plot_lod
+from plot_hover import HoverText
 
 def graph_plot():
     try:
-        df = pd.read_csv('co2_csv_file.csv')
+        df = load_csv('co2_csv_file.csv')
 
         if df.empty:
             print("The CSV file is empty.")
@@ -147,7 +193,6 @@ def graph_plot():
             print("Required columns are missing in the CSV file.")
             return
 
-        df['date time'] = pd.to_datetime(df['date time'])
         df = df.sort_values('date time')
 
         # Set up the figure and axis
@@ -167,44 +212,24 @@ def graph_plot():
         unique_sensors = df['sensorID'].unique()
         colors = plt.cm.tab10(np.linspace(0, 1, len(unique_sensors)))
 
-        lines = []
+        hover = HoverText()
+        action_labels = np.array(CO2_ACTIONS + [''], dtype=object)
         color_cycle = cycle(colors)
         for sensor_id in unique_sensors:
             sensor_data = df[df['sensorID'] == sensor_id]
             color = next(color_cycle)
-            line, = ax.plot(sensor_data['date time'], sensor_data['co2'], marker='o', linestyle='-', color=color, linewidth=2.0, markersize=6, label=sensor_id)
-            lines.append((line, sensor_data))
-
-        # Define the hover function
-        def on_hover(event):
-            for line, sensor_data in lines:
-                if event.artist == line:
-                    ind = event.target.index
-                    sensor_id = sensor_data.iloc[ind]['sensorID']
-                    co2_emission = sensor_data.iloc[ind]['co2']
-                    current_datetime = sensor_data.iloc[ind]['date time']
-                    previous_emission = sensor_data.iloc[ind - 1]['co2'] if ind > 0 else co2_emission
-                    if previous_emission != 0:
-                        change = ((co2_emission - previous_emission) / previous_emission) * 100
-                    else:
-                        change = 0
-                    action = calculate_action(sensor_data, co2_emission, change)
-                    event.annotation.set_text(f"{current_datetime}\nCO2: {co2_emission} ppm\nChange: {change:.2f}%\nAction: {action}")
-
-        def calculate_action(sensor_data, co2_emission, change):
-            actions = []
-            moving_average = sensor_data['co2'].rolling(window=6, min_periods=1).mean()
-            if co2_emission < (moving_average.iloc[-1] * 2):
-                actions.append("No Action. Normal Health")
-            elif co2_emission > (moving_average.iloc[-1] * 2.5):
-                actions.append("Reduce number of occupants. All vent fans ON. All doors opened. All windows opened")
-            elif co2_emission > (moving_average.iloc[-1] * 2):
-                actions.append("Vent fan ON. Door opened. Window opened.")
-            return actions[0]
+            lod = plot_lod(ax, sensor_data['date time'], sensor_data['co2'], marker='o', linestyle='-', color=color, linewidth=2.0, markersize=6, label=sensor_id)
+
+            co2 = sensor_data['co2'].to_numpy(dtype=float)
+            change, _, action = classify_co2(co2)
+            hover.add(lod, (
+                f"{pd.Timestamp(date_time)}\nCO2: {point_co2:g} ppm\nChange: {point_change:.2f}%\nAction: {label}"
+                for date_time, point_co2, point_change, label in zip(
+                    sensor_data['date time'].to_numpy(), co2, change, action_labels[action])
+            ))
 
         # Enable cursor with hover functionality
-        cursor = mplcursors.cursor(hover=True)
-        cursor.connect("add", on_hover)
+        hover.connect()
 
         # Improve layout and legend
         ax.legend(title='Sensor ID', fontsize=10, title_fontsize='11', loc='best', fancybox=True, framealpha=0.5)
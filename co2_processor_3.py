@@ -6,6 +6,8 @@ import door_action
 import robot_action
 import diary
 from co2_sensor import CO2Monitoring
+from sensor_state import SensorStateStore
+from action_dispatcher import dispatch
 
 
 class C02_Processor(CO2Monitoring):
@@ -13,8 +15,6 @@ class C02_Processor(CO2Monitoring):
     @staticmethod
     def conditions():
         import csv
-        import pandas as pd
-        import time
 
         change_in_percentage = []
 
@@ -25,24 +25,7 @@ class C02_Processor(CO2Monitoring):
         row_count = len(co2_emission_data)
         count = 1  # Start from the first data row (skip the header)
 
-        def calculate_moving_average(file_path, column_name):
-            df = pd.read_csv(file_path)
-            if column_name not in df.columns:
-                return []
-            values = df[column_name]
-            moving_averages = []
-            for i in range(len(values)):
-                if i < 5:
-                    average = values[:i + 1].mean()
-                else:
-                    average = values[i - 5:i + 1].mean()
-                moving_averages.append(average)
-            return moving_averages
-
-        file_path = 'co2_csv_file.csv'
-        column_name = 'co2'
-        moving_average = calculate_moving_average(file_path, column_name)
-        count_moving_average = 0
+        sensor_state = SensorStateStore(window=6)
 
         while count < row_count:
             if len(co2_emission_data[count]) < 3:
@@ -55,15 +38,7 @@ class C02_Processor(CO2Monitoring):
                 current_datetime = co2_emission_data[count][1]
                 co2_emission = int(co2_emission_data[count][2])
 
-                if count > 1:  # Calculate change in percentage starting from the second data row
-                    previous_emission = int(co2_emission_data[count - 1][2])
-                    if previous_emission != 0:
-                        change = ((co2_emission - previous_emission) / previous_emission) * 100
-                    else:
-                        change = 0
-                    change_in_percentage.append(change)
-                else:
-                    change = 0  # No change for the first data point
+                change, moving_average = sensor_state.push(sensor_id, co2_emission, change_in_percentage)
 
             except IndexError as e:
                 print(f"IndexError at row {count}: {e}")
@@ -73,64 +48,57 @@ class C02_Processor(CO2Monitoring):
                 change = None
 
             if change is not None:
-                if co2_emission < (moving_average[count_moving_average] * 2):
-                    data = f"{sensor_id}, {current_datetime}, {co2_emission}, {change:.2f}%, No Action. Normal Health".split(
-                        ", ")
-                    diary.Diary.co2_range.append(data)
-                    print(f"""
-                        CO2 emitted at {current_datetime} is {co2_emission}ppm, which is NORMAL
-                        Sensor ID = {sensor_id}
-                        Change in Percentage = {change:.2f}%""")
-                    time.sleep(2)
-                elif co2_emission > (moving_average[count_moving_average] * 2.5):
-                    data = (
-                        f"{sensor_id}, {current_datetime}, {co2_emission}, {change:.2f}%, Reduce number of occupants. All vent fans "
-                        f"ON. All doors opened. All windows opened").split(", ")
-                    diary.Diary.co2_range.append(data)
-                    print(f"""
-                        CO2 emitted at {current_datetime} is {co2_emission}ppm, which is ABNORMAL
-                        Sensor ID = {sensor_id}
-                        Incident Time = {current_datetime}
-                        Change in Percentage = {change:.2f}%""")
-                    print("Ventilation fan ON")
-                    robot_action.activate_robot_co2_check()
-                    time.sleep(2)
-                    door_action.adjustDoor()
-                    time.sleep(2)
-                    windows_action.adjust_window()
-                    time.sleep(2)
-                elif co2_emission > (moving_average[count_moving_average] * 2):
-                    data = f"{sensor_id}, {current_datetime}, {co2_emission}, {change:.2f}%, Vent fan ON. Door opened. Window opened.".split(
-                        ", ")
-                    diary.Diary.co2_range.append(data)
-                    print(f"""
-                        CO2 emitted at {current_datetime} is {co2_emission}ppm, which is ABNORMAL
-                        Sensor ID = {sensor_id}
-                        Incident Time = {current_datetime}
-                        Change in Percentage = {change:.2f}%
-                        The emission rate has doubled. Reduce number of people in location.
-                        """)
-                    print("Ventilation fan ON")
-                    time.sleep(2)
-                    door_action.adjustDoor()
-                    time.sleep(2)
-                    windows_action.adjust_window()
-                    time.sleep(2)
-
-            count_moving_average += 1
+                C02_Processor.handle_co2_levels(sensor_id, current_datetime, co2_emission, change, moving_average)
+
             count += 1
 
         return change_in_percentage
 
+    @staticmethod
+    def handle_co2_levels(sensor_id, current_datetime, co2_emission, change, moving_average):
+        if co2_emission < (moving_average * 2):
+            diary.Diary.co2_emission.append(sensor_id, current_datetime, co2_emission, change, "No Action. Normal Health")
+            print(f"""
+                CO2 emitted at {current_datetime} is {co2_emission}ppm, which is NORMAL
+                Sensor ID = {sensor_id}
+                Change in Percentage = {change:.2f}%""")
+        elif co2_emission > (moving_average * 2.5):
+            diary.Diary.co2_emission.append(sensor_id, current_datetime, co2_emission, change,
+                                            "Reduce number of occupants. All vent fans ON. All doors opened. "
+                                            "All windows opened")
+            print(f"""
+                CO2 emitted at {current_datetime} is {co2_emission}ppm, which is ABNORMAL
+                Sensor ID = {sensor_id}
+                Incident Time = {current_datetime}
+                Change in Percentage = {change:.2f}%""")
+            print("Ventilation fan ON")
+            dispatch("robot", robot_action.activate_robot_co2_check)
+            dispatch("door", door_action.adjustDoor)
+            dispatch("window", windows_action.adjust_window)
+        elif co2_emission > (moving_average * 2):
+            diary.Diary.co2_emission.append(sensor_id, current_datetime, co2_emission, change,
+                                            "Vent fan ON. Door opened. Window opened.")
+            print(f"""
+                CO2 emitted at {current_datetime} is {co2_emission}ppm, which is ABNORMAL
+                Sensor ID = {sensor_id}
+                Incident Time = {current_datetime}
+                Change in Percentage = {change:.2f}%
+                The emission rate has doubled. Reduce number of people in location.
+                """)
+            print("Ventilation fan ON")
+            dispatch("door", door_action.adjustDoor)
+            dispatch("window", windows_action.adjust_window)
+
 
 
 
 def graph_plot():
     import pandas as pd
     import matplotlib.pyplot as plt
-    import mplcursors
     from itertools import cycle
     import numpy as np
+    from co2_processor_2 import CO2_ACTIONS, classify_co2
+    from plot_hover import HoverText
 
     try:
         # Load the data from CSV file
@@ -161,43 +129,23 @@ def graph_plot():
         unique_sensors = df['sensorID'].unique()
         colors = plt.cm.viridis(np.linspace(0, 1, len(unique_sensors)))
 
-        lines = []
+        hover = HoverText()
+        action_labels = np.array(CO2_ACTIONS + [''], dtype=object)
         color_cycle = cycle(colors)
         for sensor_id in unique_sensors:
             sensor_data = df[df['sensorID'] == sensor_id]
             color = next(color_cycle)
             line, = plt.plot(sensor_data['date time'], sensor_data['co2'], marker='o', linestyle='-', color=color, linewidth=1.5, markersize=4, label=sensor_id)
-            lines.append((line, sensor_data))
-
-        def on_hover(event):
-            for line, sensor_data in lines:
-                if event.artist == line:
-                    ind = event.index
-                    sensor_id = sensor_data.iloc[ind]['sensorID']
-                    co2_emission = sensor_data.iloc[ind]['co2']
-                    current_datetime = sensor_data.iloc[ind]['date time']
-                    previous_emission = sensor_data.iloc[ind - 1]['co2'] if ind > 0 else co2_emission
-                    if previous_emission != 0:
-                        change = ((co2_emission - previous_emission) / previous_emission) * 100
-                    else:
-                        change = 0
-                    action = calculate_action(sensor_data, co2_emission, change)
-                    event.annotation.set_text(f"{current_datetime}\nCO2: {co2_emission} ppm\nChange: {change:.2f}%\nAction: {action}")
-
-        def calculate_action(sensor_data, co2_emission, change):
-            actions = []
-            moving_average = sensor_data['co2'].rolling(window=6, min_periods=1).mean()
-            if co2_emission < (moving_average.iloc[-1] * 2):
-                actions.append("No Action. Normal Health")
-            elif co2_emission > (moving_average.iloc[-1] * 2.5):
-                actions.append("Reduce number of occupants. All vent fans ON. All doors opened. All windows opened")
-            elif co2_emission > (moving_average.iloc[-1] * 2):
-                actions.append("Vent fan ON. Door opened. Window opened.")
-            return actions[0]
+
+            change, _, action = classify_co2(sensor_data['co2'].to_numpy(dtype=float))
+            hover.add(line, (
+                f"{pd.Timestamp(current_datetime)}\nCO2: {co2_emission} ppm\nChange: {point_change:.2f}%\nAction: {label}"
+                for current_datetime, co2_emission, point_change, label in zip(
+                    sensor_data['date time'].to_numpy(), sensor_data['co2'].to_numpy(), change, action_labels[action])
+            ))
 
         # Attach hover functionality to the graph
-        cursor = mplcursors.cursor(hover=True)
-        cursor.connect("add", on_hover)
+        hover.connect()
 
         plt.legend(title='Sensor ID', fontsize=10, title_fontsize='11')
         plt.show()
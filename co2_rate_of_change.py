@@ -1,55 +1,41 @@
-import csv
 import pandas as pd
 import matplotlib.pyplot as plt
+from rate_of_change import rate_of_change
+from sensor_cache import load_csv
 
 
 class CO2Processor:
-    def __init__(self, input_file, output_file, sensor_id):
+    def __init__(self, input_file, output_file, sensor_id, unit="year", max_gap=None, smoothing=None):
         self.input_file = input_file
         self.output_file = output_file
         self.sensor_id = sensor_id.strip()  # Target sensor ID (e.g., "lw-ms-ambi-01")
-        self.MINUTES_PER_YEAR = 525600  # 60 min * 24 hrs * 365 days
+        self.unit = unit  # Rate unit: "second", "minute", "hour", "day" or "year"
+        self.max_gap = max_gap  # Intervals longer than this (e.g. "30min") give no rate
+        self.smoothing = smoothing  # Optional number of readings to average the rate over
 
     def process_data(self):
         try:
-            # Read input CSV and filter data
-            with open(self.input_file, mode="r", newline="", encoding="utf-8") as infile:
-                reader = csv.DictReader(infile)
-
-                # Check required columns
-                if "sensorID" not in reader.fieldnames or "co2" not in reader.fieldnames:
-                    raise KeyError("CSV must contain 'sensorID' and 'co2' columns.")
-
-                filtered_data = []
-                for row in reader:
-                    # Filter rows by sensorID and validate co2
-                    if row["sensorID"].strip() == self.sensor_id:
-                        try:
-                            co2_value = float(row["co2"])
-                            filtered_data.append({
-                                "sensorID": row["sensorID"].strip(),
-                                "co2": co2_value
-                            })
-                        except ValueError:
-                            print(f"Skipped invalid CO2 value: {row['co2']}")
-
-            # Calculate rate_of_change (ppm/year) for consecutive data points
-            for i in range(len(filtered_data)):
-                if i == 0:
-                    # First row has no previous data, so rate is None
-                    filtered_data[i]["rate_of_change"] = None
-                else:
-                    delta_co2 = filtered_data[i]["co2"] - filtered_data[i - 1]["co2"]
-                    # Time interval is fixed at 10 minutes
-                    rate_ppm_per_year = delta_co2 * (self.MINUTES_PER_YEAR / 10)  # ppm/year
-                    filtered_data[i]["rate_of_change"] = rate_ppm_per_year
+            df = load_csv(self.input_file)
+
+            # Check required columns
+            if "sensorID" not in df.columns or "co2" not in df.columns:
+                raise KeyError("CSV must contain 'sensorID' and 'co2' columns.")
+
+            sensor_ids = df["sensorID"].cat.rename_categories(lambda sensor_id: sensor_id.strip())
+            readings = df[sensor_ids == self.sensor_id].dropna(subset=["co2"])
+
+            # Rate of change from the real interval between consecutive readings
+            rate = rate_of_change(readings["date time"], readings["co2"], unit=self.unit,
+                                  max_gap=self.max_gap, smoothing=self.smoothing)
 
             # Write to output CSV
-            if filtered_data:
-                with open(self.output_file, mode="w", newline="", encoding="utf-8") as outfile:
-                    writer = csv.DictWriter(outfile, fieldnames=["sensorID", "co2", "rate_of_change"])
-                    writer.writeheader()
-                    writer.writerows(filtered_data)
+            if not readings.empty:
+                filtered_data = pd.DataFrame({
+                    "sensorID": self.sensor_id,
+                    "co2": readings["co2"].to_numpy(dtype=float),
+                    "rate_of_change": rate,
+                })
+                filtered_data.to_csv(self.output_file, index=False)
                 print(f"Data saved to '{self.output_file}' with {len(filtered_data)} rows.")
             else:
                 print(f"No data found for sensorID '{self.sensor_id}'.")
@@ -79,9 +65,9 @@ class CO2Processor:
 
             # Plot rate of change (skip first NaN value)
             ax2.plot(df["rate_of_change"].iloc[1:], marker="o", linestyle="-", color="tab:red")
-            ax2.set_title("Rate of Change (ppm/year)")
+            ax2.set_title(f"Rate of Change (ppm/{self.unit})")
             ax2.set_xlabel("Measurement Index")
-            ax2.set_ylabel("Rate (ppm/year)")
+            ax2.set_ylabel(f"Rate (ppm/{self.unit})")
             ax2.grid(True)
 
             plt.tight_layout()
@@ -98,7 +84,8 @@ if __name__ == "__main__":
     processor = CO2Processor(
         input_file="co2_data1.csv",
         output_file="filtered_co2_data.csv",
-        sensor_id="lw-ms-ambi-01"  # Correct sensor ID
+        sensor_id="lw-ms-ambi-01",  # Correct sensor ID
+        max_gap="30min"
     )
     processor.process_data()
     processor.plot_co2_trend()
@@ -1,56 +1,44 @@
-import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
+from rate_of_change import rate_of_change
+from sensor_cache import load_csv
 
 
 class CO2DataAnalyzer:
-    def __init__(self, input_file, output_file, target_sensor):
+    def __init__(self, input_file, output_file, target_sensor, unit="minute", max_gap=None, smoothing=None):
         self.input_file = input_file
         self.output_file = output_file
         self.target_sensor = target_sensor.strip()
-        self.fixed_interval = 10  # Hardcoded 10-minute assumption
+        self.unit = unit  # Rate unit: "second", "minute", "hour", "day" or "year"
+        self.max_gap = max_gap  # Intervals longer than this (e.g. "30min") give no rate
+        self.smoothing = smoothing  # Optional number of readings to average the rate over
 
     def process_data(self):
-        """Process data with fixed 10-minute intervals between readings """
+        """Process data using the real time between consecutive readings"""
         try:
-            with open(self.input_file, newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-
-                if not all(col in reader.fieldnames for col in ["sensorID", "co2", "date time"]):
-                    raise ValueError("CSV missing required columns")
-
-                processed = []
-                previous_co2 = None
-
-                for row in reader:
-                    if row["sensorID"].strip() == self.target_sensor:
-                        try:
-                            current_co2 = float(row["co2"])
-                            rate = None
-
-                            if previous_co2 is not None:
-                                # Use fixed 10-minute interval
-                                co2_diff = current_co2 - previous_co2
-                                rate = co2_diff / self.fixed_interval
-
-                            processed.append({
-                                "sensorID": self.target_sensor,
-                                "co2": current_co2,
-                                "date time": row["date time"].strip(),  # Keep original timestamp
-                                "rate_of_change": rate
-                            })
-
-                            previous_co2 = current_co2
-
-                        except (ValueError, KeyError) as e:
-                            print(f"Skipping invalid row: {e}")
-
-            if processed:
-                with open(self.output_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=["sensorID", "co2", "date time", "rate_of_change"])
-                    writer.writeheader()
-                    writer.writerows(processed)
+            df = load_csv(self.input_file)
+
+            if not all(col in df.columns for col in ["sensorID", "co2", "date time"]):
+                raise ValueError("CSV missing required columns")
+
+            sensor_ids = df["sensorID"].cat.rename_categories(lambda sensor_id: sensor_id.strip())
+            readings = df[sensor_ids == self.target_sensor].dropna(subset=["co2"])
+
+            if not readings.empty:
+                co2 = readings["co2"].to_numpy(dtype=float)
+                rate = rate_of_change(readings["date time"], co2, unit=self.unit,
+                                      max_gap=self.max_gap, smoothing=self.smoothing)
+
+                processed = pd.DataFrame({
+                    "sensorID": self.target_sensor,
+                    "co2": co2,
+                    "date time": readings["date time"].to_numpy(),
+                    "rate_of_change": rate,
+                })
+                processed.to_csv(self.output_file, index=False)
                 print(f"Data saved to {self.output_file}")
             else:
                 print(f"No data for sensor: {self.target_sensor}")
@@ -59,7 +47,7 @@ class CO2DataAnalyzer:
             print(f"Processing failed: {e}")
 
     def visualize_trends(self):
-        """Visualize CO2 change rates with 10-minute assumption"""
+        """Visualize CO2 change rates"""
         try:
             df = pd.read_csv(self.output_file, parse_dates=["date time"])
             df = df.dropna(subset=["rate_of_change"])
@@ -72,9 +60,9 @@ class CO2DataAnalyzer:
             plt.plot(df["date time"], df["rate_of_change"],
                      marker='o', linestyle='-', color='#e67e22', linewidth=2)
 
-            plt.title(f"CO2 Rate of Change (10-Minute Intervals)\nSensor: {self.target_sensor}", fontsize=14)
+            plt.title(f"CO2 Rate of Change\nSensor: {self.target_sensor}", fontsize=14)
             plt.xlabel("Date Time", fontsize=12)
-            plt.ylabel("Rate of Change (ppm/minute)", fontsize=12)
+            plt.ylabel(f"Rate of Change (ppm/{self.unit})", fontsize=12)
 
             plt.gcf().autofmt_xdate()
             plt.grid(True, alpha=0.4)
@@ -85,6 +73,82 @@ class CO2DataAnalyzer:
             print(f"Visualization error: {e}")
 
 
+def analyze_all_sensors(input_file, output_files=None, output_template="reports/co2_analysis_{stem}_{sensor}.csv",
+                        unit="minute", max_gap=None, smoothing=None):
+    """
+    Reads an export once and writes the rate of change of every sensor in it.
+
+    Args:
+        input_file (str): The export to analyse, e.g. 'co2_data1.csv'.
+        output_files (dict, optional): Output file per sensor ID; sensors not
+            listed are written to output_template.
+        output_template (str): Output name pattern with {stem} (the input file
+            name without extension) and {sensor} placeholders. Defaults to the
+            reports/ directory, which is kept out of version control.
+        unit (str): Rate unit: "second", "minute", "hour", "day" or "year".
+        max_gap (str or float, optional): Intervals longer than this give no rate.
+        smoothing (int, optional): Number of readings to average the rate over.
+
+    Returns:
+        dict: The output file written for each sensor ID.
+    """
+    output_files = output_files or {}
+    stem = os.path.splitext(os.path.basename(input_file))[0]
+
+    df = load_csv(input_file)
+    if not all(col in df.columns for col in ["sensorID", "co2", "date time"]):
+        raise ValueError(f"{input_file}: CSV missing required columns")
+
+    df["sensorID"] = df["sensorID"].cat.rename_categories(lambda sensor_id: sensor_id.strip())
+    df = df.dropna(subset=["co2"])
+    co2 = df["co2"].to_numpy(dtype=float)
+    rate = rate_of_change(df["date time"], co2, groups=df["sensorID"].cat.codes, unit=unit,
+                          max_gap=max_gap, smoothing=smoothing)
+
+    processed = pd.DataFrame({
+        "sensorID": df["sensorID"].to_numpy(),
+        "co2": co2,
+        "date time": df["date time"].to_numpy(),
+        "rate_of_change": rate,
+    })
+
+    written = {}
+    for sensor_id, sensor_data in processed.groupby("sensorID", sort=False, observed=True):
+        output_file = output_files.get(sensor_id) or output_template.format(stem=stem, sensor=sensor_id)
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        sensor_data.to_csv(output_file, index=False)
+        written[sensor_id] = output_file
+    print(f"{input_file}: saved {len(written)} sensors")
+    return written
+
+
+def analyze_files(input_files, output_files=None, max_workers=None, **options):
+    """
+    Runs analyze_all_sensors for several exports in parallel worker processes.
+
+    Args:
+        input_files (list): The exports to analyse.
+        output_files (dict, optional): Per input file, a dict of output file per sensor ID.
+        max_workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        **options: Passed on to analyze_all_sensors (unit, max_gap, smoothing, output_template).
+
+    Returns:
+        dict: For each input file, the output file written for each sensor ID.
+    """
+    output_files = output_files or {}
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(analyze_all_sensors, input_file, output_files.get(input_file), **options): input_file
+                   for input_file in input_files}
+        for future in as_completed(futures):
+            input_file = futures[future]
+            try:
+                results[input_file] = future.result()
+            except Exception as e:
+                print(f"Processing {input_file} failed: {e}")
+    return results
+
+
 if __name__ == "__main__":
     configurations = [
         {
@@ -104,11 +168,17 @@ if __name__ == "__main__":
         }
     ]
 
+    # Read every input once, produce all of its sensors, and spread the files over worker processes
+    output_files = {}
+    for config in configurations:
+        output_files.setdefault(config["input_file"], {})[config["target_sensor"]] = config["output_file"]
+    analyze_files(list(output_files), output_files=output_files, max_gap="30min")
+
     for config in configurations:
         analyzer = CO2DataAnalyzer(
             input_file=config["input_file"],
             output_file=config["output_file"],
-            target_sensor=config["target_sensor"]
+            target_sensor=config["target_sensor"],
+            max_gap="30min"
         )
-        analyzer.process_data()
-        analyzer.visualize_trends()
\ No newline at end of file
+        analyzer.visualize_trends()
@@ -1,9 +1,10 @@
+import event_bus
 from sensor import Sensor
 
 
 class CO2Monitoring(Sensor):
     def __init__(self, location, timestamp, name, datatype, start_time, stop_time):
-        super().__init__(name, datatype, start_time, location)
+        super().__init__(name, datatype, start_time, location, topic=event_bus.CO2)
         self.location = location
         self.timestamp = timestamp
         self.start_time = start_time
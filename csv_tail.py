@@ -0,0 +1,66 @@
+import csv
+import os
+
+
+class CSVTail:
+    """
+    Reads a CSV file that another process keeps appending to, one new chunk at a time.
+
+    The byte offset of the last complete line is remembered between calls, so each
+    read only parses what was appended since. A trailing line without a newline is
+    left for the next read. If the file shrinks (rotated or truncated) reading
+    starts again from the top.
+
+    Attributes:
+        file_path (str): The CSV file being followed.
+        header (list): The column names from the first line, once read.
+        offset (int): The byte offset up to which the file has been consumed.
+    """
+
+    def __init__(self, file_path, encoding='utf-8-sig'):
+        """
+        Initializes the CSVTail.
+
+        Args:
+            file_path (str): The CSV file to follow.
+            encoding (str): The file encoding. Defaults to 'utf-8-sig' to drop a BOM.
+        """
+        self.file_path = file_path
+        self.encoding = encoding
+        self.header = None
+        self.offset = 0
+
+    def read_new_rows(self):
+        """
+        Parses the complete lines appended since the previous call.
+
+        Returns:
+            list: The new data rows, each a list of strings. The header line is
+            stored in `header` rather than returned.
+        """
+        try:
+            size = os.path.getsize(self.file_path)
+        except FileNotFoundError:
+            return []
+
+        if size < self.offset:
+            self.offset = 0
+            self.header = None
+        if size == self.offset:
+            return []
+
+        with open(self.file_path, 'rb') as file:
+            file.seek(self.offset)
+            chunk = file.read(size - self.offset)
+
+        end = chunk.rfind(b'\n')
+        if end < 0:
+            return []
+        encoding = 'utf-8' if self.offset and self.encoding == 'utf-8-sig' else self.encoding
+        self.offset += end + 1
+
+        lines = chunk[:end + 1].decode(encoding).splitlines()
+        rows = [row for row in csv.reader(lines) if row]
+        if self.header is None and rows:
+            self.header = rows.pop(0)
+        return rows
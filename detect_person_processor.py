@@ -1,50 +1,43 @@
 import communication_action
 import windows_action
 import door_action
-import time
+import clock
 import diary
 import random
 from sensor import indoor_locations, positions, moving_pattern
 from robot_action import activate_robot
 from processor import Processor
+from action_dispatcher import dispatch
 
 
 def perform_actions():
-    time.sleep(2)
-    communication_action.commAction()
-    time.sleep(2)
-    windows_action.adjust_window()
-    time.sleep(2)
-    door_action.adjustDoor()
-    print("")
-    print("")
+    dispatch("comm", communication_action.commAction)
+    dispatch("window", windows_action.adjust_window)
+    dispatch("door", door_action.adjustDoor)
 
 
 class DetectPersonProcessor(Processor):
     @staticmethod
     def conditions():
-        current_datetime = time.strftime("%Y-%m-%d %H:%M:%S")
+        current_datetime = clock.strftime("%Y-%m-%d %H:%M:%S")
         location = random.choice(indoor_locations)
         position = random.choice(positions)
         pattern = random.choice(moving_pattern)
 
         def log_data(health_status):
-            data = [current_datetime, location, pattern, position, health_status]
-            diary.Diary.log_sensor_data.append(data)
+            diary.Diary.motion_sensor.append(current_datetime, location, pattern, position, health_status)
             print(f"""
                 Health status at {current_datetime} in the {location} is {health_status}
                 Position = {position}
                 Movement Pattern = {pattern}
             """)
-            time.sleep(4)
 
         def log_abnormal_status():
             log_data("Abnormal")
             perform_actions()
 
         print(f"Current Location: {location}")
-        activate_robot()
-        time.sleep(3)
+        dispatch("robot", activate_robot)
 
         if location == "Living Room":
             if position in ["Sitting", "Lying on couch", "Standing"]:
@@ -63,11 +56,11 @@ class DetectPersonProcessor(Processor):
                         log_data("Normal")
                     else:
                         log_abnormal_status()
-                        communication_action.commAction()
+                        dispatch("comm", communication_action.commAction)
                         print("")
                 else:
                     log_abnormal_status()
-                    communication_action.commAction()
+                    dispatch("comm", communication_action.commAction)
                     print("")
             else:
                 log_abnormal_status()
@@ -85,7 +78,7 @@ class DetectPersonProcessor(Processor):
                     log_abnormal_status()
             else:
                 log_abnormal_status()
-                communication_action.commAction()
+                dispatch("comm", communication_action.commAction)
                 print("")
 
         elif location == "Bedroom":
@@ -1,5 +1,186 @@
-import csv
-import time
+import atexit
+import math
+import sqlite3
+import threading
+from array import array
+from diary_log import SegmentedLog
+from diary_store import DEFAULT_DB, DiaryStore
+
+# Default number of buffered rows a stream may hold before the caller has to flush
+DEFAULT_CAPACITY = 1024
+# Default number of seconds between background flushes
+DEFAULT_FLUSH_INTERVAL = 30.0
+# The column every stream's log is ordered by
+TIME_COLUMN = 'DATE / TIME'
+
+_streams = []
+# Optional SQLite store every stream also writes to; see use_sqlite()
+store = None
+
+
+def use_sqlite(path=DEFAULT_DB):
+    """
+    Makes every diary stream also insert its rows into a SQLite store.
+
+    Args:
+        path (str): The database file.
+
+    Returns:
+        DiaryStore: The store, for running queries.
+    """
+    global store
+    store = DiaryStore(path)
+    return store
+
+
+class DiaryStream:
+    """
+    A bounded, typed buffer of diary rows for one stream.
+
+    Numeric columns are kept unformatted in array('d') buffers and text columns in
+    plain lists. A background writer thread appends the buffer to the stream's
+    segmented log every flush_interval seconds, or as soon as it is half full. If
+    the writer falls behind and the buffer reaches its capacity, the caller flushes
+    it, so memory use stays bounded for any run length. Rows are only formatted by
+    export(), which writes the CSV the plotting scripts read. If use_sqlite() was
+    called, each batch is also inserted into the SQLite store.
+
+    Attributes:
+        name (str): The stream name.
+        file_name (str): The CSV file export() writes.
+        titles (list): The column titles.
+        formats (list): A format string per numeric column, None for text columns.
+        log (SegmentedLog): The stream's append-only log.
+    """
+
+    __slots__ = ('name', 'file_name', 'titles', 'formats', 'log', 'capacity', 'flush_interval', '_buffers', '_size',
+                 '_lock', '_write_lock', '_wake', '_writer', '_closed')
+
+    def __init__(self, name, file_name, columns, capacity=DEFAULT_CAPACITY, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        """
+        Initializes the DiaryStream.
+
+        Args:
+            name (str): The stream name, which names its log directory.
+            file_name (str): The CSV file export() writes.
+            columns (list): (title, format) pairs. A format such as '{:.2f}' makes the
+                column numeric; None keeps it as text. The log is sorted by the
+                'DATE / TIME' column, or the first column if there is none.
+            capacity (int): The most rows held in memory.
+            flush_interval (float): Seconds between background flushes.
+        """
+        self.name = name
+        self.file_name = file_name
+        self.titles = [title for title, _ in columns]
+        self.formats = [fmt for _, fmt in columns]
+        self.log = SegmentedLog(name, self.titles, [fmt is not None for fmt in self.formats],
+                                time_column=TIME_COLUMN if TIME_COLUMN in self.titles else None)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._buffers = self._new_buffers()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._wake = threading.Event()
+        self._writer = None
+        self._closed = False
+        _streams.append(self)
+
+    def _new_buffers(self):
+        return [array('d') if fmt else [] for fmt in self.formats]
+
+    def __len__(self):
+        return self._size
+
+    def append(self, *values):
+        """
+        Buffers one row. Missing trailing values and None are written as blanks.
+
+        Args:
+            *values: One value per column, numbers for numeric columns.
+        """
+        if len(values) > len(self.titles):
+            raise ValueError(f"{self.file_name} has {len(self.titles)} columns, got {len(values)} values")
+
+        with self._lock:
+            for i, buffer in enumerate(self._buffers):
+                value = values[i] if i < len(values) else None
+                if self.formats[i]:
+                    buffer.append(math.nan if value is None else float(value))
+                else:
+                    buffer.append("" if value is None else str(value))
+            self._size += 1
+            size = self._size
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name=f"diary-{self.file_name}", daemon=True)
+                self._writer.start()
+
+        if size >= self.capacity:
+            self.flush()
+        elif size >= self.capacity // 2:
+            self._wake.set()
+
+    def flush(self):
+        """
+        Appends the buffered rows to the log as one fsynced batch and empties the buffer.
+
+        Returns:
+            int: The number of rows written.
+        """
+        with self._write_lock:
+            with self._lock:
+                buffers, self._buffers = self._buffers, self._new_buffers()
+                count, self._size = self._size, 0
+            if count:
+                rows = list(zip(*buffers))
+                self.log.append_rows(rows)
+                if store is not None:
+                    # The log already holds the rows, so a store failure is reported, not raised
+                    try:
+                        store.insert(self.name, self.titles, rows)
+                    except sqlite3.Error as e:
+                        print(f"Error writing diary '{self.name}' to {store.path}: {e}")
+            return count
+
+    def export(self):
+        """
+        Flushes, compacts the log and writes every logged row to file_name with one header.
+
+        The rows file_name held before this stream's first export are imported
+        into the log first, so they are kept.
+        """
+        with self._write_lock:
+            self.flush()
+            self.log.import_csv(self.file_name, self.formats)
+            self.log.compact()
+            self.log.export_csv(self.file_name, self.formats)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except (OSError, sqlite3.Error) as e:
+                print(f"Error writing diary '{self.file_name}': {e}")
+
+    def close(self):
+        """Stops the background writer and writes what is left."""
+        self._closed = True
+        self._wake.set()
+        if self._writer is not None and self._writer is not threading.current_thread():
+            self._writer.join()
+        self.flush()
+
+
+@atexit.register
+def _flush_all():
+    for stream in _streams:
+        try:
+            stream.flush()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error writing diary '{stream.file_name}': {e}")
+
 
 class Diary:
     def __init__(self, log_sensor_data=None, log_process=None, log_action=None, time_interval=None, publisher=None,
@@ -11,42 +192,32 @@ class Diary:
         self.publisher = publisher or ""
         self.subscribers = subscribers or []
 
-    log_sensor_data = [""]
+    body_temperature = DiaryStream('body_temperature', 'body_temperature.csv', [
+        ('DATE / TIME', None), ('LOCATION', None), ('TEMPERATURE', '{:.2f}'), ('CALC TEMPERATURE', '{:.2f}'),
+        ('DISTANCE', '{:.2f}'), ('TEMPERATURE RANGE', None), ('SENSOR ID', None),
+    ])
+    motion_sensor = DiaryStream('motion_sensor', 'motion_sensor_log.csv', [
+        ('DATE / TIME', None), ('LOCATION', None), ('MOVEMENT PATTERN', None), ('BODY POSITION', None),
+        ('HEALTH STATUS', None),
+    ])
+    ambient_temperature = DiaryStream('ambient_temperature', 'ambient_temperature.csv', [
+        ('DATE / TIME', None), ('LOCATION', None), ('AMBIENT TEMPERATURE', '{:.2f}'), ('TEMPERATURE RANGE', None),
+    ])
+    co2_emission = DiaryStream('co2_emission', 'CO2_Emission.csv', [
+        ('SENSOR_ID', None), ('DATE / TIME', None), ('C02 EMISSION (ppm)', '{:g}'), ('CHANGE IN %', '{:.2f}%'),
+        ('ACTIONS_TAKEN', None),
+    ])
     temp_range = ""
     temp_range2 = ""
-    co2_range = [""]
-
-def log_process(file_name, column_titles, data):
-    with open(file_name, 'a', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow([])  # Add a blank row if needed
-        writer.writerow(column_titles)
-        writer.writerows(data)
 
 def log_body_temperature():
-    log_process(
-        'body_temperature.csv',
-        'DATE / TIME, LOCATION, TEMPERATURE, CALC TEMPERATURE, DISTANCE, TEMPERATURE RANGE, SENSOR ID'.split(", "),
-        Diary.log_sensor_data
-    )
+    Diary.body_temperature.export()
 
 def log_motion_sensor():
-    log_process(
-        'motion_sensor_log.csv',
-        'DATE / TIME, LOCATION, MOVEMENT PATTERN, BODY POSITION, HEALTH STATUS'.split(", "),
-        Diary.log_sensor_data
-    )
+    Diary.motion_sensor.export()
 
 def log_ambient_temperature():
-    log_process(
-        'ambient_temperature.csv',
-        'DATE / TIME, LOCATION, AMBIENT TEMPERATURE, TEMPERATURE RANGE'.split(", "),
-        Diary.log_sensor_data
-    )
+    Diary.ambient_temperature.export()
 
 def log_co2_emission():
-    log_process(
-        'CO2_Emission.csv',
-        'SENSOR_ID, DATE / TIME, C02 EMISSION (ppm), CHANGE IN %, ACTIONS_TAKEN'.split(", "),
-        Diary.co2_range
-    )
+    Diary.co2_emission.export()
@@ -0,0 +1,305 @@
+import csv
+import glob
+import os
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from sensor_cache import read_columns, write_columns
+
+LOG_DIR = 'diary_logs'
+# A segment is closed once it grows past this many bytes...
+DEFAULT_SEGMENT_BYTES = 4 << 20
+# ...or once it has been open this many seconds
+DEFAULT_SEGMENT_AGE = 3600.0
+# The segment holding rows imported from an existing export; it sorts before every other segment
+IMPORT_SEGMENT = f"segment-{0:020d}.csv"
+# Marks a stream whose existing export has been imported
+IMPORT_MARKER = 'imported'
+
+
+class SegmentedLog:
+    """
+    An append-only diary log split into CSV segments, with a columnar archive.
+
+    Each stream has a fixed schema. Rows are appended in batches to the current
+    segment ('segment-<created ns>.csv'), which holds the header once; a batch is
+    fsynced once. A segment is rotated when it grows past max_bytes or gets older
+    than max_age. compact() merges the segments into an archive sorted by time
+    and stored as typed arrays, and export_csv() writes the archive and any newer
+    segments back out as one CSV with a single header. Before its first export,
+    the rows already in that CSV are imported into the log once, so the export
+    keeps the history of earlier runs.
+
+    Attributes:
+        directory (str): Where the stream's segments and archive live.
+        titles (list): The column titles.
+        numeric (list): True for each numeric column.
+    """
+
+    def __init__(self, name, titles, numeric, time_column=None, log_dir=LOG_DIR,
+                 max_bytes=DEFAULT_SEGMENT_BYTES, max_age=DEFAULT_SEGMENT_AGE):
+        """
+        Initializes the SegmentedLog.
+
+        Args:
+            name (str): The stream name, used as the directory name.
+            titles (list): The column titles.
+            numeric (list): True for each numeric column.
+            time_column (str, optional): The column the archive is sorted by.
+                Defaults to the first column.
+            log_dir (str): The root log directory.
+            max_bytes (int): Segment size that triggers rotation.
+            max_age (float): Segment age in seconds that triggers rotation.
+        """
+        self.directory = os.path.join(log_dir, name)
+        self.titles = list(titles)
+        self.numeric = list(numeric)
+        self.time_column = time_column or self.titles[0]
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._file = None
+        self._created = 0
+
+    def _segments(self):
+        return sorted(glob.glob(os.path.join(self.directory, 'segment-*.csv')))
+
+    @staticmethod
+    def _created_at(segment):
+        return int(os.path.basename(segment)[len('segment-'):-len('.csv')])
+
+    def _open_segment(self):
+        os.makedirs(self.directory, exist_ok=True)
+        named = self._segments()
+        # Segments the archive already holds are left over from a compaction that
+        # stopped before deleting them; rows appended to them would be skipped
+        archived = set(self._archive()[1].get('segments', []))
+        segments = []
+        for segment in named:
+            if os.path.basename(segment) in archived:
+                os.remove(segment)
+            else:
+                segments.append(segment)
+        if segments:
+            # Keep appending to the newest segment of an earlier run if it is still within limits
+            latest = segments[-1]
+            created = self._created_at(latest)
+            size = os.path.getsize(latest)
+            with open(latest, 'rb') as file:
+                file.seek(max(size - 1, 0))
+                complete = file.read(1) == b'\n'
+            if complete and not self._expired(created, size):
+                self._file = open(latest, 'a', newline='', encoding='utf-8')
+                self._created = created
+                return
+
+        # Names sort in creation order, even if the clock steps back
+        self._created = max(time.time_ns(), self._created_at(named[-1]) + 1) if named else time.time_ns()
+        self._file = open(os.path.join(self.directory, f"segment-{self._created:020d}.csv"), 'a', newline='', encoding='utf-8')
+        csv.writer(self._file).writerow(self.titles)
+
+    def _expired(self, created, size):
+        return size >= self.max_bytes or (time.time_ns() - created) / 1e9 >= self.max_age
+
+    def append_rows(self, rows):
+        """
+        Appends a batch of rows and fsyncs them once.
+
+        Args:
+            rows (list): Rows of raw values: numbers for numeric columns (NaN or
+                None for blanks) and strings for text columns.
+        """
+        if not rows:
+            return
+        if self._file is not None and self._expired(self._created, self._file.tell()):
+            self.rotate()
+        if self._file is None:
+            self._open_segment()
+
+        csv.writer(self._file).writerows(self._encode(rows))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _encode(self, rows):
+        return [["" if value is None or value != value else repr(float(value)) if numeric else value
+                 for value, numeric in zip(row, self.numeric)] for row in rows]
+
+    def rotate(self):
+        """Closes the current segment; the next batch starts a new one."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read_segment(self, segment):
+        dtypes = {title: np.float64 if numeric else str for title, numeric in zip(self.titles, self.numeric)}
+        df = pd.read_csv(segment, dtype=dtypes, keep_default_na=False,
+                         na_values={title: [''] for title, numeric in zip(self.titles, self.numeric) if numeric},
+                         encoding='utf-8')
+        return {title: df[title].to_numpy() if title in df.columns else np.full(len(df), np.nan if numeric else '')
+                for title, numeric in zip(self.titles, self.numeric)}
+
+    def _archive(self):
+        targets = sorted(glob.glob(os.path.join(self.directory, 'archive-*')))
+        targets = [target for target in targets if '.tmp-' not in target]
+        if not targets:
+            return None, {'columns': self.titles, 'categories': {}, 'segments': []}
+        cached = read_columns(targets[-1])
+        if cached is None:
+            return None, {'columns': self.titles, 'categories': {}, 'segments': []}
+        return cached
+
+    def _archive_columns(self):
+        columns, meta = self._archive()
+        if columns is None:
+            return None
+        return {title: np.asarray(meta['categories'][title], dtype=object)[columns[title]]
+                if title in meta['categories'] else np.asarray(columns[title])
+                for title in self.titles}
+
+    def compact(self):
+        """
+        Merges every segment into the sorted columnar archive and deletes them.
+
+        Returns:
+            int: The number of rows in the archive.
+        """
+        self.rotate()
+        segments = self._segments()
+        columns, meta = self._archive()
+        archived = set(meta.get('segments', []))
+        merged = [self._archive_columns()] if columns is not None else []
+        merged += [self._read_segment(segment) for segment in segments
+                   if os.path.basename(segment) not in archived]
+
+        if merged:
+            data = {title: np.concatenate([part[title] for part in merged]) for title in self.titles}
+            order = np.argsort(data[self.time_column].astype(str), kind='stable')
+            archive, categories = {}, {}
+            for title, numeric in zip(self.titles, self.numeric):
+                values = data[title][order]
+                if numeric:
+                    archive[title] = values.astype(np.float64)
+                else:
+                    codes, uniques = pd.factorize(values.astype(str))
+                    archive[title] = codes.astype(np.int32)
+                    categories[title] = [str(label) for label in uniques]
+            count = len(order)
+            write_columns(os.path.join(self.directory, f"archive-{time.time_ns():020d}"), archive,
+                          {'categories': categories, 'segments': [os.path.basename(s) for s in segments]})
+        else:
+            count = 0
+
+        # Segments are only removed once the archive holding them is in place
+        for segment in segments:
+            os.remove(segment)
+        return count
+
+    def read(self):
+        """
+        Returns every logged row: the archive followed by newer segments.
+
+        Returns:
+            dict: Column title -> numpy.ndarray (float64 for numeric columns).
+        """
+        parts = []
+        archive = self._archive_columns()
+        if archive is not None:
+            parts.append(archive)
+        if self._file is not None:
+            self._file.flush()
+        archived = set(self._archive()[1].get('segments', []))
+        parts += [self._read_segment(segment) for segment in self._segments()
+                  if os.path.basename(segment) not in archived]
+        if not parts:
+            return {title: np.array([], dtype=np.float64 if numeric else object)
+                    for title, numeric in zip(self.titles, self.numeric)}
+        return {title: np.concatenate([part[title] for part in parts]) for title in self.titles}
+
+    def import_csv(self, file_name, formats):
+        """
+        Imports the rows of an existing export into the log, once per stream.
+
+        Older exports may hold several blocks, each with a blank line and its own
+        header; rows are matched to columns by the header above them, and values
+        are parsed back from their formats (e.g. '12.50%').
+
+        Args:
+            file_name (str): The export to import.
+            formats (list): A format string per numeric column, None for text columns.
+
+        Returns:
+            int: The number of rows imported.
+        """
+        marker = os.path.join(self.directory, IMPORT_MARKER)
+        segment = os.path.join(self.directory, IMPORT_SEGMENT)
+        if os.path.exists(marker) or os.path.exists(segment):
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+
+        rows = []
+        if os.path.exists(file_name):
+            affixes = [re.split(r'\{[^}]*\}', fmt, maxsplit=1) if fmt else None for fmt in formats]
+            header = self.titles
+            with open(file_name, newline='', encoding='utf-8') as file:
+                for row in csv.reader(file):
+                    if not any(cell.strip() for cell in row):
+                        continue
+                    if self.titles[0] in row and set(row) <= set(self.titles):
+                        header = row
+                        continue
+                    values = dict(zip(header, row))
+                    parsed = []
+                    for title, affix in zip(self.titles, affixes):
+                        value = values.get(title, "")
+                        if affix is None:
+                            parsed.append(value)
+                            continue
+                        prefix, suffix = affix
+                        value = value.strip()
+                        value = value[len(prefix):] if prefix and value.startswith(prefix) else value
+                        value = value[:-len(suffix)] if suffix and value.endswith(suffix) else value
+                        try:
+                            parsed.append(float(value))
+                        except ValueError:
+                            parsed.append(None)
+                    rows.append(parsed)
+
+        if rows:
+            # Written under a temporary name so a crash never leaves a partial import
+            staging = f"{segment}.tmp-{os.getpid()}"
+            with open(staging, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(self.titles)
+                writer.writerows(self._encode(rows))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(staging, segment)
+        with open(marker, 'w', encoding='utf-8') as file:
+            file.write(f"{file_name}\n")
+        return len(rows)
+
+    def export_csv(self, file_name, formats):
+        """
+        Writes all logged rows to a CSV with a single header, for the plotting scripts.
+
+        Args:
+            file_name (str): The CSV to rewrite; rows it held before the log
+                existed are imported first.
+            formats (list): A format string per numeric column, None for text columns.
+        """
+        self.import_csv(file_name, formats)
+        columns = self.read()
+        formatted = []
+        for title, fmt in zip(self.titles, formats):
+            values = columns[title]
+            if fmt:
+                formatted.append(["" if value != value else fmt.format(value) for value in values.tolist()])
+            else:
+                formatted.append(values.tolist())
+        staging = f"{file_name}.tmp-{os.getpid()}"
+        with open(staging, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(self.titles)
+            writer.writerows(zip(*formatted))
+        os.replace(staging, file_name)
@@ -0,0 +1,183 @@
+import json
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_DB = 'diary.sqlite3'
+
+# Diary column titles that fill the indexed columns of every entry
+TIME_COLUMN = 'DATE / TIME'
+LOCATION_COLUMN = 'LOCATION'
+SENSOR_COLUMNS = ('SENSOR ID', 'SENSOR_ID')
+STATUS_COLUMNS = ('HEALTH STATUS', 'TEMPERATURE RANGE', 'ACTIONS_TAKEN')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    stream TEXT NOT NULL,
+    ts REAL,
+    location TEXT,
+    sensor_id TEXT,
+    value REAL,
+    status TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_stream_ts ON entries (stream, ts);
+CREATE INDEX IF NOT EXISTS entries_location_ts ON entries (location, ts);
+"""
+
+
+def _timestamps(values):
+    """Parses diary timestamps into epoch seconds (NaN where they can't be parsed)."""
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), format='ISO8601', utc=True, errors='coerce')
+    seconds = parsed.to_numpy(dtype='datetime64[ns]').view(np.int64) / 1e9
+    seconds[parsed.isna().to_numpy()] = np.nan
+    return seconds
+
+
+def _bound(value):
+    """Converts a query bound to epoch seconds; naive times are taken as UTC, like the stored ones."""
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_convert('UTC').tz_localize(None)
+    return stamp.value / 1e9
+
+
+class DiaryStore:
+    """
+    An embedded SQLite store for diary rows, indexed for time and location queries.
+
+    Every row of every stream is one entry. Its time, location, sensor ID, first
+    numeric reading and status (range remark, health status or action) are kept in
+    indexed columns. The full row is kept as JSON. The database runs in WAL mode,
+    so readers such as dashboards are not blocked by the writers, and rows are
+    inserted in batches with executemany.
+
+    Attributes:
+        path (str): The database file.
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        """
+        Opens (and if needed creates) the store.
+
+        Args:
+            path (str): The database file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(_SCHEMA)
+
+    def insert(self, stream, titles, rows):
+        """
+        Inserts a batch of diary rows in one transaction.
+
+        Args:
+            stream (str): The stream name, e.g. 'co2_emission'.
+            titles (list): The stream's column titles.
+            rows (list): Rows of raw values in column order.
+
+        Returns:
+            int: The number of rows inserted.
+        """
+        if not rows:
+            return 0
+
+        def find(names):
+            return next((titles.index(name) for name in names if name in titles), None)
+
+        time_index = find((TIME_COLUMN,))
+        location_index = find((LOCATION_COLUMN,))
+        sensor_index = find(SENSOR_COLUMNS)
+        status_index = find(STATUS_COLUMNS)
+        value_index = next((i for i, value in enumerate(rows[0])
+                            if isinstance(value, (int, float, np.number)) and not isinstance(value, bool)), None)
+
+        def field(row, index):
+            return None if index is None or row[index] in (None, "") else row[index]
+
+        stamps = _timestamps([row[time_index] for row in rows]) if time_index is not None else [np.nan] * len(rows)
+        entries = []
+        for row, ts in zip(rows, stamps):
+            value = field(row, value_index)
+            entries.append((
+                stream,
+                None if ts != ts else float(ts),
+                field(row, location_index),
+                field(row, sensor_index),
+                None if value is None or value != value else float(value),
+                field(row, status_index),
+                json.dumps(dict(zip(titles, [None if isinstance(v, float) and v != v else v for v in row]))),
+            ))
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT INTO entries (stream, ts, location, sensor_id, value, status, payload) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', entries)
+        return len(entries)
+
+    def query(self, stream=None, location=None, start=None, end=None, status=None, sensor_id=None, expand=False):
+        """
+        Returns the entries that match every given filter, oldest first.
+
+        Args:
+            stream (str, optional): Only this stream.
+            location (str, optional): Only this location.
+            start, end (optional): The time range (anything pandas.Timestamp
+                accepts); start is inclusive, end exclusive.
+            status (str, optional): Only entries whose status contains this text,
+                e.g. 'Abnormal'.
+            sensor_id (str, optional): Only this sensor.
+            expand (bool): Also return every column of the original rows.
+
+        Returns:
+            pandas.DataFrame: Columns stream, time (datetime64[ns]), location,
+            sensor_id, value and status, plus the row's own columns if expand is set.
+        """
+        conditions, parameters = [], []
+        for column, value in (('stream', stream), ('location', location), ('sensor_id', sensor_id)):
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                parameters.append(value)
+        if start is not None:
+            conditions.append('ts >= ?')
+            parameters.append(_bound(start))
+        if end is not None:
+            conditions.append('ts < ?')
+            parameters.append(_bound(end))
+        if status is not None:
+            conditions.append('instr(status, ?) > 0')
+            parameters.append(status)
+
+        sql = 'SELECT stream, ts, location, sensor_id, value, status, payload FROM entries'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY ts'
+
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+
+        columns = list(zip(*rows)) if rows else [()] * 7
+        ts = np.array(columns[1], dtype=np.float64)
+        times = np.full(len(ts), np.datetime64('NaT'), dtype='datetime64[ns]')
+        known = ~np.isnan(ts)
+        times[known] = (ts[known] * 1e9).round().astype(np.int64).view('datetime64[ns]')
+        frame = pd.DataFrame({
+            'stream': pd.Categorical(columns[0]),
+            'time': times,
+            'location': pd.Categorical(columns[2]),
+            'sensor_id': pd.Categorical(columns[3]),
+            'value': np.array([np.nan if v is None else v for v in columns[4]], dtype=np.float64),
+            'status': pd.Categorical(columns[5]),
+        })
+        if expand and rows:
+            frame = frame.join(pd.DataFrame([json.loads(payload) for payload in columns[6]]))
+        return frame
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
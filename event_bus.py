@@ -0,0 +1,254 @@
+import threading
+from collections import OrderedDict, deque, namedtuple
+
+# Sensor topics
+CO2 = "co2"
+AMBIENT = "ambient"
+BODY_TEMPERATURE = "body_temperature"
+MOTION = "motion"
+
+# What a subscription does with a new message when its queue is full:
+#   BLOCK        the publisher waits until the subscriber has made room
+#   DROP_OLDEST  the oldest queued message is discarded
+#   COALESCE     a queued message with the same key is removed and the new one
+#                queued at the back, so the subscriber only sees the latest value
+#                per key, still in publish order; a new key arriving when full
+#                drops the oldest queued key, even if that was its only message,
+#                so maxsize should cover the number of keys
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+POLICIES = (BLOCK, DROP_OLDEST, COALESCE)
+
+DEFAULT_MAXSIZE = 1000
+
+Reading = namedtuple('Reading', ['topic', 'sensor', 'location', 'time', 'value'])
+
+
+def by_sensor(reading):
+    """Coalescing key that keeps the latest Reading of each sensor."""
+    return reading.sensor
+
+
+class Subscription:
+    """
+    One subscriber's bounded queue and the worker thread that delivers from it.
+
+    Messages are delivered in the order they were published. Each subscriber has
+    its own queue and thread, so a slow subscriber only delays itself. What
+    happens to the publisher once that queue is full depends on the policy.
+
+    Attributes:
+        topic (str): The topic subscribed to.
+        policy (str): BLOCK, DROP_OLDEST or COALESCE.
+        dropped (int): Messages discarded because the queue was full (or, for
+            COALESCE, superseded by a newer message with the same key).
+        delivered (int): Messages passed to the handler.
+    """
+
+    def __init__(self, topic, handler, maxsize=DEFAULT_MAXSIZE, policy=BLOCK, batch_size=1, key=None,
+                 on_drop=None):
+        """
+        Initializes the Subscription and starts its worker.
+
+        Args:
+            topic (str): The topic subscribed to.
+            handler (callable): Called with each message, or with a list of up to
+                batch_size messages when batch_size is above 1.
+            maxsize (int): The most messages queued at once.
+            policy (str): BLOCK, DROP_OLDEST or COALESCE.
+            batch_size (int): The most messages passed to one handler call. A batch
+                holds whatever is queued, so it never waits for more to arrive.
+            key (callable, optional): For COALESCE, maps a message to its key, e.g.
+                by_sensor. Defaults to one key for the whole topic.
+            on_drop (callable, optional): Called with each message discarded
+                because the queue was full, e.g. to log it.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}', expected one of {POLICIES}.")
+        if maxsize < 1 or batch_size < 1:
+            raise ValueError("maxsize and batch_size must be at least 1.")
+        self.topic = topic
+        self.handler = handler
+        self.maxsize = maxsize
+        self.policy = policy
+        self.batch_size = batch_size
+        self.key = key
+        self.on_drop = on_drop
+        self.dropped = 0
+        self.delivered = 0
+        self._pending = OrderedDict() if policy == COALESCE else deque()
+        self._unfinished = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name=f"subscriber-{topic}", daemon=True)
+        self._worker.start()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def put(self, message):
+        """
+        Queues a message, applying the policy if the queue is full.
+
+        Returns:
+            bool: False if the subscription has been closed.
+        """
+        evicted = []
+        with self._condition:
+            if self._closed:
+                return False
+            if self.policy == COALESCE:
+                slot = self.key(message) if self.key else None
+                if slot in self._pending:
+                    # The older copy gives up its place, so later messages of other keys stay ahead of it
+                    del self._pending[slot]
+                    self._pending[slot] = message
+                    self.dropped += 1
+                    return True
+                if len(self._pending) >= self.maxsize:
+                    evicted.append(self._pending.popitem(last=False)[1])
+                    self._unfinished -= 1
+                    self.dropped += 1
+                self._pending[slot] = message
+            else:
+                if len(self._pending) >= self.maxsize:
+                    if self.policy == BLOCK:
+                        while len(self._pending) >= self.maxsize and not self._closed:
+                            self._condition.wait()
+                        if self._closed:
+                            return False
+                    else:
+                        evicted.append(self._pending.popleft())
+                        self._unfinished -= 1
+                        self.dropped += 1
+                self._pending.append(message)
+            self._unfinished += 1
+            self._condition.notify_all()
+        if evicted and self.on_drop is not None:
+            self.on_drop(evicted[0])
+        return True
+
+    def join(self):
+        """
+        Blocks until every queued message has been handled.
+        """
+        with self._condition:
+            while self._unfinished:
+                self._condition.wait()
+
+    def close(self, wait=True):
+        """
+        Stops accepting messages; the worker delivers what is queued and exits.
+
+        Args:
+            wait (bool): Block until the worker has exited.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait and self._worker is not threading.current_thread():
+            self._worker.join()
+
+    def _take(self):
+        if self.policy == COALESCE:
+            return self._pending.popitem(last=False)[1]
+        return self._pending.popleft()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                batch = [self._take() for _ in range(min(self.batch_size, len(self._pending)))]
+                self._condition.notify_all()
+            try:
+                self.handler(batch if self.batch_size > 1 else batch[0])
+            except Exception as e:
+                print(f"Subscriber on {self.topic} failed: {e}")
+            finally:
+                with self._condition:
+                    self._unfinished -= len(batch)
+                    self.delivered += len(batch)
+                    self._condition.notify_all()
+
+
+class EventBus:
+    """
+    An in-process publish/subscribe bus that routes sensor readings to processors by topic.
+
+    Publishing hands the message to every subscription of the topic and returns.
+    Each subscription has its own bounded queue and worker thread.
+    """
+
+    def __init__(self):
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, handler, maxsize=DEFAULT_MAXSIZE, policy=BLOCK, batch_size=1, key=None, on_drop=None):
+        """
+        Starts delivering the topic's messages to handler.
+
+        Args:
+            topic (str): The topic, e.g. CO2.
+            handler (callable): Called with each message (or list of messages).
+            maxsize, policy, batch_size, key, on_drop: See Subscription.
+
+        Returns:
+            Subscription: The subscription, for unsubscribe() and its counters.
+        """
+        subscription = Subscription(topic, handler, maxsize=maxsize, policy=policy, batch_size=batch_size, key=key,
+                                    on_drop=on_drop)
+        with self._lock:
+            # Publishers read the tuple without locking, so it is replaced, never changed
+            self._subscriptions[topic] = self._subscriptions.get(topic, ()) + (subscription,)
+        return subscription
+
+    def unsubscribe(self, subscription, wait=True):
+        """
+        Stops a subscription after it has handled what is already queued.
+        """
+        with self._lock:
+            remaining = tuple(s for s in self._subscriptions.get(subscription.topic, ()) if s is not subscription)
+            self._subscriptions[subscription.topic] = remaining
+        subscription.close(wait=wait)
+
+    def publish(self, topic, message):
+        """
+        Hands a message to every subscriber of the topic.
+
+        Args:
+            topic (str): The topic.
+            message: The message, e.g. a Reading.
+
+        Returns:
+            int: The number of subscribers it was queued for.
+        """
+        return sum(subscription.put(message) for subscription in self._subscriptions.get(topic, ()))
+
+    def join(self):
+        """
+        Blocks until every subscriber has handled its queued messages.
+        """
+        for subscriptions in list(self._subscriptions.values()):
+            for subscription in subscriptions:
+                subscription.join()
+
+
+bus = EventBus()
+
+
+def publish(topic, message):
+    """
+    Publishes a message on the shared bus.
+    """
+    return bus.publish(topic, message)
+
+
+def subscribe(topic, handler, **options):
+    """
+    Subscribes to a topic on the shared bus; options are those of EventBus.subscribe.
+    """
+    return bus.subscribe(topic, handler, **options)
@@ -1,3 +1,4 @@
+import event_bus
 from sensor import Sensor
 from detect_person_processor import DetectPersonProcessor
 
@@ -8,7 +9,8 @@ class MotionSensor(Sensor):
             datatype="float",
             start_time=start_time,
             stop_time=stop_time,
-            location=location
+            location=location,
+            topic=event_bus.MOTION
         )
 
     @staticmethod
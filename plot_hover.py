@@ -0,0 +1,52 @@
+import mplcursors
+from plot_lod import LODLine
+
+
+class HoverText:
+    """
+    Hover annotations for plotted lines, with the text of every point built up front.
+
+    Each line is registered with one string per data point, so a hover event
+    only looks up the text of the point under the cursor instead of recomputing
+    it from the data. Lines drawn with plot_lod are mapped back to the point in
+    the full data.
+    """
+
+    def __init__(self):
+        self._lines = {}
+
+    def add(self, line, texts):
+        """
+        Registers a plotted line and the hover text of each of its points.
+
+        Args:
+            line (matplotlib.lines.Line2D or plot_lod.LODLine): The plotted line.
+            texts (iterable): One string per data point, in plotting order.
+        """
+        texts = list(texts)
+        if isinstance(line, LODLine):
+            self._lines[line.line] = (texts, line.raw_index)
+            return
+
+        def raw_index(display_index):
+            return min(max(int(round(display_index)), 0), len(texts) - 1)
+
+        self._lines[line] = (texts, raw_index)
+
+    def connect(self):
+        """
+        Shows the text of the point under the cursor while hovering over a registered line.
+
+        Returns:
+            mplcursors.Cursor: The cursor.
+        """
+        cursor = mplcursors.cursor(list(self._lines), hover=True)
+        cursor.connect("add", self._show)
+        return cursor
+
+    def _show(self, event):
+        entry = self._lines.get(event.artist)
+        if entry is None:
+            return
+        texts, raw_index = entry
+        event.annotation.set_text(texts[raw_index(event.index)])
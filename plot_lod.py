@@ -0,0 +1,119 @@
+import numpy as np
+import matplotlib.dates as mdates
+
+# Points kept per horizontal pixel: one minimum and one maximum per bucket
+POINTS_PER_PIXEL = 2
+
+
+def minmax_downsample(y, start, stop, n_buckets):
+    """
+    Picks the indices that keep the visible shape of y[start:stop] in n_buckets buckets.
+
+    The range is split into equal-count buckets and each keeps its lowest and
+    highest reading, so peaks survive however far the data is reduced. The first
+    and last points of the range are always kept.
+
+    Args:
+        y (numpy.ndarray): The values.
+        start (int): The first index of the range.
+        stop (int): One past the last index of the range.
+        n_buckets (int): The number of buckets, typically the plot width in pixels.
+
+    Returns:
+        numpy.ndarray: Sorted indices into y.
+    """
+    n = stop - start
+    if n <= POINTS_PER_PIXEL * n_buckets:
+        return np.arange(start, stop)
+
+    size = -(-n // n_buckets)
+    segment = np.asarray(y[start:stop], dtype=np.float64)
+    padded = np.full(size * -(-n // size), np.nan)
+    padded[:n] = segment
+    buckets = padded.reshape(-1, size)
+    missing = np.isnan(buckets)
+
+    offsets = np.arange(len(buckets)) * size + start
+    lows = np.where(missing, np.inf, buckets).argmin(axis=1) + offsets
+    highs = np.where(missing, -np.inf, buckets).argmax(axis=1) + offsets
+    indices = np.concatenate(([start, stop - 1], lows, highs))
+    return np.unique(indices[indices < stop])
+
+
+class LODLine:
+    """
+    Keeps a plotted line downsampled to the pixels it currently spans.
+
+    Only the points in the visible x-range are considered, and they are reduced to
+    a min/max pair per pixel column. The reduction is redone whenever the x-limits
+    change (zoom, pan) or the figure is resized. The full data stays available;
+    raw_index() maps a displayed point back to it, e.g. for hover lookups.
+
+    Attributes:
+        line (matplotlib.lines.Line2D): The line being managed.
+        indices (numpy.ndarray): The raw index of every point currently drawn.
+    """
+
+    def __init__(self, line, x, y):
+        """
+        Initializes the LODLine and draws the first reduction.
+
+        Args:
+            line (matplotlib.lines.Line2D): The plotted line.
+            x (array-like): The full, sorted x values (numbers or datetimes).
+            y (array-like): The full y values.
+        """
+        self.line = line
+        self.x = np.asarray(x)
+        self.y = np.asarray(y, dtype=np.float64)
+        if self.x.dtype.kind in 'Mm' or self.x.dtype == object:
+            self._x_numeric = mdates.date2num(self.x)
+        else:
+            self._x_numeric = self.x.astype(np.float64)
+        self.indices = np.arange(len(self.x))
+
+        # Plain functions are held strongly by matplotlib, which keeps this object alive with the axes
+        ax = line.axes
+        ax.callbacks.connect('xlim_changed', lambda _: self.update())
+        ax.figure.canvas.mpl_connect('resize_event', lambda _: self.update())
+        self.update()
+
+    def update(self):
+        ax = self.line.axes
+        low, high = sorted(ax.get_xlim())
+        start = max(np.searchsorted(self._x_numeric, low, side='left') - 1, 0)
+        stop = min(np.searchsorted(self._x_numeric, high, side='right') + 1, len(self.x))
+        width = max(int(ax.get_window_extent().width), 1)
+
+        self.indices = minmax_downsample(self.y, start, stop, width)
+        self.line.set_data(self.x[self.indices], self.y[self.indices])
+
+    def raw_index(self, display_index):
+        """
+        Maps the index of a drawn point to its index in the full data.
+
+        Args:
+            display_index (int or float): The index reported by a hover/pick event.
+
+        Returns:
+            int: The index into the full x/y arrays.
+        """
+        display_index = min(max(int(round(display_index)), 0), len(self.indices) - 1)
+        return int(self.indices[display_index])
+
+
+def plot_lod(ax, x, y, *args, **kwargs):
+    """
+    Plots x/y like ax.plot() but keeps the line downsampled to the visible pixels.
+
+    Args:
+        ax (matplotlib.axes.Axes): The axes to plot on.
+        x (array-like): The sorted x values.
+        y (array-like): The y values.
+        *args, **kwargs: Passed on to ax.plot().
+
+    Returns:
+        LODLine: The managed line; its `line` attribute is the Line2D.
+    """
+    line, = ax.plot(x, y, *args, **kwargs)
+    return LODLine(line, x, y)
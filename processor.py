@@ -1,23 +1,102 @@
+import event_bus
+
+
 class Processor:
-    def __init__(self, processor_input, action, publisher, subscriber, time_frequency):
+    """
+    Base class of the processors: takes readings from a topic, acts on them and publishes the result.
+
+    Attributes:
+        processor_input (callable): Processes one message (or a list of them when
+            subscribed with batch_size above 1) and returns the result, or None
+            when there is nothing to act on.
+        action (callable): The action object's perform_action, called with each result.
+        publisher (str): The topic results are published on, or None.
+        subscriber (str): The topic readings are taken from.
+        time_frequency (float): How often the processor runs, in seconds.
+        diary_stream (diary.DiaryStream): The stream results are logged to, or None.
+    """
+
+    def __init__(self, processor_input, action, publisher, subscriber, time_frequency, bus=None, diary_stream=None):
         self.processor_input = processor_input
-        self.action = action.perform_action
+        self.action = action.perform_action if action is not None else None
         self.publisher = publisher
         self.subscriber = subscriber
         self.time_frequency = time_frequency
+        self.bus = bus or event_bus.bus
+        self.diary_stream = diary_stream
+        self.subscription = None
+        self.last_input = None
+        self.last_result = None
+
+    def start(self, **options):
+        """
+        Subscribes accept_input to the subscriber topic.
+
+        Args:
+            **options: Queue options (maxsize, policy, batch_size, key,
+                on_drop), see event_bus.Subscription.
+
+        Returns:
+            event_bus.Subscription: The subscription.
+        """
+        self.subscription = self.bus.subscribe(self.subscriber, self.accept_input, **options)
+        return self.subscription
+
+    def stop(self):
+        if self.subscription is not None:
+            self.bus.unsubscribe(self.subscription)
+            self.subscription = None
+
+    def tick(self, data=None):
+        """
+        Runs one scheduled step. Processors that read their own source, e.g. a file
+        or a simulation, do it in processor_input and ignore data.
+
+        Returns:
+            The result of processor_input.
+        """
+        return self.accept_input(data)
+
+    def schedule(self, scheduler, delay=0.0, jitter=0.0, coalesce=True):
+        """
+        Makes the scheduler call tick() every time_frequency seconds.
+
+        Args:
+            scheduler (scheduler.Scheduler): The scheduler.
+            delay (float): Seconds until the first tick.
+            jitter, coalesce: See scheduler.Scheduler.every.
+
+        Returns:
+            scheduler.Timer: The timer, which can be cancelled.
+        """
+        return scheduler.every(self.time_frequency, self.tick, delay=delay, jitter=jitter, coalesce=coalesce,
+                               name=f"{type(self).__name__} on {self.subscriber}")
+
+    def accept_input(self, data):
+        """
+        Processes one delivery, then acts on, logs and publishes the result.
 
-    def accept_input(self):
-        # Placeholder for accepting input
-        pass
+        Returns:
+            The result of processor_input.
+        """
+        self.last_input = data
+        result = self.processor_input(data)
+        self.last_result = result
+        if result is not None:
+            self.take_action(result)
+            self.update_diary(result)
+            self.publish(result)
+        return result
 
-    def take_action(self):
-        # Placeholder for taking an action
-        pass
+    def take_action(self, result):
+        if self.action is not None:
+            self.action(result)
 
-    def update_diary(self):
-        # Placeholder for updating the diary
-        pass
+    def update_diary(self, result):
+        # Results given as a tuple are diary rows
+        if self.diary_stream is not None and isinstance(result, tuple):
+            self.diary_stream.append(*result)
 
-    def publish(self):
-        # Placeholder for publishing
-        pass
+    def publish(self, result):
+        if self.publisher is not None:
+            self.bus.publish(self.publisher, result)
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from rolling_stats import rolling_mean
+
+# Length of each supported rate unit in seconds
+UNIT_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "year": 365 * 86400,
+}
+
+
+def _to_ns(times):
+    times = np.asarray(times)
+    if times.dtype.kind == 'M':
+        return times.astype('datetime64[ns]').view(np.int64)
+    return pd.to_datetime(times, utc=True).tz_localize(None).to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def _seconds(duration):
+    if duration is None:
+        return None
+    if isinstance(duration, (int, float)):
+        return float(duration)
+    return pd.Timedelta(duration).total_seconds()
+
+
+def detect_gaps(times, groups=None, max_gap="30min"):
+    """
+    Flags readings that arrive more than max_gap after the previous reading of the same sensor.
+
+    Args:
+        times (array-like): Timestamps (datetime64 or parseable strings).
+        groups (array-like, optional): A sensor key per reading.
+        max_gap (str, float or Timedelta): The longest expected interval;
+            numbers are seconds. Defaults to 30 minutes.
+
+    Returns:
+        numpy.ndarray: True where a reading follows a gap.
+    """
+    seconds, _, _ = _interval_seconds(_to_ns(times), groups)
+    return seconds > _seconds(max_gap)
+
+
+def _interval_seconds(times_ns, groups):
+    """Seconds since the previous reading of the same group (NaN for each group's first reading)."""
+    if groups is None:
+        order = np.argsort(times_ns, kind='stable')
+        first = np.zeros(len(order), dtype=bool)
+        first[:1] = True
+    else:
+        codes, _ = pd.factorize(np.asarray(groups))
+        order = np.lexsort((times_ns, codes))
+        sorted_codes = codes[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_codes[1:] != sorted_codes[:-1]
+
+    sorted_times = times_ns[order]
+    seconds = np.empty(len(order))
+    seconds[:1] = np.nan
+    seconds[1:] = np.diff(sorted_times) / 1e9
+    seconds[first] = np.nan
+
+    result = np.empty_like(seconds)
+    result[order] = seconds
+    return result, order, first
+
+
+def rate_of_change(times, values, groups=None, unit="minute", max_gap=None, smoothing=None):
+    """
+    Rate of change of every reading using the real time since the previous reading.
+
+    Readings are ordered by time within each sensor, so interleaved multi-sensor
+    exports are handled in a single pass. The result is NaN for each sensor's first
+    reading, for repeated timestamps and, when max_gap is set, for readings that
+    follow a gap.
+
+    Args:
+        times (array-like): Timestamps (datetime64 or parseable strings).
+        values (array-like): The readings, e.g. CO2 in ppm.
+        groups (array-like, optional): A sensor key per reading (e.g. sensorID).
+        unit (str): Rate per "second", "minute", "hour", "day" or "year".
+        max_gap (str, float or Timedelta, optional): Intervals longer than this
+            (numbers are seconds) are treated as gaps and give NaN.
+        smoothing (int, optional): If given, the rate is averaged over this many
+            readings of the same sensor.
+
+    Returns:
+        numpy.ndarray: The rate of change at every index, in the input order.
+    """
+    if unit not in UNIT_SECONDS:
+        raise ValueError(f"Unknown unit '{unit}'. Use one of {list(UNIT_SECONDS)}.")
+
+    values = np.asarray(values, dtype=np.float64)
+    seconds, order, first = _interval_seconds(_to_ns(times), groups)
+
+    sorted_values = values[order]
+    delta = np.empty_like(sorted_values)
+    delta[:1] = np.nan
+    delta[1:] = np.diff(sorted_values)
+    delta[first] = np.nan
+    sorted_seconds = seconds[order]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = np.where(sorted_seconds > 0, delta / sorted_seconds * UNIT_SECONDS[unit], np.nan)
+    if max_gap is not None:
+        rate[sorted_seconds > _seconds(max_gap)] = np.nan
+    if smoothing:
+        missing = np.isnan(rate)
+        rate = rolling_mean(rate, window=smoothing, groups=np.cumsum(first))
+        rate[missing] = np.nan
+
+    result = np.empty_like(rate)
+    result[order] = rate
+    return result
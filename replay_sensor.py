@@ -0,0 +1,98 @@
+import numpy as np
+
+
+class ReplaySensor:
+    """
+    Replays a recorded column of readings, looping back to the start when it runs out.
+
+    The readings are held once as a contiguous float64 array stored twice in a
+    row, so any window of up to len(readings) values starting anywhere is a plain
+    slice: getdata_batch() returns read-only views with no copying, even across
+    the wrap-around. State lives in __slots__, and clones share the array, so
+    thousands of replayed sensors cost little more than one recording.
+
+    Attributes:
+        name (str): The sensor name.
+        location (str): The sensor location.
+        index (int): The position of the next reading.
+    """
+
+    __slots__ = ('name', 'location', 'index', '_readings', '_length')
+
+    def __init__(self, readings, name=None, location=None, start_index=0):
+        """
+        Initializes the ReplaySensor.
+
+        Args:
+            readings (array-like): The recorded readings.
+            name (str, optional): The sensor name.
+            location (str, optional): The sensor location.
+            start_index (int): The reading to start from.
+        """
+        readings = np.asarray(readings, dtype=np.float64)
+        if readings.ndim != 1 or len(readings) == 0:
+            raise ValueError("Replay data must be a non-empty column of readings.")
+        doubled = np.concatenate((readings, readings))
+        doubled.setflags(write=False)
+        self._readings = doubled
+        self._length = len(readings)
+        self.name = name
+        self.location = location
+        self.index = start_index % self._length
+
+    @staticmethod
+    def from_frame(data, column='TEMPERATURE', **kwargs):
+        """
+        Creates a ReplaySensor from one column of a DataFrame, e.g. a loaded CSV export.
+
+        Args:
+            data (pandas.DataFrame): The recorded data.
+            column (str): The column to replay.
+            **kwargs: Passed on to ReplaySensor.
+
+        Returns:
+            ReplaySensor: The sensor.
+        """
+        return ReplaySensor(data[column].to_numpy(dtype=np.float64), **kwargs)
+
+    def clone(self, name=None, location=None, start_index=0):
+        """
+        Returns another sensor replaying the same readings, sharing their memory.
+        """
+        sensor = ReplaySensor.__new__(ReplaySensor)
+        sensor._readings = self._readings
+        sensor._length = self._length
+        sensor.name = name
+        sensor.location = location
+        sensor.index = start_index % self._length
+        return sensor
+
+    def __len__(self):
+        return self._length
+
+    def getdata(self):
+        """
+        Returns the next reading.
+        """
+        value = self._readings[self.index]
+        self.index = (self.index + 1) % self._length
+        return value
+
+    def getdata_batch(self, n):
+        """
+        Returns the next n readings as a read-only view, wrapping around as needed.
+
+        Args:
+            n (int): The number of readings, at most len(self).
+
+        Returns:
+            numpy.ndarray: A view of the next n readings.
+        """
+        if not 0 <= n <= self._length:
+            raise ValueError(f"A batch holds at most {self._length} readings, got {n}.")
+        batch = self._readings[self.index:self.index + n]
+        self.index = (self.index + n) % self._length
+        return batch
+
+    def reset(self, index=0):
+        self.index = index % self._length
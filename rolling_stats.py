@@ -0,0 +1,160 @@
+import numpy as np
+
+DEFAULT_WINDOW = 6
+
+
+class RollingMean:
+    """
+    Moving average over the last `window` readings, kept in a ring buffer.
+
+    Each push() is O(1): the running sum gains the new value and loses the one
+    it overwrites. Missing readings (NaN) are skipped like pandas' mean() does.
+    SensorStateStore keeps one per sensor for the streaming CO2 baseline;
+    rolling_mean() below is the batch equivalent.
+
+    Attributes:
+        window (int): The number of readings averaged.
+    """
+
+    __slots__ = ("window", "_buffer", "_position", "_sum", "_valid", "_count")
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        """
+        Initializes an empty RollingMean.
+
+        Args:
+            window (int): The number of readings to average. Defaults to 6.
+        """
+        if window < 1:
+            raise ValueError("The window must hold at least one reading.")
+        self.window = window
+        self._buffer = np.full(window, np.nan)
+        self._position = 0
+        self._sum = 0.0
+        self._valid = 0
+        self._count = 0
+
+    def push(self, value):
+        """
+        Adds a reading and returns the moving average including it.
+
+        Args:
+            value (float): The new reading.
+
+        Returns:
+            float: The mean of the last `window` valid readings, or NaN if there are none.
+        """
+        old = self._buffer[self._position]
+        if old == old:
+            self._sum -= old
+            self._valid -= 1
+        value = float(value)
+        self._buffer[self._position] = value
+        if value == value:
+            self._sum += value
+            self._valid += 1
+        self._position = (self._position + 1) % self.window
+        self._count += 1
+        return self.mean
+
+    @property
+    def mean(self):
+        return self._sum / self._valid if self._valid else np.nan
+
+    def __len__(self):
+        return min(self._count, self.window)
+
+    def reset(self):
+        self._buffer.fill(np.nan)
+        self._position = 0
+        self._sum = 0.0
+        self._valid = 0
+        self._count = 0
+
+
+def _group_order(groups):
+    """Returns a stable ordering that makes each group contiguous, and where each group starts in it."""
+    codes = np.asarray(groups)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    group_start = np.searchsorted(sorted_codes, sorted_codes, side='left')
+    return order, group_start
+
+
+def rolling_mean(values, window=DEFAULT_WINDOW, groups=None):
+    """
+    Moving average over a whole array, the vectorized counterpart of RollingMean.
+
+    The first window - 1 readings average over what is available so far, matching
+    pandas' rolling(window, min_periods=1).mean().
+
+    Args:
+        values (array-like): The readings, in order.
+        window (int): The number of readings to average. Defaults to 6.
+        groups (array-like, optional): A key per reading (e.g. sensor ID codes).
+            When given, each group gets its own independent moving average.
+
+    Returns:
+        numpy.ndarray: The moving average at every index (float64).
+    """
+    if window < 1:
+        raise ValueError("The window must hold at least one reading.")
+    values = np.asarray(values, dtype=np.float64)
+    if groups is not None:
+        order, group_start = _group_order(groups)
+        values = values[order]
+    valid = ~np.isnan(values)
+
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+
+    end = np.arange(1, len(values) + 1)
+    start = np.maximum(end - window, 0)
+    if groups is not None:
+        start = np.maximum(start, group_start)
+    window_sum = sums[end] - sums[start]
+    window_count = counts[end] - counts[start]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(window_count > 0, window_sum / window_count, np.nan)
+
+    if groups is not None:
+        unsorted = np.empty_like(result)
+        unsorted[order] = result
+        return unsorted
+    return result
+
+
+def percent_change(values, groups=None):
+    """
+    Percentage change of every reading against the previous one.
+
+    The first reading (of each group, when groups are given) has a change of 0,
+    as does any reading whose previous value is 0.
+
+    Args:
+        values (array-like): The readings, in order.
+        groups (array-like, optional): A key per reading (e.g. sensor ID codes).
+
+    Returns:
+        numpy.ndarray: The change in percent at every index (float64).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if groups is not None:
+        order, group_start = _group_order(groups)
+        values = values[order]
+        first = group_start == np.arange(len(values))
+    else:
+        first = np.arange(len(values)) == 0
+
+    previous = np.empty_like(values)
+    previous[0:1] = values[0:1]
+    previous[1:] = values[:-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = np.where(first | (previous == 0), 0.0, (values - previous) / previous * 100)
+
+    if groups is not None:
+        unsorted = np.empty_like(change)
+        unsorted[order] = change
+        return unsorted
+    return change
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sensor_cache import load_csv
+
+
+class RoomDataset:
+    """
+    Per-room exports loaded once and held as time-aligned NumPy arrays.
+
+    All rooms share one sorted time axis; every numeric column becomes a
+    (rooms x times) float array with NaN where a room has no reading. Figures
+    and summary statistics are served from these arrays, so each file is read
+    and parsed only once.
+
+    Attributes:
+        rooms (list): The names of the rooms that loaded successfully.
+        times (numpy.ndarray): The shared datetime64 time axis.
+        present (numpy.ndarray): (rooms x times) mask of where each room has a reading.
+    """
+
+    def __init__(self, csv_files, room_names, time_column='time', date_prefix='2024-01-01 ', max_workers=None):
+        """
+        Loads the room files in parallel and aligns them.
+
+        Args:
+            csv_files (list): One export per room.
+            room_names (list): The room name for each file.
+            time_column (str): The column holding the time of day.
+            date_prefix (str): The date put in front of each time of day.
+            max_workers (int, optional): Number of loader threads.
+        """
+        def load(csv_file):
+            try:
+                return load_csv(csv_file, time_column=time_column, date_prefix=date_prefix), None
+            except FileNotFoundError:
+                return None, f"Error: File '{csv_file}' not found."
+            except Exception as e:
+                return None, f"Error processing {csv_file}: {e}"
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(load, csv_files))
+
+        # Reported in input order once all loads are done
+        frames = []
+        for csv_file, (df, error) in zip(csv_files, results):
+            if df is None:
+                print(error)
+            else:
+                print(f"Successfully loaded data from {csv_file}")
+                print(f"Data shape: {df.shape}")
+            frames.append(df)
+
+        loaded = []
+        for room, df in zip(room_names, frames):
+            if df is None:
+                continue
+            # Aligning needs one reading per time, so repeated times keep their last reading
+            duplicated = df[time_column].duplicated(keep='last')
+            if duplicated.any():
+                print(f"Warning: {room} has {int(duplicated.sum())} duplicate timestamps; keeping the last reading of each.")
+                df = df[~duplicated]
+            loaded.append((room, df))
+        self.rooms = [room for room, _ in loaded]
+
+        room_times = [df[time_column].to_numpy(dtype='datetime64[ns]') for _, df in loaded]
+        self.times = np.unique(np.concatenate(room_times)) if room_times else np.array([], dtype='datetime64[ns]')
+        positions = [np.searchsorted(self.times, times) for times in room_times]
+
+        self.present = np.zeros((len(self.rooms), len(self.times)), dtype=bool)
+        for row, position in enumerate(positions):
+            self.present[row, position] = True
+
+        self._columns = {}
+        for row, ((_, df), position) in enumerate(zip(loaded, positions)):
+            for name in df.columns:
+                if name == time_column or not pd.api.types.is_numeric_dtype(df[name]):
+                    continue
+                if name not in self._columns:
+                    self._columns[name] = np.full((len(self.rooms), len(self.times)), np.nan)
+                self._columns[name][row, position] = df[name].to_numpy(dtype=np.float64)
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def column(self, name):
+        """
+        Returns the aligned (rooms x times) array of a numeric column.
+        """
+        return self._columns[name]
+
+    def series(self, room, name):
+        """
+        Returns one room's readings of a column.
+
+        Args:
+            room (str): The room name.
+            name (str): The column name.
+
+        Returns:
+            tuple: (times, values) arrays covering the times the room has a reading.
+        """
+        row = self.rooms.index(room)
+        mask = self.present[row]
+        return self.times[mask], self._columns[name][row, mask]
+
+    def summary(self, name):
+        """
+        Min, max and mean of a column for every room.
+
+        Returns:
+            dict: Room name -> (min, max, mean), ignoring missing values.
+        """
+        values = self._columns[name]
+        lows, highs, means = np.nanmin(values, axis=1), np.nanmax(values, axis=1), np.nanmean(values, axis=1)
+        return {room: (lows[i], highs[i], means[i]) for i, room in enumerate(self.rooms)}
+
+    def overall_range(self, name):
+        """
+        Returns (min, max, count) of a column across all rooms.
+        """
+        values = self._columns[name]
+        count = int(np.count_nonzero(~np.isnan(values)))
+        if count == 0:
+            return np.nan, np.nan, 0
+        return np.nanmin(values), np.nanmax(values), count
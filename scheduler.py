@@ -0,0 +1,256 @@
+import math
+import random
+import threading
+
+import clock
+
+# Seconds per wheel tick and number of slots: one revolution covers 51.2 s
+DEFAULT_RESOLUTION = 0.1
+DEFAULT_SLOTS = 512
+
+# Allows for rounding when times fall exactly on a tick
+_EPSILON = 1e-6
+
+
+class Timer:
+    """
+    A callback scheduled on a Scheduler, once or every interval seconds.
+
+    Attributes:
+        name (str): A label used in error messages.
+        interval (float): Seconds between firings, or None for a one-shot timer.
+        jitter (float): Each firing is moved by a random offset of up to this many
+            seconds either way, without shifting the timer's period.
+        coalesce (bool): When firings have been missed, fire once and move on to
+            the next period instead of catching up with one firing per period.
+        runs (int): Times the callback has been called.
+        missed (int): Firings skipped by coalescing.
+    """
+
+    __slots__ = ('name', 'callback', 'args', 'interval', 'jitter', 'coalesce', 'runs', 'missed', 'cancelled',
+                 '_due', '_target', '_scheduler')
+
+    def __init__(self, scheduler, callback, args, interval, jitter, coalesce, name):
+        self.name = name or getattr(callback, '__qualname__', repr(callback))
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.jitter = jitter
+        self.coalesce = coalesce
+        self.runs = 0
+        self.missed = 0
+        self.cancelled = False
+        self._due = None
+        self._target = None
+        self._scheduler = scheduler
+
+    def cancel(self):
+        """Stops the timer; a firing already under way still completes."""
+        self._scheduler.cancel(self)
+
+
+class Scheduler:
+    """
+    A hashed timing wheel that fires periodic callbacks such as processor ticks,
+    diary flushes and watchdog checks.
+
+    Time is divided into ticks of `resolution` seconds, and the wheel holds one
+    slot per tick for `slots` ticks. A timer is put in the slot of the tick it is
+    due on, so scheduling and cancelling are O(1), and each tick only looks at the
+    timers in its own slot. Timers due more than one revolution ahead stay in
+    their slot until their tick comes round. Between firings the scheduler sleeps
+    until the next occupied slot, and with no timers it waits for one to be added,
+    so it uses next to no CPU when idle.
+
+    Time comes from the clock module, so under the virtual clock (SIM_CLOCK=virtual)
+    a run jumps from one firing to the next. Callbacks run on the thread that
+    called run(); timers may be added or cancelled from any thread.
+    """
+
+    def __init__(self, resolution=DEFAULT_RESOLUTION, slots=DEFAULT_SLOTS):
+        """
+        Initializes the Scheduler.
+
+        Args:
+            resolution (float): Seconds per tick; firings are rounded up to a tick.
+            slots (int): The number of slots in the wheel.
+        """
+        if resolution <= 0 or slots < 1:
+            raise ValueError("resolution must be positive and slots at least 1.")
+        self.resolution = resolution
+        self.slots = slots
+        self._wheel = [[] for _ in range(slots)]
+        self._origin = clock.monotonic()
+        self._tick = -1  # The last tick processed
+        self._count = 0
+        self._running = False
+        self._condition = threading.Condition()
+
+    def __len__(self):
+        return self._count
+
+    def every(self, interval, callback, *args, delay=None, jitter=0.0, coalesce=True, name=None):
+        """
+        Calls callback(*args) every interval seconds.
+
+        Args:
+            interval (float): Seconds between calls.
+            callback (callable): The function to call.
+            *args: Arguments passed to the callback.
+            delay (float, optional): Seconds until the first call; defaults to interval.
+            jitter (float): Random offset of up to this many seconds per call.
+            coalesce (bool): Skip missed calls rather than catching up on them.
+            name (str, optional): A label for error messages.
+
+        Returns:
+            Timer: The timer, which can be cancelled.
+        """
+        if interval <= 0:
+            raise ValueError(f"The interval must be positive, got {interval}.")
+        timer = Timer(self, callback, args, float(interval), jitter, coalesce, name)
+        with self._condition:
+            self._insert(timer, clock.monotonic() + (interval if delay is None else delay))
+            self._count += 1
+            self._condition.notify_all()
+        return timer
+
+    def after(self, delay, callback, *args, name=None):
+        """
+        Calls callback(*args) once, after delay seconds.
+
+        Returns:
+            Timer: The timer, which can be cancelled.
+        """
+        timer = Timer(self, callback, args, None, 0.0, True, name)
+        with self._condition:
+            self._insert(timer, clock.monotonic() + delay)
+            self._count += 1
+            self._condition.notify_all()
+        return timer
+
+    def cancel(self, timer):
+        with self._condition:
+            if not timer.cancelled:
+                timer.cancelled = True
+                self._count -= 1
+                self._condition.notify_all()
+
+    def stop(self):
+        """
+        Makes run() return; safe to call from a callback or another thread.
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+    def run(self, duration=None):
+        """
+        Fires timers until stop() is called or duration seconds have passed.
+
+        Without a duration, run() also returns once no timers are left under the
+        virtual clock, since nothing could ever be added.
+
+        Args:
+            duration (float, optional): The most seconds to run. Firings due exactly
+                at the end still happen.
+        """
+        virtual = isinstance(clock.current(), clock.VirtualClock)
+        end = None if duration is None else clock.monotonic() + duration
+        self._running = True
+        while True:
+            with self._condition:
+                if not self._running:
+                    break
+                next_tick = self._next_tick()
+                if next_tick is None and virtual and end is None:
+                    break
+                if next_tick is not None and (end is None or self._tick_time(next_tick) <= end + _EPSILON):
+                    wake = self._tick_time(next_tick)
+                else:
+                    wake, next_tick = end, None
+                delay = None if wake is None else wake - clock.monotonic()
+                if not virtual and (delay is None or delay > 0):
+                    # Woken early when a timer is added or cancelled, or stop() is called
+                    self._condition.wait(delay)
+                    continue
+            if delay > 0:
+                clock.current().advance(delay)
+
+            # The tick waited for counts as reached even if rounding puts the time just short of it
+            current = self._current_tick(clock.monotonic())
+            if next_tick is not None:
+                current = max(current, next_tick)
+            if end is not None:
+                # After a slow callback, ticks past the end are left for the next run
+                current = min(current, self._current_tick(end))
+            self._fire(self._collect(current))
+            if next_tick is None:
+                break
+        self._running = False
+
+    def _tick_time(self, tick):
+        return self._origin + tick * self.resolution
+
+    def _current_tick(self, now):
+        return math.floor((now - self._origin) / self.resolution + _EPSILON)
+
+    def _insert(self, timer, due):
+        timer._due = due
+        if timer.jitter:
+            due += random.uniform(-timer.jitter, timer.jitter)
+        target = max(self._tick + 1, math.ceil((due - self._origin) / self.resolution - _EPSILON))
+        timer._target = target
+        self._wheel[target % self.slots].append(timer)
+
+    def _next_tick(self):
+        # Any live timer sits in some slot, so one revolution always finds it
+        if not self._count:
+            return None
+        for tick in range(self._tick + 1, self._tick + 1 + self.slots):
+            if self._wheel[tick % self.slots]:
+                return tick
+        return None
+
+    def _collect(self, current):
+        """Takes every timer due by tick current out of the wheel, in firing order."""
+        due = []
+        with self._condition:
+            # After a stall of more than a revolution, one pass over every slot suffices
+            for tick in range(self._tick + 1, min(current, self._tick + self.slots) + 1):
+                slot = self._wheel[tick % self.slots]
+                if not slot:
+                    continue
+                keep = []
+                for timer in slot:
+                    if timer.cancelled:
+                        continue
+                    (due if timer._target <= current else keep).append(timer)
+                slot[:] = keep
+            self._tick = max(self._tick, current)
+        due.sort(key=lambda timer: timer._target)
+        return due
+
+    def _fire(self, timers):
+        for timer in timers:
+            if timer.cancelled:
+                continue
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                print(f"Timer {timer.name} failed: {e}")
+            timer.runs += 1
+
+            with self._condition:
+                if timer.cancelled:
+                    continue
+                if timer.interval is None:
+                    timer.cancelled = True
+                    self._count -= 1
+                    continue
+                due = timer._due + timer.interval
+                now = clock.monotonic()
+                if timer.coalesce and due <= now - timer.interval:
+                    skipped = math.floor((now - due) / timer.interval)
+                    timer.missed += skipped
+                    due += skipped * timer.interval
+                self._insert(timer, due)
@@ -1,4 +1,5 @@
-import time
+import clock
+import event_bus
 from queue import Queue
 from typing import Optional
 
@@ -9,20 +10,38 @@ moving_pattern = ["Random", "Fast", "Normal"]
 
 
 class Sensor:
-    def __init__(self, name, datatype, start_time, stop_time=None, location=None):
+    def __init__(self, name, datatype, start_time, stop_time=None, location=None, topic=None):
         self.name = name
         self.datatype = datatype
         self.start_time = start_time
         self.stop_time = stop_time
         self.location = location
         self.is_running = False
+        self.topic = topic  # The event bus topic readings are published on
 
     def start(self):
         self.is_running = True
-        self.time = time.strftime("%H:%M:%S")
+        self.time = clock.strftime("%H:%M:%S")
 
     def stop(self):
         self.is_running = False
 
     def getdata(self):
-        raise NotImplementedError("The getdata method must be implemented by subclasses.")
\ No newline at end of file
+        raise NotImplementedError("The getdata method must be implemented by subclasses.")
+
+    def publishsensordata(self, data, bus=None):
+        """
+        Publishes a reading on the sensor's topic.
+
+        Args:
+            data: The reading.
+            bus (event_bus.EventBus, optional): Defaults to the shared bus.
+
+        Returns:
+            event_bus.Reading: The published reading.
+        """
+        if self.topic is None:
+            raise ValueError(f"Sensor '{self.name}' has no topic to publish on.")
+        reading = event_bus.Reading(self.topic, self.name, self.location, clock.strftime("%Y-%m-%d %H:%M:%S"), data)
+        (bus or event_bus.bus).publish(self.topic, reading)
+        return reading
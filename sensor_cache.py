@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = '.sensor_cache'
+CACHE_VERSION = 1
+
+
+def _path_key(csv_file):
+    return hashlib.sha1(os.path.abspath(csv_file).encode('utf-8')).hexdigest()[:10]
+
+
+def cache_location(csv_file, *options, cache_dir=CACHE_DIR):
+    """
+    Returns the cache directory for a source file in its current state.
+
+    The name is '<file>-<path key>-<options key>-<stamp>': the stamp covers the
+    file's size and modification time, so editing or appending to the source gives
+    a new location and the stale cache is never read. Options that change the
+    cached content get their own key, so caches of one file loaded with different
+    options live side by side.
+
+    Args:
+        csv_file (str): The source file.
+        *options: Extra values that affect the cached content.
+        cache_dir (str): The root cache directory.
+
+    Returns:
+        str: The directory holding the cached columns.
+    """
+    stat = os.stat(csv_file)
+    options_key = hashlib.sha1(json.dumps(list(options)).encode('utf-8')).hexdigest()[:10]
+    stamp = json.dumps([CACHE_VERSION, stat.st_size, stat.st_mtime_ns])
+    stamp_key = hashlib.sha1(stamp.encode('utf-8')).hexdigest()[:10]
+    name = f"{os.path.basename(csv_file)}-{_path_key(csv_file)}-{options_key}-{stamp_key}"
+    return os.path.join(cache_dir, name)
+
+
+def write_columns(target, columns, meta=None):
+    """
+    Atomically writes named NumPy arrays as a directory of .npy files.
+
+    Older versions of the same cache are removed: directories whose name only
+    differs from target after its last '-'.
+
+    Args:
+        target (str): The directory to create, as given by cache_location.
+        columns (dict): Column name -> numpy.ndarray.
+        meta (dict, optional): Extra JSON-serializable metadata to store.
+    """
+    parent = os.path.dirname(target) or '.'
+    os.makedirs(parent, exist_ok=True)
+    staging = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    names = list(columns)
+    for i, name in enumerate(names):
+        np.save(os.path.join(staging, f"{i}.npy"), np.ascontiguousarray(columns[name]), allow_pickle=False)
+    with open(os.path.join(staging, 'meta.json'), 'w', encoding='utf-8') as file:
+        json.dump({'columns': names, **(meta or {})}, file)
+
+    key = os.path.basename(target).rsplit('-', 1)[0]
+    for entry in os.listdir(parent):
+        if entry.rsplit('-', 1)[0] == key and entry != os.path.basename(staging):
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+    os.replace(staging, target)
+
+
+def read_columns(target):
+    """
+    Memory-maps the columns written by write_columns.
+
+    Args:
+        target (str): The cache directory.
+
+    Returns:
+        tuple: (columns, meta) where columns maps name -> read-only memory-mapped
+        array, or None if the directory doesn't exist.
+    """
+    meta_file = os.path.join(target, 'meta.json')
+    if not os.path.isfile(meta_file):
+        return None
+    with open(meta_file, encoding='utf-8') as file:
+        meta = json.load(file)
+    columns = {name: np.load(os.path.join(target, f"{i}.npy"), mmap_mode='r', allow_pickle=False)
+               for i, name in enumerate(meta['columns'])}
+    return columns, meta
+
+
+def _convert(df, time_column, date_prefix):
+    columns = {}
+    categories = {}
+    for name in df.columns:
+        values = df[name]
+        if name == time_column:
+            text = values.astype(str)
+            if date_prefix:
+                text = date_prefix + text
+            parsed = pd.to_datetime(text, utc=True).dt.tz_localize(None)
+            columns[name] = parsed.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        elif pd.api.types.is_numeric_dtype(values):
+            columns[name] = values.to_numpy(dtype=np.float32, na_value=np.nan)
+        else:
+            codes, uniques = pd.factorize(values.astype('string'))
+            columns[name] = codes.astype(np.int32)
+            categories[name] = [str(label) for label in uniques]
+    return columns, categories
+
+
+def load_csv(csv_file, time_column='date time', date_prefix=''):
+    """
+    Loads a raw sensor export through the columnar cache.
+
+    The first load parses the CSV and stores each column as a typed array:
+    the time column as int64 nanoseconds, text columns (sensorID, ...) as
+    categorical codes and numeric columns (co2, humidity, temperature, battery,
+    ...) as float32. Later loads memory-map those arrays and skip CSV parsing.
+
+    Args:
+        csv_file (str): The export to load, e.g. 'co2_data1.csv'.
+        time_column (str): The column holding timestamps. Defaults to 'date time'.
+        date_prefix (str): Text put in front of every time value before parsing,
+            for exports that only hold a time of day (e.g. '2024-01-01 ').
+
+    Returns:
+        pandas.DataFrame: The export with typed columns; the time column is
+        datetime64[ns] (UTC, timezone-naive) and text columns are categorical.
+    """
+    target = cache_location(csv_file, time_column, date_prefix)
+    cached = read_columns(target)
+    if cached is None:
+        df = pd.read_csv(csv_file, encoding='utf-8-sig', skipinitialspace=True)
+        df.columns = [str(col).strip() for col in df.columns]
+        columns, categories = _convert(df, time_column, date_prefix)
+        try:
+            write_columns(target, columns, {'categories': categories, 'time_column': time_column})
+            cached = read_columns(target)
+        except OSError as e:
+            print(f"Could not write sensor cache for '{csv_file}': {e}")
+            cached = columns, {'columns': list(columns), 'categories': categories, 'time_column': time_column}
+
+    columns, meta = cached
+    frame = {}
+    for name in meta['columns']:
+        values = columns[name]
+        if name in meta['categories']:
+            frame[name] = pd.Categorical.from_codes(values, categories=meta['categories'][name])
+        elif name == meta['time_column']:
+            frame[name] = values.view('datetime64[ns]')
+        else:
+            frame[name] = values
+    return pd.DataFrame(frame, copy=False)
@@ -0,0 +1,290 @@
+import asyncio
+import heapq
+import inspect
+import itertools
+import time as _time
+
+import clock
+
+DAY = 24 * 3600
+
+
+def _seconds_of_day(hms):
+    """Converts an 'HH:MM:SS' (or 'HH:MM') time of day to seconds after midnight."""
+    hours, minutes, seconds = ([float(part) for part in hms.split(':')] + [0.0, 0.0])[:3]
+    return hours * 3600 + minutes * 60 + seconds
+
+
+def _time_of_day():
+    now = clock.time()
+    local = _time.localtime(now)
+    return local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec + now % 1
+
+
+class ScheduledSensor:
+    """
+    A sensor registered with a SensorRuntime, with its sampling settings and counters.
+
+    Attributes:
+        sensor (Sensor): The sensor; anything with getdata() (plain or async) works.
+        interval (float): Seconds between samples.
+        start, stop (float): The sampling window as seconds after midnight, or None.
+        offset (float): Seconds to wait before the first sample, to stagger sensors.
+        samples (int): Readings taken.
+        missed (int): Samples skipped because the sensor fell behind its interval.
+        last_value: The latest reading.
+    """
+
+    __slots__ = ('sensor', 'interval', 'start', 'stop', 'offset', 'on_reading', 'samples', 'missed',
+                 'last_value', '_opened')
+
+    def __init__(self, sensor, interval, start_time, stop_time, offset, on_reading):
+        if interval <= 0:
+            raise ValueError(f"The sampling interval must be positive, got {interval}.")
+        self.sensor = sensor
+        self.interval = float(interval)
+        self.start = None if start_time is None else _seconds_of_day(start_time)
+        self.stop = None if stop_time is None else _seconds_of_day(stop_time)
+        self.offset = float(offset)
+        self.on_reading = on_reading
+        self.samples = 0
+        self.missed = 0
+        self.last_value = None
+        self._opened = self.start is None
+
+    def window_wait(self):
+        """
+        Returns the seconds until the window opens (0 when inside it), or None once it has closed.
+
+        A window whose start is later than its stop runs over midnight. A sensor
+        waits for its window to open once; when it closes again the sensor is done.
+        """
+        if self.start is None and self.stop is None:
+            return 0.0
+        now = _time_of_day()
+        start = 0.0 if self.start is None else self.start
+        stop = DAY if self.stop is None else self.stop
+        inside = start <= now <= stop if start <= stop else (now >= start or now <= stop)
+        if inside:
+            self._opened = True
+            return 0.0
+        if self._opened:
+            return None
+        return (start - now) % DAY
+
+    def deliver(self, value):
+        self.last_value = value
+        if self.on_reading is not None:
+            self.on_reading(self.sensor, value)
+        elif getattr(self.sensor, 'topic', None) is not None:
+            self.sensor.publishsensordata(value)
+
+
+class _VirtualTimer:
+    """
+    Sleeps in virtual time: once every sensor task is waiting in sleep(), the
+    clock jumps straight to the earliest wake-up and the tasks due then are
+    resumed. While any task is still busy, e.g. awaiting real I/O in an async
+    getdata(), time stands still and drive() waits for it.
+    """
+
+    def __init__(self):
+        self._waiting = []
+        self._order = itertools.count()
+        self._live = 0
+        self._parked = 0
+        self._changed = None
+
+    async def sleep(self, delay):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (clock.monotonic() + max(delay, 0.0), next(self._order), future))
+        self._parked += 1
+        self._notify()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A sleep resumed by drive() has already been counted out
+            if future.cancelled():
+                self._parked -= 1
+            raise
+
+    def _finished(self, task):
+        self._live -= 1
+        self._notify()
+
+    def _notify(self):
+        if self._changed is not None and not self._changed.done():
+            self._changed.set_result(None)
+
+    async def drive(self, tasks):
+        loop = asyncio.get_running_loop()
+        self._live = len(tasks)
+        for task in tasks:
+            task.add_done_callback(self._finished)
+
+        while self._live:
+            if self._parked < self._live:
+                # Woken when a task goes back to sleep() or finishes
+                self._changed = loop.create_future()
+                await self._changed
+                self._changed = None
+                continue
+
+            while self._waiting[0][2].done():
+                heapq.heappop(self._waiting)
+            due = self._waiting[0][0]
+            clock.current().advance(due - clock.monotonic())
+            while self._waiting and self._waiting[0][0] <= due:
+                future = heapq.heappop(self._waiting)[2]
+                if not future.done():
+                    future.set_result(None)
+                    self._parked -= 1
+
+
+async def _wall_sleep(delay):
+    await asyncio.sleep(max(delay, 0.0))
+
+
+class SensorRuntime:
+    """
+    Samples many sensors concurrently on one asyncio event loop.
+
+    Every sensor runs as a task on a single thread, so thousands of sensors cost
+    a few hundred bytes each rather than a thread each. Each sensor samples at
+    its own interval, inside its own start/stop window. Sample times are
+    deadlines on the monotonic clock, so they don't drift and aren't affected by
+    wall-clock changes. A sensor that falls behind skips the samples it missed
+    instead of firing them late in a burst.
+
+    Under the virtual clock (SIM_CLOCK=virtual) the runtime drives time itself,
+    so a day of sampling runs as fast as the sensors can produce readings.
+    """
+
+    def __init__(self):
+        self.sensors = []
+        self._stopping = False
+        self._loop = None
+        self._tasks = []
+
+    def add(self, sensor, interval=1.0, start_time=None, stop_time=None, offset=0.0, on_reading=None):
+        """
+        Registers a sensor.
+
+        Args:
+            sensor (Sensor): The sensor to sample.
+            interval (float): Seconds between samples.
+            start_time, stop_time (str, optional): The 'HH:MM:SS' window to sample
+                in. Default to the sensor's own start_time and stop_time.
+            offset (float): Seconds to wait before the first sample.
+            on_reading (callable, optional): Called with (sensor, value) for every
+                reading. By default readings are published on the sensor's topic.
+
+        Returns:
+            ScheduledSensor: The registration, with its sample counters.
+        """
+        entry = ScheduledSensor(
+            sensor, interval,
+            start_time if start_time is not None else getattr(sensor, 'start_time', None),
+            stop_time if stop_time is not None else getattr(sensor, 'stop_time', None),
+            offset, on_reading,
+        )
+        self.sensors.append(entry)
+        return entry
+
+    def run(self, duration=None):
+        """
+        Samples every sensor until its window closes, it is stopped, or duration passes.
+
+        Args:
+            duration (float, optional): The most seconds to run.
+
+        Returns:
+            list: The ScheduledSensor entries.
+        """
+        asyncio.run(self.run_async(duration))
+        return self.sensors
+
+    async def run_async(self, duration=None):
+        """
+        The coroutine behind run(), for use inside an existing event loop.
+        """
+        self._stopping = False
+        self._loop = asyncio.get_running_loop()
+        virtual = isinstance(clock.current(), clock.VirtualClock)
+        timer = _VirtualTimer() if virtual else None
+        sleep = timer.sleep if virtual else _wall_sleep
+        deadline = None if duration is None else clock.monotonic() + duration
+
+        self._tasks = [asyncio.create_task(self._sample(entry, sleep, deadline)) for entry in self.sensors]
+        try:
+            if virtual:
+                await timer.drive(self._tasks)
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            self._loop = None
+            self._tasks = []
+
+    def stop(self):
+        """
+        Stops every sensor; safe to call from another thread.
+        """
+        self._stopping = True
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(lambda: [task.cancel() for task in self._tasks])
+
+    async def _sample(self, entry, sleep, deadline):
+        sensor = entry.sensor
+        sensor.is_running = True
+        try:
+            if entry.offset:
+                await sleep(entry.offset)
+            next_due = clock.monotonic()
+            while sensor.is_running and not self._stopping:
+                now = clock.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+                wait = entry.window_wait()
+                if wait is None:
+                    break
+                if wait > 0:
+                    await sleep(wait if deadline is None else min(wait, deadline - now))
+                    next_due = clock.monotonic()
+                    continue
+
+                try:
+                    value = sensor.getdata()
+                    if inspect.isawaitable(value):
+                        value = await value
+                    entry.samples += 1
+                    entry.deliver(value)
+                except Exception as e:
+                    print(f"Sensor {getattr(sensor, 'name', sensor)} failed: {e}")
+
+                next_due += entry.interval
+                now = clock.monotonic()
+                if next_due <= now:
+                    skipped = int((now - next_due) // entry.interval) + 1
+                    entry.missed += skipped
+                    next_due += skipped * entry.interval
+                await sleep((next_due if deadline is None else min(next_due, deadline)) - now)
+        finally:
+            sensor.is_running = False
+
+
+def run_sensors(sensors, interval=1.0, duration=None):
+    """
+    Samples the given sensors together at one interval until their windows close.
+
+    Args:
+        sensors (list): The sensors.
+        interval (float): Seconds between samples.
+        duration (float, optional): The most seconds to run.
+
+    Returns:
+        list: The ScheduledSensor entries.
+    """
+    runtime = SensorRuntime()
+    for sensor in sensors:
+        runtime.add(sensor, interval)
+    return runtime.run(duration)
@@ -0,0 +1,93 @@
+import numpy as np
+from rolling_stats import DEFAULT_WINDOW, RollingMean
+
+
+class _SensorState:
+    __slots__ = ('previous', 'count', 'baseline')
+
+    def __init__(self, window):
+        self.previous = np.nan
+        self.count = 0
+        self.baseline = RollingMean(window)
+
+
+class SensorStateStore:
+    """
+    Per-sensor CO2 state for interleaved readings.
+
+    Every sensor ID maps to its previous reading, a reading counter and a
+    RollingMean for its moving-average baseline, so interleaved readings from
+    several rooms don't mix, and one pass handles any number of sensors in O(1)
+    per reading.
+
+    Attributes:
+        window (int): The number of readings in each sensor's baseline.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        """
+        Initializes an empty store.
+
+        Args:
+            window (int): The number of readings in the baseline. Defaults to 6.
+        """
+        if window < 1:
+            raise ValueError("The window must hold at least one reading.")
+        self.window = window
+        self._sensors = {}
+
+    def push(self, sensor_id, value, changes=None):
+        """
+        Records a reading for one sensor.
+
+        Args:
+            sensor_id (str): The sensor that produced the reading.
+            value (float): The reading.
+            changes (list, optional): Gets the change appended when the sensor
+                already had a reading.
+
+        Returns:
+            tuple: (change, baseline) where change is the percentage change against
+            this sensor's previous reading (0 for its first reading) and baseline is
+            the moving average of its last `window` readings including this one.
+        """
+        state = self._sensors.get(sensor_id)
+        if state is None:
+            state = self._sensors[sensor_id] = _SensorState(self.window)
+        value = float(value)
+
+        previous = state.previous
+        if state.count == 0 or previous == 0 or previous != previous:
+            change = 0.0
+        else:
+            change = (value - previous) / previous * 100
+
+        if changes is not None and state.count:
+            changes.append(float(change))
+
+        baseline = state.baseline.push(value)
+        state.previous = value
+        state.count += 1
+        return float(change), float(baseline)
+
+    def baseline(self, sensor_id):
+        state = self._sensors.get(sensor_id)
+        return np.nan if state is None else state.baseline.mean
+
+    def previous(self, sensor_id):
+        state = self._sensors.get(sensor_id)
+        return np.nan if state is None else state.previous
+
+    def count(self, sensor_id):
+        state = self._sensors.get(sensor_id)
+        return 0 if state is None else state.count
+
+    @property
+    def sensors(self):
+        return list(self._sensors)
+
+    def __contains__(self, sensor_id):
+        return sensor_id in self._sensors
+
+    def __len__(self):
+        return len(self._sensors)
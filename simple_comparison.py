@@ -1,3 +1,4 @@
+import numpy as np
 from processor import Processor
 from communication_action import commAction
 from windows_action import adjust_window
@@ -5,13 +6,25 @@ import door_action
 from robot_action import activate_robot
 from heating_system import controlHeatingSystem
 import diary
-import time
-import numpy as np
+from action_dispatcher import dispatch
 
 # Allow default thresholds when user input is not provided
 DEFAULT_LOWER_TEMP = float(input("Enter your lowest body temperature: \n"))
 DEFAULT_UPPER_TEMP = float(input("Enter your highest body temperature: \n"))
 
+def _act_on_low_temperature():
+    dispatch("door", door_action.closeDoor)
+    dispatch("heating", controlHeatingSystem)
+    dispatch("robot", activate_robot)
+
+
+def _act_on_high_temperature():
+    dispatch("door", door_action.openDoor)
+    dispatch("heating", controlHeatingSystem)
+    dispatch("comm", commAction)
+    dispatch("window", adjust_window)
+
+
 class SimpleComparison(Processor):
     @staticmethod
     def preprocess(data, lower_temp=DEFAULT_LOWER_TEMP, higher_temp=DEFAULT_UPPER_TEMP):
@@ -33,24 +46,12 @@ class SimpleComparison(Processor):
             diary.Diary.temp_range = remark
         elif data < lower_temp:
             print(f'Body Temperature: {data:.2f}°C (Low Temperature)')
-            door_action.closeDoor()
-            time.sleep(3)
-            controlHeatingSystem()
-            time.sleep(3)
-            activate_robot()
-            time.sleep(np.random.uniform(3, 9))
+            _act_on_low_temperature()
             remark = "Low Temperature"
             diary.Diary.temp_range = remark
         elif data > higher_temp:
             print(f'Body Temperature: {data:.2f}°C (High Temperature)')
-            door_action.openDoor()
-            time.sleep(3)
-            controlHeatingSystem()
-            time.sleep(3)
-            commAction()
-            time.sleep(3)
-            adjust_window()
-            time.sleep(np.random.uniform(3, 9))
+            _act_on_high_temperature()
             remark = "High Temperature"
             diary.Diary.temp_range = remark
         else:
@@ -58,6 +59,46 @@ class SimpleComparison(Processor):
             remark = "Temperature within specified range"
             diary.Diary.temp_range = remark
 
+    @staticmethod
+    def preprocess_batch(data, lower_temp=DEFAULT_LOWER_TEMP, higher_temp=DEFAULT_UPPER_TEMP):
+        """
+        Classifies a block of temperatures at once and performs the actions of each.
+
+        Gives the same remark and actions per reading as preprocess(), in reading
+        order, but the comparisons are made on the whole block.
+
+        Args:
+            data (array-like): The temperatures to be processed.
+            lower_temp (float): The lower threshold for temperature comparison.
+            higher_temp (float): The upper threshold for temperature comparison.
+
+        Returns:
+            numpy.ndarray: The remark of every reading.
+        """
+        if lower_temp is None or higher_temp is None:
+            lower_temp = DEFAULT_LOWER_TEMP
+            higher_temp = DEFAULT_UPPER_TEMP
+
+        data = np.asarray(data, dtype=np.float64)
+        low = data < lower_temp
+        high = data > higher_temp
+        remarks = np.select(
+            [(data >= lower_temp) & (data <= higher_temp), low, high],
+            ["Normal Body Temperature", "Low Temperature", "High Temperature"],
+            default="Temperature within specified range"
+        )
+
+        for value, remark, is_low, is_high in zip(data, remarks, low, high):
+            print(f'Body Temperature: {value:.2f}°C ({remark})')
+            if is_low:
+                _act_on_low_temperature()
+            elif is_high:
+                _act_on_high_temperature()
+
+        if len(remarks):
+            diary.Diary.temp_range = str(remarks[-1])
+        return remarks
+
 # Optional utility function for explicit user input when needed
 def prompt_for_thresholds():
     """
@@ -1,7 +1,8 @@
 import random
-import time
+import clock
 import pandas as pd
 from sensor import Sensor
+from replay_sensor import ReplaySensor
 
 
 class TemperatureSensor:
@@ -16,11 +17,13 @@ class TemperatureSensor:
         self.current_temp = None  # Placeholder for the current temperature
         self.is_running = False
         self.date = date
+        self._replay = None  # Replays the TEMPERATURE column of temperature_data
+        self._replay_source = None  # The DataFrame the replay was built from
 
 
     def start(self):
         self.is_running = True
-        self.time = time.strftime("%H:%M:%S")
+        self.time = clock.strftime("%H:%M:%S")
 
     def getdata(self):
         # Update the temperature before returning it
@@ -30,14 +33,32 @@ class TemperatureSensor:
     def stop(self):
         self.is_running = False
 
+    def replay(self):
+        # Built once per DataFrame, so assigning new temperature_data starts a new replay
+        if self.temperature_data is None:
+            raise ValueError("Temperature data is not loaded properly.")
+        if self._replay_source is not self.temperature_data:
+            self._replay = ReplaySensor.from_frame(self.temperature_data, name=self.name, location=self.location)
+            self._replay_source = self.temperature_data
+        return self._replay
+
     def update_temperature(self):
-        # Check if there is more temperature data to read
-        if self.current_temp_index < len(self.temperature_data):
-            # Access the temperature value from the current row
-            self.current_temp = self.temperature_data.iloc[self.current_temp_index]['TEMPERATURE']
-            self.current_temp_index += 1  # Move to the next row
-        else:
-            # If all data has been read, reset to the beginning or stop
-            self.current_temp_index = 0
-            self.current_temp = self.temperature_data.iloc[self.current_temp_index]['TEMPERATURE']
+        replay = self.replay()
+        self.current_temp = replay.getdata()
+        # Readings taken in the current pass: len(data) once the last one has been read,
+        # after which the next reading starts again from the first row
+        self.current_temp_index = replay.index or len(replay)
+
+    def getdata_batch(self, n):
+        """
+        Returns the next n temperatures at once, as a read-only array.
 
+        Args:
+            n (int): The number of readings, at most the number of rows.
+        """
+        replay = self.replay()
+        batch = replay.getdata_batch(n)
+        if n:
+            self.current_temp = batch[-1]
+            self.current_temp_index = replay.index or len(replay)
+        return batch